@@ -1,102 +1,146 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
-import time
 
+from driver_pool import DriverPool, chrome_factory
+from browser_profile import track_page
+from page_waits import wait_for, PRODUCT_TITLE, FLIPKART_TITLE
 
-def scrape_amazon(url):
-    options = Options()
-    options.add_argument("--headless")  # background execution
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+# only title and price are read: skip images / fonts / media / trackers
+LEAN_BROWSER = True
 
-    driver.get(url)
-    time.sleep(3)
+# headless browsers started once and shared by the scheduler's workers
+# (one per concurrent job; keep it equal to the scheduler's WORKERS)
+POOL_SIZE = 4
+DRIVER_POOL = DriverPool(lambda: chrome_factory(headless=True, lean=LEAN_BROWSER), size=POOL_SIZE, max_uses=50)
+
+
+def scrape_amazon(url):
+    with DRIVER_POOL.lease() as driver, track_page(driver, "amazon", lean=LEAN_BROWSER):
+        driver.get(url)
+        wait_for(driver, PRODUCT_TITLE, "amazon product page")
 
-    try:
-        title = driver.find_element(By.ID, "productTitle").text.strip()
-    except:
         try:
-            title = driver.find_element(By.CSS_SELECTOR, "span.a-size-large").text.strip()
+            title = driver.find_element(By.ID, "productTitle").text.strip()
         except:
-            title = "Title not found"
+            try:
+                title = driver.find_element(By.CSS_SELECTOR, "span.a-size-large").text.strip()
+            except:
+                title = "Title not found"
 
-    try:
-        price = driver.find_element(By.CSS_SELECTOR, "span.a-price-whole").text
-    except:
         try:
-            price = driver.find_element(By.CSS_SELECTOR, "span.a-offscreen").text
+            price = driver.find_element(By.CSS_SELECTOR, "span.a-price-whole").text
         except:
-            price = "Price not found"
+            try:
+                price = driver.find_element(By.CSS_SELECTOR, "span.a-offscreen").text
+            except:
+                price = "Price not found"
 
-    driver.quit()
     return {"title": title, "price": price}
 
 
 def scrape_flipkart(url):
-    options = Options()
-    options.add_argument("--headless")
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+    with DRIVER_POOL.lease() as driver, track_page(driver, "flipkart", lean=LEAN_BROWSER):
+        driver.get(url)
+        wait_for(driver, FLIPKART_TITLE, "flipkart product page")
 
-    driver.get(url)
-    time.sleep(3)
-
-    try:
-        title = driver.find_element(By.CSS_SELECTOR, "span.B_NuCI").text
-    except:
-        title = "Title not found"
+        try:
+            title = driver.find_element(By.CSS_SELECTOR, "span.B_NuCI").text
+        except:
+            title = "Title not found"
 
-    try:
-        price = driver.find_element(By.CSS_SELECTOR, "div._30jeq3._16Jk6d").text
-    except:
-        price = "Price not found"
+        try:
+            price = driver.find_element(By.CSS_SELECTOR, "div._30jeq3._16Jk6d").text
+        except:
+            price = "Price not found"
 
-    driver.quit()
     return {"title": title, "price": price}
 
-import schedule
 import time
 import json
+import os
 from datetime import datetime
-from scraper import scrape_amazon, scrape_flipkart
+from scraper import scrape_amazon, scrape_flipkart, DRIVER_POOL, POOL_SIZE
+from review_store import get_review_store, product_key
+from price_log import PriceLog
+from watch_scheduler import WatchItem, WatchScheduler, load_watchlist
 
 
 AMAZON_URL = "https://www.amazon.in/dp/B0DGH5K43K"         # change to your product
 FLIPKART_URL = "https://www.flipkart.com/p/itm72f3faf77e924"  # change to your product
 
+# products to watch: CSV with columns url, interval_minutes (blank = INTERVAL_MINUTES)
+# falls back to the two URLs above when the file is missing
+WATCHLIST = "watchlist.csv"
+INTERVAL_MINUTES = 10
 
-def run_job():
-    print("\n📌 Running scraper...")
+# jobs in flight overall, and per site so neither marketplace sees a burst
+WORKERS = POOL_SIZE
+MARKETPLACE_LIMITS = {"amazon.in": 2, "flipkart": 2}
+METRICS_EVERY = 60   # seconds
 
-    amazon = scrape_amazon(AMAZON_URL)
-    flipkart = scrape_flipkart(FLIPKART_URL)
+# append-only, change-only history: a tick writes a short delta line only for
+# products whose price or title moved since the last stored state
+PRICE_LOG = PriceLog("price_history")
 
-    data = {
-        "time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        "Amazon Title": amazon["title"],
-        "Amazon Price": amazon["price"],
-        "Flipkart Title": flipkart["title"],
-        "Flipkart Price": flipkart["price"]
-    }
 
+def migrate_json_history(path="price_history.json"):
+    """One-time import of the old price_history.json into the log; the file is renamed afterwards."""
+    if not os.path.exists(path):
+        return
     try:
-        existing = json.load(open("price_history.json", "r", encoding="utf-8"))
-    except:
-        existing = []
+        rows = json.load(open(path, "r", encoding="utf-8"))
+    except ValueError:
+        print(f"⚠ {path} is not valid JSON, left as is")
+        return
+    observations = []
+    for row in rows:
+        for site, url, market in (("Amazon", AMAZON_URL, "amazon.in"), ("Flipkart", FLIPKART_URL, "flipkart")):
+            observations.append({"product": product_key(url), "price": row.get(f"{site} Price"),
+                                 "title": row.get(f"{site} Title"), "marketplace": market, "time": row.get("time")})
+    PRICE_LOG.append_many(observations)
+    os.replace(path, path + ".migrated")
+    print(f"✔ Imported {len(rows)} ticks from {path} into {PRICE_LOG.path}/")
+
+
+def watchlist():
+    if os.path.exists(WATCHLIST):
+        return load_watchlist(WATCHLIST, INTERVAL_MINUTES)
+    return [WatchItem(AMAZON_URL, INTERVAL_MINUTES * 60), WatchItem(FLIPKART_URL, INTERVAL_MINUTES * 60)]
+
+
+def run_job(item):
+    """Scrape one watched product (runs on a scheduler worker thread)."""
+    scrape = scrape_flipkart if item.marketplace == "flipkart" else scrape_amazon
+    result = scrape(item.url)
+
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    if not PRICE_LOG.append(item.product, result["price"], result["title"], item.marketplace, now):
+        print(f"= {item.marketplace} {item.product}: {result['price']} (unchanged)")
+        return
+    get_review_store().add_price(item.product, result["price"], now, item.marketplace, result["title"])
+
+    print(f"✔ {item.marketplace} {item.product}: {result['price']}")
 
-    existing.append(data)
-    json.dump(existing, open("price_history.json", "w", encoding="utf-8"), indent=4)
 
-    print("✔ Saved → price_history.json")
-    print(f"Amazon: {amazon['price']} | Flipkart: {flipkart['price']}")
+def print_storage():
+    stats = PRICE_LOG.stats()
+    ratio = f"{stats['compression']:.1f}x" if stats["compression"] else "n/a"
+    print(f"💾 Price log: {stats['observations']} observations → {stats['records_written']} records written, "
+          f"{ratio} smaller than full snapshots ({stats['bytes'] / 1024:.0f} KB on disk)")
 
 
-schedule.every(10).minutes.do(run_job)
+migrate_json_history()
+items = watchlist()
+scheduler = WatchScheduler(items, run_job, workers=WORKERS, limits=MARKETPLACE_LIMITS).start()
 
-print("🚀 Scheduler Started — Scraping every 10 minutes\n")
+print(f"🚀 Scheduler Started — watching {len(items)} products with {WORKERS} workers\n")
 print("Do not close this window\n")
 
-while True:
-    schedule.run_pending()
-    time.sleep(1)
\ No newline at end of file
+try:
+    while True:
+        time.sleep(METRICS_EVERY)
+        scheduler.print_metrics()
+        print_storage()
+        print("🚗 Browser pool:", DRIVER_POOL.stats())
+except KeyboardInterrupt:
+    scheduler.stop()
+    DRIVER_POOL.close()
\ No newline at end of file
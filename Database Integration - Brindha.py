@@ -1,10 +1,42 @@
-import requests
-from bs4 import BeautifulSoup
 import csv
+import sys
 import time
-import re
 
-def scrape_reviews(product_url, max_pages=5):
+from http_client import get_client
+from review_extractor import Selectors, extract_reviews
+from review_store import get_review_store, page_is_known, product_key
+from review_parquet import DATASET_DIR, write_reviews
+
+# this scraper's own review selectors (kept as they were before the shared extractor)
+REVIEW_SELECTORS = Selectors(
+    blocks=("div[data-hook='review']",),
+    star=("i[data-hook='review-star-rating'] span",),
+    body=("span[data-hook='review-body'] span",),
+    title=("a[data-hook='review-title'] span",),
+)
+
+def parse_review_page(html):
+    """Return the Review records (id, rating, title, text, date) for every review block on the page."""
+    return extract_reviews(html, selectors=REVIEW_SELECTORS) or []
+
+
+def scrape_reviews(product_url, max_pages=5, csv_path="amazon_reviews.csv", store=None, incremental=False,
+                   parquet_root=DATASET_DIR):
+    """
+    Scrape up to max_pages review pages into the review store (one batched
+    transaction per page). Reviews the store did not have yet are also
+    appended to the Parquet dataset at parquet_root (None to skip).
+    csv_path: also export the rows scraped this run; None to skip.
+
+    incremental: walk newest-first and stop at the first page whose reviews are
+    all stored already, so a refresh only fetches pages with new reviews.
+    """
+    store = store or get_review_store()
+    asin = product_key(product_url)
+    store.upsert_product(asin, url=product_url)
+    known = store.known_review_ids(asin)
+    new_reviews = []
+
     headers = {
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
                       "(KHTML, like Gecko) Chrome/120.0 Safari/537.36",
@@ -17,45 +49,51 @@ def scrape_reviews(product_url, max_pages=5):
         print(f"📄 Scraping page {page}...")
 
         page_url = product_url.replace("/dp/", "/product-reviews/") + f"?pageNumber={page}"
-        res = requests.get(page_url, headers=headers)
+        if incremental:
+            page_url += "&sortBy=recent"
+        res = get_client().get(page_url, headers=headers)
 
         if res.status_code != 200:
             print("❌ Page load error:", res.status_code)
             break
 
-        soup = BeautifulSoup(res.text, "html.parser")
-        review_blocks = soup.select("div[data-hook='review']")
+        rows = parse_review_page(res.text)
 
-        if not review_blocks:
+        if not rows:
             print("⚠ No reviews found on this page.")
             break
 
-        for block in review_blocks:
-            # Rating
-            rating_tag = block.select_one("i[data-hook='review-star-rating'] span")
-            rating = int(re.search(r"(\d+)", rating_tag.get_text(strip=True)).group()) if rating_tag else None
+        if incremental:
+            if page_is_known((r.review_id for r in rows), known):
+                print("✔ Reached already-stored reviews.")
+                break
+            rows = [r for r in rows if r.review_id not in known]
 
-            # Title
-            title_tag = block.select_one("a[data-hook='review-title'] span")
-            title = title_tag.get_text(strip=True) if title_tag else ""
+        ids = store.add_reviews(asin, rows)
+        new_reviews.extend(r for r, rid in zip(rows, ids) if rid not in known)
+        known.update(ids)
+        all_reviews.extend(rows)
 
-            # Review text
-            body_tag = block.select_one("span[data-hook='review-body'] span")
-            body = body_tag.get_text(strip=True) if body_tag else ""
+        time.sleep(1)
 
-            all_reviews.append([rating, title, body])
+    print(f"\n🎉 {len(all_reviews)} reviews saved to {store.path} (product {asin}, {len(new_reviews)} new)")
 
-        time.sleep(1)
+    if parquet_root and new_reviews:
+        write_reviews(new_reviews, asin=asin, root=parquet_root)
+        print(f"📁 Appended {len(new_reviews)} reviews → {parquet_root}/asin={asin}/")
 
-    # Save to CSV
-    with open("amazon_reviews.csv", "w", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-        writer.writerow(["Rating", "Title", "Review"])
-        writer.writerows(all_reviews)
+    # CSV export of this run
+    if csv_path:
+        with open(csv_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["Rating", "Title", "Review"])
+            writer.writerows([r.rating, r.title, r.text] for r in all_reviews)
+        print(f"📁 Exported → {csv_path}\n")
 
-    print(f"\n🎉 {len(all_reviews)} reviews saved to amazon_reviews.csv\n")
+    get_client().stats.print_summary()
 
 
 if __name__ == "__main__":
+    # --incremental: only fetch pages with reviews the store does not have yet
     product_url = input("Paste Amazon Product URL: ").strip()
-    scrape_reviews(product_url)
\ No newline at end of file
+    scrape_reviews(product_url, incremental="--incremental" in sys.argv[1:])
\ No newline at end of file
@@ -3,13 +3,15 @@ from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.common.by import By
 import json
-import time
+
+from page_waits import wait_for, PRODUCT_TITLE, FLIPKART_TITLE
+from review_store import get_review_store, parse_number, product_key
 
 # Amazon Scraper Function
 def scrape_amazon(url):
     driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()))
     driver.get(url)
-    time.sleep(4)
+    wait_for(driver, PRODUCT_TITLE, "amazon product page")
 
     data = {}
 
@@ -45,7 +47,7 @@ def scrape_amazon(url):
 def scrape_flipkart(url):
     driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()))
     driver.get(url)
-    time.sleep(4)
+    wait_for(driver, FLIPKART_TITLE, "flipkart product page")
 
     data = {}
 
@@ -83,6 +85,21 @@ def scrape_flipkart(url):
     return data
 
 
+def save_to_store(url, data, marketplace):
+    """Product, current price and the review texts shown on the page."""
+    store = get_review_store()
+    key = product_key(url)
+
+    def found(value):
+        return None if value == "Not Found" else value
+
+    store.upsert_product(key, title=found(data['product_name']), url=url, marketplace=marketplace,
+                         rating=parse_number(found(data['rating'])))
+    if found(data['price']):
+        store.add_price(key, data['price'], marketplace=marketplace)
+    store.add_reviews(key, [{"text": t} for t in data['reviews'] if t])
+
+
 # Main Execution
 amazon_url = input("Enter Amazon Product URL: ")
 flipkart_url = input("Enter Flipkart Product URL: ")
@@ -99,5 +116,8 @@ final_data = {
 with open("scraped_product_data.json", "w", encoding="utf-8") as file:
     json.dump(final_data, file, indent=4, ensure_ascii=False)
 
+save_to_store(amazon_url, amazon_data, "amazon.in")
+save_to_store(flipkart_url, flipkart_data, "flipkart")
+
 print("\nScraping completed successfully! 🎉")
-print("Data saved in scraped_product_data.json file.")
\ No newline at end of file
+print("Data saved in scraped_product_data.json file and the review store.")
\ No newline at end of file
@@ -2,13 +2,15 @@ import time
 import random
 import re
 import traceback
-from bs4 import BeautifulSoup
+from review_extractor import extract_page
+from browser_profile import apply_lean_options, enable_request_blocking, track_page
+from page_waits import (WAIT_STATS, wait_for, wait_for_any, wait_gone, click_and_wait,
+                        PRODUCT_TITLE, REVIEW_BLOCKS, HISTOGRAM)
+from amazon_nav import NAV_STATS, open_search, open_reviews, asin_from_url
+from review_store import get_review_store
 
 import undetected_chromedriver as uc
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.common.keys import Keys
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, SessionNotCreatedException
 
 
@@ -25,103 +27,55 @@ def handle_popups(driver):
         dismiss = driver.find_elements(By.CSS_SELECTOR, "[data-action-type='DISMISS']")
         if dismiss:
             dismiss[0].click()
-            time.sleep(1)
+            wait_gone(driver, dismiss[0])
 
         dont_change = driver.find_elements(By.XPATH, "//input[@value=\"Don't Change\"]")
         if dont_change:
             dont_change[0].click()
-            time.sleep(1)
+            wait_gone(driver, dont_change[0])
     except:
         pass
 
 
 # ============ DRIVER CREATION ============
-def create_driver():
+def create_driver(lean: bool = False):
     options = uc.ChromeOptions()
     options.add_argument("--start-maximized")
     options.add_argument("--disable-gpu")
     options.add_argument("--no-sandbox")
     options.add_argument("--disable-dev-shm-usage")
+    if lean:
+        # eager load, no images / fonts / media / trackers (see browser_profile.py)
+        apply_lean_options(options)
 
     # Prevent destructor error
     uc.Chrome.__del__ = lambda self: None
 
     try:
-        return uc.Chrome(version_main=142, options=options)
+        driver = uc.Chrome(version_main=142, options=options)
+        return enable_request_blocking(driver) if lean else driver
     except SessionNotCreatedException as e:
         print("❌ ChromeDriver version mismatch.")
         raise e
 
 
 # ============ EXTRACT HISTOGRAM (COMBINED) ============
-def extract_histogram(soup):
-    histogram = {}
-
-    # --- Method 1: New Amazon 2024–2025 Layout ---
-    bars = soup.select("div[data-hook='histogram-bar']")
-    if bars:
-        for bar in bars:
-            star_label = bar.select_one("span.a-size-base")
-            pct_label = bar.select_one("span.a-size-base.a-text-right")
-
-            if star_label and pct_label:
-                m = re.search(r"(\d+)", star_label.get_text(strip=True))
-                pct = pct_label.get_text(strip=True).replace("%", "").strip()
-                if m and pct.isdigit():
-                    histogram[int(m.group(1))] = int(pct)
-
-    # --- Method 2: Old Histogram Table ---
-    if not histogram:
-        table = soup.find("table", id="histogramTable")
-        if table:
-            for row in table.find_all("tr"):
-                label = row.find("a") or row.find("span")
-                if label:
-                    m = re.search(r"(\d)\s*star", label.text)
-                    if m:
-                        star = int(m.group(1))
-                        pct_td = row.find("td", class_="a-text-right")
-                        if pct_td:
-                            pct = pct_td.text.replace("%", "").strip()
-                            if pct.isdigit():
-                                histogram[star] = int(pct)
-
-    # --- Method 3: Fallback Compact Style ---
-    if not histogram:
-        labels = soup.select("span[data-hook='histogram-bar-label']")
-        percents = soup.select("span[data-hook='histogram-bar-percentage']")
-        if len(labels) == len(percents) and len(labels) > 0:
-            for l, p in zip(labels, percents):
-                m = re.search(r"(\d+)", l.text.strip())
-                pct = p.text.strip().replace("%", "")
-                if m and pct.isdigit():
-                    histogram[int(m.group(1))] = int(pct)
-
-    return histogram
+def extract_histogram(html):
+    """Star -> percent from any of the three histogram layouts (see review_extractor)."""
+    return extract_page(html).histogram
 
 
 # ============ MAIN SCRAPER ============
-def scrape_amazon(product_query: str):
+def scrape_amazon(product_query: str, lean: bool = True, direct: bool = True):
     print(f"\n🔍 Searching Amazon for: {product_query}\n")
 
     driver = None
 
     try:
-        driver = create_driver()
+        driver = create_driver(lean=lean)
 
-        # Open Amazon
-        driver.get("https://www.amazon.in/")
-        time.sleep(2)
-        handle_popups(driver)
-
-        # Search box
-        search_box = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.ID, "twotabsearchtextbox"))
-        )
-        search_box.click()
-        human_type(search_box, product_query)
-        search_box.send_keys(Keys.RETURN)
-        time.sleep(3)
+        # Search (direct=False: homepage + typed query)
+        open_search(driver, product_query, direct=direct, typer=human_type, on_home=handle_popups)
 
         # First product
         products = driver.find_elements(
@@ -140,40 +94,44 @@ def scrape_amazon(product_query: str):
             print("❌ No product found.")
             return
 
-        driver.get(product_link)
-        time.sleep(2)
-
-        soup = BeautifulSoup(driver.page_source, "html.parser")
+        with track_page(driver, "product", lean=lean):
+            driver.get(product_link)
+            wait_for(driver, PRODUCT_TITLE, "product page")
 
-        # Product title
-        try:
-            title = soup.select_one("#productTitle").get_text(strip=True)
-        except:
+            # Product title
+            title = extract_page(driver.page_source).product_title
+        if title is None:
             title = product_query
 
         print("📄 Product Title:", title)
+        asin = asin_from_url(product_link)
+        if asin:
+            get_review_store().upsert_product(asin, title=title, url=product_link)
 
         # Move to review page
-        try:
-            link = driver.find_element(By.ID, "acrCustomerReviewLink")
-            driver.execute_script("arguments[0].click();", link)
-            time.sleep(3)
-        except:
-            pid = re.search(r"/dp/([A-Za-z0-9]+)", product_link)
-            if pid:
-                driver.get(f"https://www.amazon.in/product-reviews/{pid.group(1)}")
-                time.sleep(3)
+        def click_to_reviews(driver):
+            try:
+                link = driver.find_element(By.ID, "acrCustomerReviewLink")
+                click_and_wait(driver, link, REVIEW_BLOCKS, "reviews page")
+            except:
+                pid = re.search(r"/dp/([A-Za-z0-9]+)", product_link)
+                if pid:
+                    driver.get(f"https://www.amazon.in/product-reviews/{pid.group(1)}")
+                    wait_for_any(driver, (HISTOGRAM, REVIEW_BLOCKS), "reviews page")
 
-        soup_review = BeautifulSoup(driver.page_source, "html.parser")
+        with track_page(driver, "reviews", lean=lean):
+            open_reviews(driver, asin_from_url(product_link), direct=direct, fallback=click_to_reviews)
 
-        # ----------------- Extract Histogram -----------------
-        histogram = extract_histogram(soup_review)
+            # ----------------- Extract Histogram -----------------
+            histogram = extract_histogram(driver.page_source)
 
         print("\n📊 RATING HISTOGRAM")
         print("---------------------------")
         for s in [5, 4, 3, 2, 1]:
             print(f"{s}★: {histogram.get(s, 0)}%")
 
+        WAIT_STATS.print_summary()
+        NAV_STATS.print_summary()
         print("\n🎉 DONE!")
 
     except Exception as e:
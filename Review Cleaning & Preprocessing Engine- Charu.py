@@ -7,20 +7,24 @@ from collections import Counter, defaultdict
 from datetime import datetime
 from dateutil import parser as date_parser
 
-from bs4 import BeautifulSoup
+from review_extractor import Selectors, extract_page
+from page_waits import (WAIT_STATS, wait_for, wait_gone, click_and_wait, polite_pause,
+                        PRODUCT_TITLE, REVIEW_BLOCKS, HISTOGRAM)
+from amazon_nav import NAV_STATS, open_search, open_reviews, asin_from_url
 
 import undetected_chromedriver as uc
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.action_chains import ActionChains
 
 import pandas as pd
-import numpy as np
 import matplotlib.pyplot as plt
 
-from sklearn.feature_extraction.text import TfidfVectorizer
+from review_stream import (BATCH_SIZE, CsvSink, TfidfKeywords, batched, iter_csv_column, map_stage,
+                           sentiment_stage, tee)
+from review_store import StoreSink, get_review_store, page_is_known
+from review_parquet import ParquetSink, drop_partition, iter_column
 
 # Sentiment analyzer: try VADER first, fallback to simple polarity via TextBlob-like
 try:
@@ -31,6 +35,15 @@ except Exception:
     _SENT_ANALYZER = None
     _SENT_BACKEND = None
 
+# this scraper's own review selectors (kept as they were before the shared extractor);
+# blocks without a body span fall back to the block's whole text
+REVIEW_SELECTORS = Selectors(
+    blocks=("div[data-hook='review']", "div.review"),
+    star=("[data-hook='review-star-rating'], [data-hook='cmps-review-star-rating']",),
+    body=("span[data-hook='review-body'] span",),
+    date=("span[data-hook='review-date']",),
+)
+
 
 # ----------------- Helper functions -----------------
 def human_type(element, text: str):
@@ -48,7 +61,7 @@ def handle_popups(driver):
         if dismiss_btn:
             try:
                 dismiss_btn[0].click()
-                time.sleep(1)
+                wait_gone(driver, dismiss_btn[0])
             except:
                 pass
 
@@ -58,7 +71,7 @@ def handle_popups(driver):
         if no_change:
             try:
                 no_change[0].click()
-                time.sleep(1)
+                wait_gone(driver, no_change[0])
             except:
                 pass
     except Exception:
@@ -69,36 +82,26 @@ def force_load_histogram(driver):
     """Attempt to wake rating UI. Non-fatal if fails."""
     try:
         driver.execute_script("window.scrollBy(0, 600);")
-        time.sleep(1)
         try:
             el = WebDriverWait(driver, 5).until(
                 EC.presence_of_element_located((By.ID, "acrPopover"))
             )
             ActionChains(driver).move_to_element(el).perform()
-            time.sleep(1)
+            if wait_for(driver, HISTOGRAM, "histogram popover", timeout=3):
+                return
         except Exception:
             pass
 
         try:
             el2 = driver.find_element(By.CSS_SELECTOR, ".a-icon-alt")
             ActionChains(driver).move_to_element(el2).perform()
-            time.sleep(1)
+            wait_for(driver, HISTOGRAM, "histogram popover", timeout=3)
         except Exception:
             pass
     except Exception:
         pass
 
 
-def safe_get_text(el):
-    try:
-        return el.get_text(strip=True)
-    except:
-        try:
-            return el.text.strip()
-        except:
-            return ""
-
-
 def parse_review_date(date_str: str):
     """Try robust parsing of review date text like '12 March 2024' or 'Reviewed in India on 12 March 2024'."""
     if not date_str:
@@ -121,12 +124,38 @@ def parse_review_date(date_str: str):
     return None
 
 
+def parse_reviews_page(html):
+    """
+    Parse one reviews page.
+    Returns (histogram, reviews) where histogram is {star: pct} and reviews is a
+    list of {review_id, rating, text, date} dicts in page order.
+    """
+    page = extract_page(html, block_text_fallback=True, selectors=REVIEW_SELECTORS)
+    reviews = []
+
+    for block in page.reviews or []:
+        # rating (0 when the block has none)
+        rating = block.rating if block.rating is not None else 0
+        parsed_date = parse_review_date(block.date_text)
+
+        if block.text and len(block.text) > 3:
+            reviews.append({"review_id": block.review_id, "rating": rating, "text": block.text,
+                            "date": parsed_date})
+
+    return page.histogram, reviews
+
+
 # ----------------- Scraper -----------------
-def scrape_amazon(product_query: str, headless=False, max_reviews=200):
+def scrape_amazon(product_query: str, headless=False, max_reviews=200, direct=True, incremental=False, store=None):
     """
+    direct: open the search / reviews URLs directly; False = homepage + typed search + clicks
+    incremental: open the reviews sorted newest first, keep only reviews not in
+        the store (store, default the shared one) and stop at the first page
+        that is entirely known
+
     Returns:
-        meta: dict with product_title, global_rating, global_count, histogram
-        reviews: list of dicts {rating:int, text:str, date:date or None}
+        meta: dict with product_title, asin, url, global_rating, global_count, histogram
+        reviews: list of dicts {review_id:str or None, rating:int, text:str, date:date or None}
     """
     print(f"\nScraping Amazon.in for: {product_query}")
     options = uc.ChromeOptions()
@@ -140,22 +169,13 @@ def scrape_amazon(product_query: str, headless=False, max_reviews=200):
     options.add_argument("--disable-blink-features=AutomationControlled")
 
     driver = uc.Chrome(options=options)
-    meta = {"product_title": None, "global_rating": None, "global_count": None, "histogram": {}}
+    meta = {"product_title": None, "asin": None, "url": None, "global_rating": None, "global_count": None,
+            "histogram": {}}
     reviews = []
 
     try:
-        driver.get("https://www.amazon.in/")
-        time.sleep(2)
-        handle_popups(driver)
-
         # Search
-        search_box = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.ID, "twotabsearchtextbox"))
-        )
-        search_box.click()
-        human_type(search_box, product_query)
-        search_box.send_keys(Keys.RETURN)
-        time.sleep(2 + random.random() * 2)
+        open_search(driver, product_query, direct=direct, typer=human_type, on_home=handle_popups)
 
         # Find first product link (safer selector)
         product_link = None
@@ -179,148 +199,79 @@ def scrape_amazon(product_query: str, headless=False, max_reviews=200):
             print("No product link found on search page.")
             return meta, reviews
 
+        meta["asin"] = asin_from_url(product_link)
+        meta["url"] = product_link
+
         # Open product page
         driver.get(product_link)
-        time.sleep(2 + random.random() * 2)
+        wait_for(driver, PRODUCT_TITLE, "product page")
         handle_popups(driver)
         force_load_histogram(driver)
-        time.sleep(1)
 
-        soup = BeautifulSoup(driver.page_source, "html.parser")
+        product = extract_page(driver.page_source)
 
-        # Title
-        try:
-            meta["product_title"] = soup.select_one("#productTitle").get_text(strip=True)
-        except:
-            meta["product_title"] = product_query
-
-        # Global rating
-        try:
-            r = soup.select_one("span[data-hook='rating-out-of-text']")
-            if r:
-                meta["global_rating"] = float(re.search(r"[\d.]+", r.get_text()).group())
-        except:
-            pass
-
-        # Global count
-        try:
-            c = soup.select_one("#acrCustomerReviewText")
-            if c:
-                meta["global_count"] = int(re.sub(r"[^\d]", "", c.get_text()))
-        except:
-            pass
+        # Title, global rating, global count
+        meta["product_title"] = product.product_title if product.product_title is not None else product_query
+        meta["global_rating"] = product.global_rating
+        meta["global_count"] = product.global_count
 
         # Try to click reviews link
-        try:
-            rv_btn = driver.find_element(By.ID, "acrCustomerReviewLink")
-            driver.execute_script("arguments[0].click();", rv_btn)
-            time.sleep(2 + random.random() * 2)
-        except Exception:
-            # fallback: scroll to reviews
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight * 0.75)")
-            time.sleep(2)
+        def click_to_reviews(driver):
+            try:
+                rv_btn = driver.find_element(By.ID, "acrCustomerReviewLink")
+                click_and_wait(driver, rv_btn, REVIEW_BLOCKS, "reviews page")
+            except Exception:
+                # fallback: scroll to reviews
+                driver.execute_script("window.scrollTo(0, document.body.scrollHeight * 0.75)")
+                wait_for(driver, REVIEW_BLOCKS, "reviews section", timeout=5)
+
+        known = None
+        if incremental and meta["asin"]:
+            known = (store or get_review_store()).known_review_ids(meta["asin"])
+        # the newest-first listing is only reachable by URL
+        open_reviews(driver, meta["asin"], direct=direct or known is not None, fallback=click_to_reviews,
+                     sort="recent" if known is not None else None)
 
         # Now iterate review pages until max or no more
         scraped = 0
         page = 1
         while scraped < max_reviews:
-            soup2 = BeautifulSoup(driver.page_source, "html.parser")
+            page_histogram, page_reviews = parse_reviews_page(driver.page_source)
+            meta["histogram"].update(page_histogram)
 
-            # histogram (if on this page)
-            try:
-                hist_table = soup2.find("table", id="histogramTable")
-                if hist_table:
-                    for row in hist_table.find_all("tr"):
-                        label = row.find("a") or row.find("span")
-                        if not label:
-                            continue
-                        label_text = label.get_text(strip=True)
-                        m = re.search(r"(\d)\s*star", label_text)
-                        if not m:
-                            continue
-                        star = int(m.group(1))
-                        pct_td = row.find("td", class_="a-text-right")
-                        if pct_td:
-                            pct_text = pct_td.get_text(strip=True).replace("%", "").strip()
-                            try:
-                                meta["histogram"][star] = int(re.sub(r"[^\d]", "", pct_text))
-                            except:
-                                pass
-            except Exception:
-                pass
-
-            # reviews blocks
-            blocks = soup2.select("div[data-hook='review']")
-            if not blocks:
-                # amazon sometimes uses different class, try alternative
-                blocks = soup2.select("div.review")
-
-            if not blocks:
-                # nothing to scrape on this page
-                pass
+            if known is not None:
+                if page_is_known((rv["review_id"] for rv in page_reviews), known):
+                    print(f"Page {page}: every review already stored, stopping.")
+                    break
+                page_reviews = [rv for rv in page_reviews if rv["review_id"] not in known]
+                known.update(rv["review_id"] for rv in page_reviews if rv["review_id"])
 
-            for block in blocks:
+            for rv in page_reviews:
                 if scraped >= max_reviews:
                     break
-                # rating
-                rating = None
-                try:
-                    r_tag = block.select_one("[data-hook='review-star-rating'], [data-hook='cmps-review-star-rating']")
-                    if r_tag:
-                        alt = r_tag.get_text()
-                        m = re.search(r"(\d+(\.\d+)?)", alt)
-                        if m:
-                            rating = int(float(m.group(1)))
-                except:
-                    pass
-                if rating is None:
-                    # fallback
-                    rating = 0
-
-                # text
-                body_span = block.select_one("span[data-hook='review-body'] span")
-                if body_span:
-                    text = body_span.get_text(strip=True)
-                else:
-                    # sometimes textual content is direct
-                    text = safe_get_text(block)
-                # date
-                date_text = ""
-                try:
-                    date_el = block.select_one("span[data-hook='review-date']")
-                    if date_el:
-                        date_text = date_el.get_text(strip=True)
-                except:
-                    pass
-                parsed_date = parse_review_date(date_text)
-
-                if text and len(text) > 3:
-                    reviews.append({"rating": rating, "text": text, "date": parsed_date})
-                    scraped += 1
+                reviews.append(rv)
+                scraped += 1
 
             # Move to next reviews page if exists
             try:
                 # Amazon review pagination link labelled "Next"
                 nxt = driver.find_elements(By.CSS_SELECTOR, "li.a-last a")
-                if nxt:
-                    driver.execute_script("arguments[0].click();", nxt[0])
-                    time.sleep(2 + random.random() * 2)
-                    page += 1
-                    continue
-                else:
+                if not nxt:
                     # sometimes a different structure; try find rel="next"
-                    link = driver.find_elements(By.CSS_SELECTOR, "a[aria-label='Next page'], a[aria-label='next page']")
-                    if link:
-                        driver.execute_script("arguments[0].click();", link[0])
-                        time.sleep(2 + random.random() * 2)
-                        page += 1
-                        continue
-                    else:
-                        break
+                    nxt = driver.find_elements(By.CSS_SELECTOR, "a[aria-label='Next page'], a[aria-label='next page']")
+                if not nxt:
+                    break
+                polite_pause()
+                # reviews are swapped in place; stop rather than re-read the same page
+                if click_and_wait(driver, nxt[0], REVIEW_BLOCKS, "next reviews page") is None:
+                    break
+                page += 1
             except Exception:
                 break
 
         print(f"Scraped {len(reviews)} reviews (requested {max_reviews}).")
+        WAIT_STATS.print_summary()
+        NAV_STATS.print_summary()
 
     except Exception as e:
         print("Scrape error:", e)
@@ -335,99 +286,123 @@ def scrape_amazon(product_query: str, headless=False, max_reviews=200):
 
 
 # ----------------- Analytics -----------------
-def analyze_reviews(meta, reviews, output_dir="output", top_n_keywords=20):
+def stored_reviews(store, asin):
+    """Every stored review of a product as {review_id, rating, text, date} dicts (incremental rebuilds)."""
+    return [{"review_id": r["review_id"], "rating": r["rating"], "text": r["text"],
+             "date": datetime.strptime(r["review_date"], "%Y-%m-%d").date() if r["review_date"] else None}
+            for r in reversed(store.reviews(asin))]
+
+
+def analyze_reviews(meta, reviews, output_dir="output", top_n_keywords=20, batch_size=BATCH_SIZE, store=None,
+                    output_format="parquet"):
+    """
+    Stream reviews (any iterable of {rating, text, date} dicts) through
+    sentiment scoring into the per-review table in fixed-size batches,
+    aggregating counts, monthly trend, word frequencies and TF-IDF document
+    frequencies on the way. Memory stays flat in the number of reviews; the
+    per-review table is on disk rather than in memory.
+
+    output_format: "parquet" (output_dir/reviews_parquet, partitioned by ASIN
+        and month; this product's partition is rewritten each run), "csv"
+        (output_dir/reviews.csv) or "both"
+    store: ReviewStore that also receives the scored reviews (needs meta["asin"])
+    """
     os.makedirs(output_dir, exist_ok=True)
 
-    df = pd.DataFrame(reviews)
-    if df.empty:
+    # Sentiment fallback: naive sentiment by counting positive/negative words (very rough)
+    # but we will at least provide a 'compound' placeholder using simple heuristic
+    def get_sentiment_scores(text):
+        words = re.findall(r"\w+", text.lower())
+        pos_words = {"good", "great", "excellent", "best", "love", "lovely", "nice", "happy", "fantastic", "amazing"}
+        neg_words = {"bad", "worst", "disappointed", "disappointing", "poor", "terrible", "awful", "hate"}
+        pos = sum(w in pos_words for w in words)
+        neg = sum(w in neg_words for w in words)
+        compound = (pos - neg) / (len(words) + 1)
+        return {"neg": float(neg), "neu": float(max(0, len(words) - pos - neg)), "pos": float(pos), "compound": float(compound)}
+
+    def fallback_sentiment(batch):
+        for r in batch:
+            r.update(get_sentiment_scores(str(r.get("text", ""))))
+            c = r["compound"]
+            r["sentiment"] = "positive" if c >= 0.05 else "negative" if c <= -0.05 else "neutral"
+        return batch
+
+    # Sentiment: VADER if available, scored batch by batch through the persistent score cache
+    stream = batched(({"review_id": r.get("review_id"), "rating": r.get("rating"), "text": r.get("text"),
+                       "date": r.get("date")} for r in reviews), batch_size)
+    stream = sentiment_stage(stream) if _SENT_BACKEND == "vader" else map_stage(fallback_sentiment)(stream)
+    if store is not None and meta.get("asin"):
+        store.upsert_product(meta["asin"], title=meta.get("product_title"), url=meta.get("url"),
+                             rating=meta.get("global_rating"), review_count=meta.get("global_count"))
+        stream = tee(stream, StoreSink(store, meta["asin"], backend=_SENT_BACKEND or "keywords"))
+
+    # Save the scored reviews (incrementally) while aggregating
+    out_csv = out_parquet = None
+    if output_format in ("csv", "both"):
+        out_csv = os.path.join(output_dir, "reviews.csv")
+        stream = tee(stream, CsvSink(out_csv, fieldnames=["rating", "text", "date", "neg", "neu", "pos", "compound",
+                                                          "sentiment"]))
+    if output_format in ("parquet", "both"):
+        out_parquet = os.path.join(output_dir, "reviews_parquet")
+        parquet_asin = meta.get("asin") or "unknown"
+        drop_partition(out_parquet, parquet_asin)
+        stream = tee(stream, ParquetSink(out_parquet, parquet_asin))
+    review_count = 0
+    sentiment_counter = Counter()
+    rating_counter = Counter()
+    month_sums = defaultdict(lambda: [0.0, 0])
+    word_counts = Counter()
+    tfidf = TfidfKeywords(max_df=0.85, min_df=2, stop_words="english", ngram_range=(1, 2))
+
+    for batch in stream:
+        review_count += len(batch)
+        texts = [str(r["text"]) for r in batch]
+        tfidf.fit(texts)
+        for r, t in zip(batch, texts):
+            sentiment_counter[r["sentiment"]] += 1
+            rating_counter[r["rating"]] += 1
+            # Rating trend: average rating per month
+            d = r["date"]
+            if d is not None and r["rating"] is not None:
+                bucket = month_sums[f"{d.year:04d}-{d.month:02d}"]
+                bucket[0] += r["rating"]
+                bucket[1] += 1
+            # naive tokenization, remove non-words and stop words
+            word_counts.update(re.findall(r"\w{3,}", t.lower()))
+
+    if not review_count:
         print("No reviews to analyze.")
         return
+    for path in (out_csv, out_parquet):
+        if path:
+            print(f"Saved scraped reviews -> {path}")
 
-    # Normalize date column to datetime
-    if "date" in df.columns:
-        df["date"] = pd.to_datetime(df["date"], errors="coerce")
-    else:
-        df["date"] = pd.NaT
-
-    # Sentiment: VADER if available
-    def get_sentiment_scores(text):
-        if _SENT_BACKEND == "vader" and _SENT_ANALYZER:
-            return _SENT_ANALYZER.polarity_scores(text)
-        else:
-            # fallback: naive sentiment by counting positive/negative words (very rough)
-            # but we will at least provide a 'compound' placeholder using simple heuristic
-            words = re.findall(r"\w+", text.lower())
-            pos_words = {"good", "great", "excellent", "best", "love", "lovely", "nice", "happy", "fantastic", "amazing"}
-            neg_words = {"bad", "worst", "disappointed", "disappointing", "poor", "terrible", "awful", "hate"}
-            pos = sum(w in pos_words for w in words)
-            neg = sum(w in neg_words for w in words)
-            compound = (pos - neg) / (len(words) + 1)
-            return {"neg": float(neg), "neu": float(max(0, len(words) - pos - neg)), "pos": float(pos), "compound": float(compound)}
-
-    s_scores = df["text"].apply(get_sentiment_scores)
-    s_df = pd.DataFrame(list(s_scores))
-    df = pd.concat([df.reset_index(drop=True), s_df.reset_index(drop=True)], axis=1)
-
-    # Label sentiment buckets
-    def bucket_from_compound(comp):
-        if comp >= 0.05:
-            return "positive"
-        elif comp <= -0.05:
-            return "negative"
-        else:
-            return "neutral"
-
-    df["sentiment"] = df["compound"].apply(bucket_from_compound)
-
-    # Save raw reviews to CSV
-    out_csv = os.path.join(output_dir, "reviews.csv")
-    df.to_csv(out_csv, index=False)
-    print(f"Saved scraped reviews -> {out_csv}")
-
-    # Sentiment distribution
-    sentiment_counts = df["sentiment"].value_counts().to_dict()
-
-    # Rating distribution
-    rating_counts = df["rating"].value_counts().sort_index().to_dict()
-
-    # Rating trend: average rating per month
-    df["month"] = df["date"].dt.to_period("M")
-    rating_trend = df.dropna(subset=["month"]).groupby("month")["rating"].mean()
-    # fill if empty
-    if rating_trend.empty and not df["date"].isna().all():
-        try:
-            # group by date string fallback
-            rating_trend = df.groupby(df["date"].dt.to_period("M"))["rating"].mean()
-        except:
-            rating_trend = pd.Series(dtype=float)
+    # Sentiment / rating distribution
+    sentiment_counts = dict(sentiment_counter.most_common())
+    rating_counts = dict(sorted(rating_counter.items(), key=lambda kv: (kv[0] is None, kv[0] or 0)))
+    rating_trend = pd.Series({m: s / n for m, (s, n) in sorted(month_sums.items())}, dtype=float)
 
-    # Keyword extraction: TF-IDF top features
-    texts = df["text"].astype(str).tolist()
-    tfidf = TfidfVectorizer(max_df=0.85, min_df=2, stop_words="english", ngram_range=(1,2))
+    # Keyword extraction: TF-IDF top features (second pass over the saved texts)
     try:
-        X = tfidf.fit_transform(texts)
-        sums = np.asarray(X.sum(axis=0)).ravel()
-        terms = tfidf.get_feature_names_out()
-        term_scores = list(zip(terms, sums))
-        term_scores = sorted(term_scores, key=lambda x: x[1], reverse=True)
-        top_keywords = term_scores[:top_n_keywords]
+        texts = iter_column(out_parquet, "text", parquet_asin) if out_parquet else iter_csv_column(out_csv, "text")
+        top_keywords = tfidf.top_terms(texts, top_n_keywords)
     except Exception:
         top_keywords = []
 
     # Frequency table (top words)
-    all_words = []
-    for t in texts:
-        # naive tokenization, remove non-words and stop words
-        tokens = re.findall(r"\w{3,}", t.lower())
-        all_words.extend(tokens)
-    c = Counter(all_words)
-    top_words = c.most_common(30)
+    top_words = word_counts.most_common(30)
 
     # Wordcloud
     try:
         from wordcloud import WordCloud
+        from wordcloud.tokenization import process_tokens
         wc = WordCloud(width=1200, height=600, collocations=False, background_color="white")
-        wc_img = wc.generate(" ".join(all_words))
+        # what wc.generate(" ".join(all words)) did (numbers and stopwords dropped, plurals
+        # folded), fed from the streamed counts instead of one joined string
+        stopwords = {w.lower() for w in wc.stopwords}
+        words = (w for w, n in word_counts.items() if not w.isdigit() and w not in stopwords for _ in range(n))
+        frequencies, _ = process_tokens(words, wc.normalize_plurals)
+        wc_img = wc.generate_from_frequencies(frequencies)
         wc_path = os.path.join(output_dir, "wordcloud.png")
         wc_img.to_file(wc_path)
         print(f"Saved wordcloud -> {wc_path}")
@@ -508,7 +483,9 @@ def analyze_reviews(meta, reviews, output_dir="output", top_n_keywords=20):
 
     # Also return analysis objects
     results = {
-        "df": df,
+        "reviews_csv": out_csv,
+        "reviews_parquet": out_parquet,
+        "review_count": review_count,
         "sentiment_counts": sentiment_counts,
         "rating_counts": rating_counts,
         "top_keywords": top_keywords,
@@ -530,14 +507,26 @@ def main():
     parser.add_argument("--headless", action="store_true", help="Run browser headless")
     parser.add_argument("--max", type=int, default=200, help="Max reviews to scrape (default 200)")
     parser.add_argument("--out", default="output", help="Output directory")
+    parser.add_argument("--format", choices=["parquet", "csv", "both"], default="parquet",
+                        help="Per-review table format (default parquet; csv as an export)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only scrape reviews newer than the ones already in the review store")
     args = parser.parse_args()
 
-    meta, reviews = scrape_amazon(args.query, headless=args.headless, max_reviews=args.max)
+    store = get_review_store()
+    meta, reviews = scrape_amazon(args.query, headless=args.headless, max_reviews=args.max,
+                                  incremental=args.incremental, store=store)
     if not reviews:
         print("No reviews scraped. Exiting.")
         return
-
-    results = analyze_reviews(meta, reviews, output_dir=args.out)
+    if args.incremental and meta.get("asin"):
+        # only the new reviews were scraped: store them, then analyze every stored review of
+        # the product so the Parquet snapshot, summary and plots still cover all of them
+        store.add_reviews(meta["asin"], reviews)
+        reviews = stored_reviews(store, meta["asin"])
+        print(f"Analyzing all {len(reviews)} stored reviews of {meta['asin']}.")
+
+    results = analyze_reviews(meta, reviews, output_dir=args.out, store=store, output_format=args.format)
     print("\nDone. Outputs in directory:", args.out)
     print("Summary file:", results.get("summary_path"))
     if results.get("wordcloud_path"):
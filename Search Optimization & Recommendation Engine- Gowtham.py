@@ -1,38 +1,80 @@
+import atexit
 import time
 import random
+import threading
 import traceback
-import re
 from collections import Counter
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
-from textblob import TextBlob
-from bs4 import BeautifulSoup
-from flask_caching import Cache
-from rapidfuzz import process, fuzz
+from sentiment_cache import textblob_polarity
+
+from driver_pool import DriverPool, uc_factory
+from browser_profile import track_page
+from page_waits import wait_for, wait_gone, click_and_wait, PRODUCT_TITLE, REVIEW_BLOCKS
+from amazon_nav import open_search, open_reviews, asin_from_url, query_key
+from review_extractor import Selectors, extract_page
+from review_store import get_review_store
+from analysis_jobs import JobManager
+from result_cache import ResultCache
+from query_resolver import QueryResolver
+from review_search import ReviewIndex, INDEX_PATH, SENTIMENTS
+from recommender import Recommender, RECS_PATH
 
 # Selenium
-import undetected_chromedriver as uc
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.action_chains import ActionChains
 
 app = Flask(__name__)
 CORS(app)
 
-# Cache
-app.config["CACHE_TYPE"] = "SimpleCache"
-app.config["CACHE_DEFAULT_TIMEOUT"] = 3600
-cache = Cache(app)
-SEARCH_HISTORY_INDEX = {}
+# this engine's own review selectors (kept as they were before the shared extractor);
+# a missing or empty body falls back to the block's whole text
+REVIEW_SELECTORS = Selectors(
+    blocks=("div[data-hook='review'], div[data-hook='review-collapsed'], div.a-section.review",),
+    star=("[data-hook='review-star-rating'] .a-icon-alt",),
+    body=("span[data-hook='review-body'] span",),
+    fallback_on_empty=True,
+)
+
+# Analysis results by normalized query / ASIN: LRU-bounded, fresh for an hour,
+# then served stale for up to a day while a background job refreshes them
+RESULT_CACHE = ResultCache(max_entries=500, max_bytes=64 * 1024 * 1024, ttl=3600, stale_ttl=24 * 3600)
+# Maps new spellings of an analyzed query ("Boat Airdopes-141 earbuds") onto its cache key
+RESOLVER = QueryResolver(threshold=88)
+
+# BM25 index over every stored review, caught up with the store after each analysis
+SEARCH_INDEX = ReviewIndex.load(INDEX_PATH)
+SNAPSHOT_EVERY = 50000   # newly indexed reviews between snapshots (and one at shutdown)
+_index_lock = threading.Lock()
+_unsaved = 0
+_saved_state = (SEARCH_INDEX.last_row_id, SEARCH_INDEX.last_label_seq)
+
+# Top-10 similar products per analyzed product, updated as products are analyzed
+RECOMMENDER = Recommender.load(RECS_PATH)
+RECS_REVIEWS = 500       # stored reviews per product used for its vector
+RECS_SAVE_EVERY = 20     # analyses between neighbor-table snapshots (and one at shutdown)
+_recs_lock = threading.Lock()
+_recs_unsaved = 0
+
+# Browsers are started once and leased per request instead of launched per call.
+# LEAN_BROWSER: eager page loads with images / fonts / media / trackers blocked
+LEAN_BROWSER = True
+DRIVER_POOL = DriverPool(lambda: uc_factory(lean=LEAN_BROWSER), size=2, max_uses=20)
+# DIRECT_NAV: open /s?k= and /product-reviews/{asin} directly; False = homepage + typed search
+DIRECT_NAV = True
+
+# Scrapes run as background jobs, one per pooled browser; requests only enqueue and poll
+JOBS = JobManager(workers=DRIVER_POOL.size)
 
 # =========================================================
 # SENTIMENT HELPER (Used only for sample review table)
 # =========================================================
-def get_sentiment(text):
-    """We use this only for displaying sentiment in the sample reviews table."""
+def get_sentiment(text, polarity=None):
+    """
+    We use this only for displaying sentiment in the sample reviews table.
+    polarity: precomputed TextBlob polarity (process_data scores a whole batch at once)
+    """
     text_lower = text.lower()
 
     negative_keywords = [
@@ -44,7 +86,8 @@ def get_sentiment(text):
     if any(word in text_lower for word in negative_keywords):
         return "Negative"
 
-    polarity = TextBlob(text).sentiment.polarity
+    if polarity is None:
+        polarity = textblob_polarity([text])[0]
 
     if polarity > 0.10:
         return "Positive"
@@ -70,167 +113,109 @@ def handle_popups(driver):
         )
         if dismiss_btn:
             dismiss_btn[0].click()
-            time.sleep(1)
+            wait_gone(driver, dismiss_btn[0])
 
         dont_change_btn = driver.find_elements(
             By.XPATH, "//input[@value=\"Don't Change\"]"
         )
         if dont_change_btn:
             dont_change_btn[0].click()
-            time.sleep(1)
+            wait_gone(driver, dont_change_btn[0])
     except:
         pass
 
 
-def scrape_amazon_realtime(product_query):
+def scrape_amazon_realtime(product_query, progress=None):
+    """progress(stage, pages=..., ...) is called after each page (see analysis_jobs)."""
     print(f"🔍 Searching for: {product_query}")
+    progress = progress or (lambda stage, **info: None)
 
     scraped_data = []
     title = None
     global_rating = None
     global_count = None
     histogram = {}
+    asin = None
 
-    options = uc.ChromeOptions()
-    options.add_argument("--start-maximized")
-    options.add_argument("--disable-gpu")
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-
-    driver = None
     try:
-        driver = uc.Chrome(options=options)
-
-        # Homepage
-        driver.get("https://www.amazon.in/")
-        time.sleep(2)
-        handle_popups(driver)
-
-        # Search
-        box = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.ID, "twotabsearchtextbox"))
-        )
-        box.click()
-        human_type(box, product_query)
-        box.send_keys(Keys.RETURN)
-        time.sleep(3)
-
-        # Find product result
-        product_link = None
-        results = driver.find_elements(
-            By.CSS_SELECTOR,
-            "a.a-link-normal.s-underline-text.s-underline-link-text.s-link-style.a-text-normal",
-        )
-        for res in results:
-            href = res.get_attribute("href")
-            if href and "/slredirect/" not in href:
-                product_link = href
-                break
-
-        if not product_link:
-            return [], None, None, None, {}
-
-        # Open product page
-        driver.get(product_link)
-        time.sleep(3)
-        handle_popups(driver)
-
-        soup = BeautifulSoup(driver.page_source, "html.parser")
-
-        # Title
-        try:
-            title = soup.select_one("#productTitle").get_text(strip=True)
-        except:
-            title = product_query
-
-        # Global rating
-        try:
-            r_el = soup.select_one("span[data-hook='rating-out-of-text']")
-            if r_el:
-                rt = r_el.get_text(strip=True)
-                m = re.search(r"(\d+(\.\d+)?)", rt)
-                if m:
-                    global_rating = float(m.group(1))
-        except:
-            pass
-
-        # Global review count
-        try:
-            c_el = soup.select_one("#acrCustomerReviewText")
-            if c_el:
-                count = re.sub(r"[^\d]", "", c_el.get_text(strip=True))
-                if count:
-                    global_count = int(count)
-        except:
-            pass
-
-        # Histogram (star percentages)
-        try:
-            hist = soup.select_one("#histogramTable")
-            if hist:
-                rows = hist.select("tr")
-                for row in rows:
-                    label = row.select_one("a, span")
-                    if not label: continue
-                    star_text = label.get_text(strip=True)
-                    star_match = re.search(r"(\d)\s*star", star_text)
-                    if not star_match: continue
-
-                    star = int(star_match.group(1))
-                    pct_el = row.select_one("td.a-text-right")
-                    if pct_el:
-                        pct = pct_el.get_text(strip=True).replace("%", "")
-                        histogram[star] = int(pct)
-        except:
-            pass
-
-        print("📊 Histogram:", histogram)
-
-        # Go to review section
-        try:
-            review_link = driver.find_element(By.ID, "acrCustomerReviewLink")
-            driver.execute_script("arguments[0].click();", review_link)
-            time.sleep(4)
-        except:
-            pass
-
-        soup2 = BeautifulSoup(driver.page_source, "html.parser")
-        review_blocks = soup2.select(
-            "div[data-hook='review'], div[data-hook='review-collapsed'], div.a-section.review"
-        )
-
-        # Scrape sample reviews
-        for block in review_blocks:
-            txt = ""
-            b1 = block.select_one("span[data-hook='review-body'] span")
-            if b1:
-                txt = b1.get_text(strip=True)
-
-            if not txt:
-                txt = block.get_text(strip=True)
-
-            if len(txt) < 5:
-                continue
-
-            # extract star rating for table (not used in sentiment)
-            rating = 3
-            r_icon = block.select_one("[data-hook='review-star-rating']")
-            if r_icon:
-                alt = r_icon.select_one(".a-icon-alt")
-                if alt:
-                    m = re.search(r"(\d+)", alt.get_text(strip=True))
-                    if m:
-                        rating = int(m.group(1))
-
-            scraped_data.append({"text": txt, "rating": rating})
+        with DRIVER_POOL.lease() as driver:
+            # Search
+            open_search(driver, product_query, direct=DIRECT_NAV, typer=human_type, on_home=handle_popups)
+            progress("search", pages=1)
+
+            # Find product result
+            product_link = None
+            results = driver.find_elements(
+                By.CSS_SELECTOR,
+                "a.a-link-normal.s-underline-text.s-underline-link-text.s-link-style.a-text-normal",
+            )
+            for res in results:
+                href = res.get_attribute("href")
+                if href and "/slredirect/" not in href:
+                    product_link = href
+                    break
+
+            if not product_link:
+                return [], None, None, None, {}, None
+
+            # Open product page
+            with track_page(driver, "product", lean=LEAN_BROWSER):
+                driver.get(product_link)
+                wait_for(driver, PRODUCT_TITLE, "product page")
+                handle_popups(driver)
+
+                product = extract_page(driver.page_source)
+
+            # Title, global rating, review count, histogram (star percentages)
+            title = product.product_title if product.product_title is not None else product_query
+            global_rating = product.global_rating
+            global_count = product.global_count
+            histogram = product.histogram
+
+            print("📊 Histogram:", histogram)
+            progress("product", pages=2, title=title)
+
+            # Go to review section
+            def click_to_reviews(driver):
+                try:
+                    review_link = driver.find_element(By.ID, "acrCustomerReviewLink")
+                    click_and_wait(driver, review_link, REVIEW_BLOCKS, "reviews page")
+                except:
+                    pass
+
+            with track_page(driver, "reviews", lean=LEAN_BROWSER):
+                open_reviews(driver, asin_from_url(product_link), direct=DIRECT_NAV, fallback=click_to_reviews)
+
+                review_blocks = extract_page(driver.page_source, block_text_fallback=True,
+                                             selectors=REVIEW_SELECTORS).reviews
+
+            # Scrape sample reviews
+            kept = []
+            for block in review_blocks or []:
+                txt = block.text
+                if len(txt) < 5:
+                    continue
+
+                # star rating for table (not used in sentiment)
+                rating = block.rating or 3
+
+                kept.append(block)
+                scraped_data.append({"text": txt, "rating": rating})
+            progress("reviews", pages=3, reviews=len(scraped_data))
+
+            # Write through to the review store; ids let process_data attach sentiment
+            asin = asin_from_url(product_link)
+            if asin:
+                store = get_review_store()
+                store.upsert_product(asin, title=title, url=product_link, rating=global_rating,
+                                     review_count=global_count)
+                for r, review_id in zip(scraped_data, store.add_reviews(asin, kept)):
+                    r["review_id"] = review_id
 
     except Exception as e:
         print("❌ Scraper Error:", e)
-    finally:
-        if driver:
-            driver.quit()
 
-    return scraped_data, title, global_rating, global_count, histogram
+    return scraped_data, title, global_rating, global_count, histogram, asin
 
 
 # =========================================================
@@ -239,14 +224,21 @@ def scrape_amazon_realtime(product_query):
 def process_data(raw_reviews, product_query, global_rating, global_count, histogram):
     # sample reviews table sentiment
     processed_reviews = []
-    for i, r in enumerate(raw_reviews):
+    scored = []
+    polarities = textblob_polarity([r["text"] for r in raw_reviews])
+    for i, (r, polarity) in enumerate(zip(raw_reviews, polarities)):
+        sentiment = get_sentiment(r["text"], polarity)
         processed_reviews.append({
             "id": i + 1,
             "text": r["text"],
-            "sentiment": get_sentiment(r["text"]),
+            "sentiment": sentiment,
             "rating": r["rating"],
             "date": "Verified Amazon.in"
         })
+        if r.get("review_id"):
+            scored.append((r["review_id"], polarity, sentiment))
+    if scored:
+        get_review_store().add_sentiment(scored, "textblob")
 
     # Total reviews from Amazon
     total_reviews = global_count if global_count else len(raw_reviews)
@@ -308,41 +300,255 @@ def process_data(raw_reviews, product_query, global_rating, global_count, histog
 
 
 # =========================================================
-# API ROUTE
+# REVIEW SEARCH INDEX
+# =========================================================
+def refresh_search_index():
+    """Index reviews stored since the last sync; snapshot every SNAPSHOT_EVERY new reviews."""
+    global _unsaved
+    with _index_lock:
+        added = SEARCH_INDEX.sync(get_review_store())
+        _unsaved += added
+        if _unsaved >= SNAPSHOT_EVERY:
+            _save_search_index()
+    return added
+
+
+def _save_search_index():
+    global _unsaved, _saved_state
+    state = (SEARCH_INDEX.last_row_id, SEARCH_INDEX.last_label_seq)
+    if state != _saved_state:
+        SEARCH_INDEX.save(INDEX_PATH)
+        _saved_state = state
+    _unsaved = 0
+
+
+def save_search_index():
+    """Snapshot reviews and labels indexed since the last snapshot (runs at shutdown)."""
+    with _index_lock:
+        _save_search_index()
+
+
+atexit.register(save_search_index)
+
+
+# =========================================================
+# RECOMMENDATIONS
+# =========================================================
+def update_recommendations(product_id, asin, title, raw_reviews, result, histogram):
+    """
+    Add the product to the neighbor table (from its stored reviews when it has
+    an ASIN, else this scrape's) and return its recommendations.
+    """
+    global _recs_unsaved
+    stored = get_review_store().reviews(asin, limit=RECS_REVIEWS) if asin else []
+    if stored:
+        texts = [r["text"] for r in stored]
+        ratings = [r["rating"] for r in stored]
+        labels = [r["sentiment"].get("vader") or r["sentiment"].get("textblob") for r in stored]
+        # reviews stored without a score yet are scored here, so they still count in the mix
+        unscored = [i for i, label in enumerate(labels) if not label]
+        for i, p in zip(unscored, textblob_polarity([texts[i] for i in unscored])):
+            labels[i] = get_sentiment(texts[i], p)
+    else:
+        texts = [r["text"] for r in raw_reviews]
+        ratings = [r["rating"] for r in raw_reviews]
+        labels = [get_sentiment(t, p) for t, p in zip(texts, textblob_polarity(texts))]
+    # the product page's star shares, or the scraped reviews' ratings without one
+    stars = histogram or Counter(ratings)
+
+    RECOMMENDER.add(product_id, texts, labels, stars, name=title, asin=asin,
+                    averageRating=result["averageRating"], totalReviews=result["totalReviews"])
+    with _recs_lock:
+        _recs_unsaved += 1
+        if _recs_unsaved >= RECS_SAVE_EVERY:
+            RECOMMENDER.save(RECS_PATH)
+            _recs_unsaved = 0
+    return RECOMMENDER.recommendations(product_id)
+
+
+def save_recommendations():
+    """Snapshot the neighbor table if products were added since the last one (runs at shutdown)."""
+    global _recs_unsaved
+    with _recs_lock:
+        if _recs_unsaved:
+            RECOMMENDER.save(RECS_PATH)
+            _recs_unsaved = 0
+
+
+atexit.register(save_recommendations)
+
+
+def product_id_of(result, key):
+    """Neighbor-table id of a cached result found under key (see run_analysis)."""
+    return f"asin:{result['asin']}" if result.get("asin") else key
+
+
+# =========================================================
+# ANALYSIS JOB (runs on a JOBS worker thread)
+# =========================================================
+def run_analysis(product_query, progress=None):
+    raw_reviews, title, rating, count, histogram, asin = scrape_amazon_realtime(product_query, progress)
+
+    if progress:
+        progress("processing", reviews=len(raw_reviews))
+    result = process_data(raw_reviews, product_query, rating, count, histogram)
+    refresh_search_index()
+    result["productName"] = title
+    result["asin"] = asin
+    result["recommendations"] = []
+
+    # stored under the ASIN so every spelling of the query (and the product link) shares it;
+    # a failed scrape (no product found) is not cached
+    if title is not None:
+        key = query_key(product_query)
+        target = f"asin:{asin}" if asin else key
+        result["recommendations"] = update_recommendations(target, asin, title, raw_reviews, result, histogram)
+        RESULT_CACHE.put(target, result, aliases=[key] if asin else ())
+        RESOLVER.add(product_query, target)
+    return result
+
+
+# =========================================================
+# API ROUTES
 # =========================================================
 @app.route("/api/analyze_product", methods=["GET"])
 def analyze_product():
+    """
+    Starts an analysis and returns its job at once (202), or a finished job
+    (200) on a cache hit. Follow it with /api/jobs/<id> or /api/jobs/<id>/events.
+    A stale hit is returned as well (with "stale": true) and refreshed in the background.
+    """
     try:
         product_query = request.args.get("product", "").strip()
         if not product_query:
             return jsonify({"message": "No product provided"}), 400
 
-        data_cached = SEARCH_HISTORY_INDEX.get(product_query)
-        if data_cached:
-            return jsonify(data_cached)
+        key = query_key(product_query)
+        if key.startswith("q:"):
+            # same or close-enough query analyzed before: use its key (usually the ASIN)
+            key = RESOLVER.resolve(product_query) or key
+        data_cached, fresh = RESULT_CACHE.get(key)
+        if data_cached is not None:
+            # neighbors analyzed since the result was cached show up too
+            data_cached = {**data_cached,
+                           "recommendations": RECOMMENDER.recommendations(product_id_of(data_cached, key))}
+            body = JOBS.completed(product_query, data_cached)
+            if not fresh:
+                body["stale"] = True
+                body["refreshJobId"] = JOBS.submit(run_analysis, product_query, key=key).id
+            return jsonify(body)
+
+        # identical analyses already queued or running are joined, not scraped again
+        job = JOBS.submit(run_analysis, product_query, key=key)
+        body = JOBS.status(job.id)
+        body["statusUrl"] = f"/api/jobs/{job.id}"
+        body["eventsUrl"] = f"/api/jobs/{job.id}/events"
+        return jsonify(body), 202
+
+    except Exception as e:
+        traceback.print_exc()
+        return jsonify({"message": "Server error", "error": str(e)}), 500
+
+
+@app.route("/api/jobs/<job_id>", methods=["GET"])
+def job_status(job_id):
+    status = JOBS.status(job_id)
+    if status is None:
+        return jsonify({"message": "Unknown or expired job"}), 404
+    return jsonify(status)
 
-        raw_reviews, title, rating, count, histogram = scrape_amazon_realtime(product_query)
 
-        result = process_data(raw_reviews, product_query, rating, count, histogram)
-        result["productName"] = title
-        result["recommendations"] = [
-            {"id": 1, "name": "Best Sellers"},
-            {"id": 2, "name": "Top Rated Accessories"},
-        ]
+@app.route("/api/jobs/<job_id>/events", methods=["GET"])
+def job_events(job_id):
+    if JOBS.get(job_id) is None:
+        return jsonify({"message": "Unknown or expired job"}), 404
+    return Response(stream_with_context(JOBS.events(job_id)), mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
 
-        SEARCH_HISTORY_INDEX[product_query] = result
 
-        return jsonify(result)
+@app.route("/api/jobs/stats", methods=["GET"])
+def job_stats():
+    """Job counts by status plus how many analyze requests joined an in-flight scrape."""
+    return jsonify(JOBS.stats())
+
+
+@app.route("/api/search_reviews", methods=["GET"])
+def search_reviews():
+    """
+    BM25 search over stored reviews: ?q=...&k=10 with optional min_rating,
+    max_rating, sentiment (positive / neutral / negative) and asin filters.
+    """
+    try:
+        query = request.args.get("q", "").strip()
+        if not query:
+            return jsonify({"message": "No query provided"}), 400
+        params = {}
+        for name, default, low, high in (("k", 10, 1, None), ("min_rating", None, 1, 5), ("max_rating", None, 1, 5)):
+            value = request.args.get(name, "").strip()
+            if not value:
+                params[name] = default
+                continue
+            if not value.isdigit() or int(value) < low or (high is not None and int(value) > high):
+                limits = f"{low}..{high}" if high is not None else f">= {low}"
+                return jsonify({"message": f"{name} must be an integer {limits}"}), 400
+            params[name] = int(value)
+        sentiment = request.args.get("sentiment", "").strip().lower() or None
+        if sentiment is not None and sentiment not in SENTIMENTS:
+            return jsonify({"message": f"sentiment must be one of {sorted(SENTIMENTS)}"}), 400
+
+        start = time.perf_counter()
+        hits = SEARCH_INDEX.search(query, k=min(params["k"], 100),
+                                   min_rating=params["min_rating"],
+                                   max_rating=params["max_rating"],
+                                   sentiment=sentiment,
+                                   asin=request.args.get("asin") or None)
+        search_ms = (time.perf_counter() - start) * 1000
+
+        rows = get_review_store().reviews_by_row_ids(row_id for row_id, _ in hits)
+        labels = SEARCH_INDEX.sentiment_of(row_id for row_id, _ in hits)
+        results = [{**rows[row_id], "score": round(score, 4), "sentiment": labels.get(row_id)}
+                   for row_id, score in hits if row_id in rows]
+        return jsonify({"query": query, "searchMs": round(search_ms, 2), "hits": results})
 
     except Exception as e:
         traceback.print_exc()
         return jsonify({"message": "Server error", "error": str(e)}), 500
 
 
+@app.route("/api/recommendations", methods=["GET"])
+def recommendations():
+    """
+    Similar products for an analyzed product (?product=<query, link or ASIN>&n=10),
+    read from the precomputed neighbor table.
+    """
+    product_query = request.args.get("product", "").strip()
+    if not product_query:
+        return jsonify({"message": "No product provided"}), 400
+    # resolved queries map onto the key the product was analyzed under
+    key = query_key(product_query)
+    if key.startswith("q:"):
+        key = RESOLVER.resolve(product_query) or key
+    if key not in RECOMMENDER:
+        return jsonify({"message": "Product not analyzed yet"}), 404
+    n = request.args.get("n", type=int)
+    return jsonify({"product": key, "recommendations": RECOMMENDER.recommendations(key, n)})
+
+
+@app.route("/api/cache/stats", methods=["GET"])
+def cache_stats():
+    """
+    Result cache entries, estimated bytes, hit / stale / miss counts and evictions,
+    plus the fuzzy resolver's counts (added_hit_rate: lookups answered only by fuzzy matching).
+    """
+    return jsonify({**RESULT_CACHE.stats(), "resolver": RESOLVER.stats()})
+
+
 # =========================================================
 # RUN SERVER
 # =========================================================
 
 if __name__ == "__main__":
+    # catch the search index up with reviews other scrapers stored while we were down
+    threading.Thread(target=refresh_search_index, name="index-sync", daemon=True).start()
     print("🚀 Starting Flask backend on http://127.0.0.1:5000")
-    app.run(host="127.0.0.1", port=5000, debug=True)
\ No newline at end of file
+    app.run(host="127.0.0.1", port=5000, debug=True, threaded=True)
\ No newline at end of file
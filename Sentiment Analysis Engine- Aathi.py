@@ -1,24 +1,31 @@
 import time
 import random
-import re
 import traceback
-from bs4 import BeautifulSoup
 
 # Selenium + driver
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.action_chains import ActionChains
 
-# ---- Sentiment (VADER only) ----
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-vader = SentimentIntensityAnalyzer()
+# ---- Sentiment (VADER only, through the shared score cache) ----
+from batch_sentiment import sentiment_labels
+from sentiment_cache import vader_scores
 # --------------------------------
 
+from review_extractor import Selectors, extract_page
+from page_waits import wait_for, wait_gone, click_and_wait, PRODUCT_TITLE, REVIEW_BLOCKS
+from amazon_nav import NAV_STATS, open_search, open_reviews, asin_from_url
+from review_store import get_review_store
+
+# this scraper's own review selectors (kept as they were before the shared extractor)
+REVIEW_SELECTORS = Selectors(
+    blocks=("div[data-hook='review']",),
+    star=("[data-hook='review-star-rating'] .a-icon-alt",),
+    body=("span[data-hook='review-body'] span",),
+)
+
 
 def human_type(element, text: str):
     for ch in text:
@@ -34,19 +41,18 @@ def handle_popups(driver):
         )
         if btns:
             btns[0].click()
-            time.sleep(1)
+            wait_gone(driver, btns[0])
 
         no_change = driver.find_elements(By.XPATH, "//input[@value=\"Don't Change\"]")
         if no_change:
             no_change[0].click()
-            time.sleep(1)
+            wait_gone(driver, no_change[0])
     except:
         pass
 
 
 def analyze_sentiment(text):
-    v = vader.polarity_scores(text)
-    compound = v["compound"]
+    compound = float(vader_scores([text])["compound"][0])
 
     if compound >= 0.05:
         sentiment = "Positive"
@@ -58,7 +64,13 @@ def analyze_sentiment(text):
     return compound, sentiment
 
 
-def scrape_amazon(product_query: str):
+def analyze_sentiment_batch(texts):
+    """analyze_sentiment for many texts at once: (compound array, label array)."""
+    compound = vader_scores(texts)["compound"]
+    return compound, sentiment_labels(compound, labels=("Negative", "Neutral", "Positive"))
+
+
+def scrape_amazon(product_query: str, direct: bool = True):
     print(f"\n🔍 Searching Amazon for: {product_query}\n")
 
     reviews_output = []
@@ -72,17 +84,8 @@ def scrape_amazon(product_query: str):
     )
 
     try:
-        driver.get("https://www.amazon.in/")
-        time.sleep(2)
-        handle_popups(driver)
-
-        search_box = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.ID, "twotabsearchtextbox"))
-        )
-        search_box.click()
-        human_type(search_box, product_query)
-        search_box.send_keys(Keys.RETURN)
-        time.sleep(3)
+        # direct=False falls back to homepage + typed search
+        open_search(driver, product_query, direct=direct, typer=human_type, on_home=handle_popups)
 
         # First product
         products = driver.find_elements(
@@ -101,63 +104,47 @@ def scrape_amazon(product_query: str):
             return
 
         driver.get(link)
-        time.sleep(3)
+        wait_for(driver, PRODUCT_TITLE, "product page")
         handle_popups(driver)
 
-        soup = BeautifulSoup(driver.page_source, "html.parser")
-
-        try:
-            title = soup.select_one("#productTitle").get_text(strip=True)
-        except:
-            title = product_query
-
-        try:
-            r = soup.select_one("span[data-hook='rating-out-of-text']")
-            global_rating = float(re.search(r"[\d.]+", r.get_text()).group())
-        except:
-            global_rating = None
-
-        try:
-            count = soup.select_one("#acrCustomerReviewText")
-            total_reviews = int(re.sub(r"[^\d]", "", count.get_text()))
-        except:
-            total_reviews = None
+        product = extract_page(driver.page_source)
+        title = product.product_title if product.product_title is not None else product_query
+        global_rating = product.global_rating
+        total_reviews = product.global_count
 
         # Go to review page
-        try:
-            driver.find_element(By.ID, "acrCustomerReviewLink").click()
-            time.sleep(3)
-        except:
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight)")
-            time.sleep(2)
+        def click_to_reviews(driver):
+            try:
+                click_and_wait(driver, driver.find_element(By.ID, "acrCustomerReviewLink"),
+                               REVIEW_BLOCKS, "reviews page")
+            except:
+                driver.execute_script("window.scrollTo(0, document.body.scrollHeight)")
+                wait_for(driver, REVIEW_BLOCKS, "reviews section", timeout=5)
 
-        soup2 = BeautifulSoup(driver.page_source, "html.parser")
+        open_reviews(driver, asin_from_url(link), direct=direct, fallback=click_to_reviews)
 
         # -------- SCRAPE REVIEWS --------
-        blocks = soup2.select("div[data-hook='review']")
+        blocks = extract_page(driver.page_source, selectors=REVIEW_SELECTORS).reviews or []
 
-        for block in blocks:
-            body_tag = block.select_one("span[data-hook='review-body'] span")
-            text = body_tag.get_text(strip=True) if body_tag else ""
-            if len(text) < 5:
-                continue
-
-            rating = 3
-            tag = block.select_one("[data-hook='review-star-rating'] .a-icon-alt")
-            if tag:
-                m = re.search(r"(\d)", tag.get_text(strip=True))
-                if m:
-                    rating = int(m.group(1))
-
-            compound, sentiment = analyze_sentiment(text)
+        blocks = [b for b in blocks if len(b.text) >= 5]
+        compounds, sentiments = analyze_sentiment_batch(b.text for b in blocks)
 
+        for block, compound, sentiment in zip(blocks, compounds, sentiments):
             reviews_output.append({
-                "rating": rating,
-                "review": text,
-                "compound": compound,
+                "rating": block.rating or 3,
+                "review": block.text,
+                "compound": float(compound),
                 "sentiment": sentiment,
             })
 
+        # -------- STORE --------
+        asin = asin_from_url(link)
+        if asin:
+            store = get_review_store()
+            store.upsert_product(asin, title=title, url=link, rating=global_rating, review_count=total_reviews)
+            ids = store.add_reviews(asin, blocks)
+            store.add_sentiment(zip(ids, compounds, sentiments), "vader")
+
         # -------- OUTPUT --------
         print("\n====================")
         print(" PRODUCT DETAILS")
@@ -175,6 +162,7 @@ def scrape_amazon(product_query: str):
             print("Review:", r['review'])
             print("Compound Score:", r['compound'])
 
+        NAV_STATS.print_summary()
         print("\n🎉 DONE!")
 
     except Exception as e:
@@ -119,13 +119,21 @@ import random
 import re
 import traceback
 import pandas as pd
-from bs4 import BeautifulSoup
+
+from review_extractor import Selectors, extract_reviews
 
 import undetected_chromedriver as uc
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.common.keys import Keys
+
+from page_waits import wait_for, click_and_wait, PRODUCT_TITLE, REVIEW_BLOCKS
+from amazon_nav import NAV_STATS, open_search, open_reviews, asin_from_url
+
+# this scraper's own review selectors (kept as they were before the shared extractor)
+REVIEW_SELECTORS = Selectors(
+    blocks=("div[data-hook='review']",),
+    star=("i[data-hook='review-star-rating']",),
+    body=("span[data-hook='review-body'] span",),
+)
 
 
 def human_type(element, text: str):
@@ -134,26 +142,17 @@ def human_type(element, text: str):
         time.sleep(random.uniform(0.03, 0.07))
 
 
-def scrape_amazon(product_query: str):
+def scrape_amazon_stream(product_query: str, direct: bool = True, max_pages: int = 1):
+    """Yield {asin, review_id, rating, text} review dicts page by page (the browser closes when the generator does)."""
     print(f"\n🔍 Scraping Amazon for: {product_query}\n")
 
-    scraped_reviews = []
-
     options = uc.ChromeOptions()
     options.add_argument("--start-maximized")
     driver = uc.Chrome(options=options)
 
     try:
-        driver.get("https://www.amazon.in/")
-        time.sleep(2)
-
-        search_box = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.ID, "twotabsearchtextbox"))
-        )
-        search_box.click()
-        human_type(search_box, product_query)
-        search_box.send_keys(Keys.RETURN)
-        time.sleep(3)
+        # direct=False: homepage + typed search, then click through the product page
+        open_search(driver, product_query, direct=direct, typer=human_type)
 
         products = driver.find_elements(
             By.CSS_SELECTOR,
@@ -162,42 +161,36 @@ def scrape_amazon(product_query: str):
 
         if not products:
             print("❌ No products found.")
-            return None
+            return
 
-        # Open first product
         product_link = products[0].get_attribute("href")
-        driver.get(product_link)
-        time.sleep(3)
-
-        # Go to reviews page
-        try:
-            rv = driver.find_element(By.ID, "acrCustomerReviewLink")
-            rv.click()
-            time.sleep(3)
-        except:
-            print("⚠ Couldn't open reviews page.")
 
-        soup = BeautifulSoup(driver.page_source, "html.parser")
-        blocks = soup.select("div[data-hook='review']")
-
-        for block in blocks:
-            body_span = block.select_one("span[data-hook='review-body'] span")
-            text = body_span.get_text(strip=True) if body_span else ""
-
-            rating = block.select_one("i[data-hook='review-star-rating']")
-            if rating:
-                rating = int(rating.text[0])
-            else:
-                rating = None
-
-            if len(text) > 5:
-                scraped_reviews.append({"rating": rating, "text": text})
-
-        df = pd.DataFrame(scraped_reviews)
-        df.to_csv("raw_reviews.csv", index=False)
-        print("\n📁 Saved raw reviews → raw_reviews.csv")
-
-        return df
+        # Only reviews are needed: with a known ASIN the product page is skipped
+        def click_to_reviews(driver):
+            driver.get(product_link)
+            wait_for(driver, PRODUCT_TITLE, "product page")
+            try:
+                rv = driver.find_element(By.ID, "acrCustomerReviewLink")
+                click_and_wait(driver, rv, REVIEW_BLOCKS, "reviews page")
+            except:
+                print("⚠ Couldn't open reviews page.")
+
+        asin = asin_from_url(product_link)
+        open_reviews(driver, asin, direct=direct, fallback=click_to_reviews)
+        NAV_STATS.print_summary()
+
+        for page in range(1, max_pages + 1):
+            blocks = extract_reviews(driver.page_source, selectors=REVIEW_SELECTORS) or []
+
+            for block in blocks:
+                if len(block.text) > 5:
+                    yield {"asin": asin, "review_id": block.review_id, "rating": block.rating, "text": block.text}
+
+            if page == max_pages:
+                break
+            nxt = driver.find_elements(By.CSS_SELECTOR, "li.a-last a")
+            if not nxt or click_and_wait(driver, nxt[0], REVIEW_BLOCKS, "next reviews page") is None:
+                break
 
     except Exception as e:
         print("❌ ERROR:", e)
@@ -206,31 +199,55 @@ def scrape_amazon(product_query: str):
     finally:
         driver.quit()
 
-import pandas as pd
-from amazon_scraper import scrape_amazon
-from preprocess_sentiment import clean_reviews, apply_sentiment
+
+def scrape_amazon(product_query: str, direct: bool = True):
+    """Whole-DataFrame version of scrape_amazon_stream; also saves raw_reviews.csv."""
+    df = pd.DataFrame(list(scrape_amazon_stream(product_query, direct=direct)), columns=["rating", "text"])
+    df.to_csv("raw_reviews.csv", index=False)
+    print("\n📁 Saved raw reviews → raw_reviews.csv")
+
+    return df
+
+from amazon_scraper import scrape_amazon_stream
+from review_stream import (BATCH_SIZE, CsvSink, SampleSink, batched, clean_stage, map_stage, prefetch, run,
+                           sentiment_stage, tee)
+from review_store import StoreSink
 from visual_dashboard import show_dashboard
 
+# reviews kept in memory for the dashboard charts (uniform sample; counts stay exact on disk)
+DASHBOARD_SAMPLE = 5000
+
+
+def add_sentiment_score(batch):
+    for r in batch:
+        r["sentiment_score"] = r["compound"]
+    return batch
+
+
 print("\n📌 AMAZON REVIEW ANALYSIS PIPELINE\n")
 
 product = input("Enter product name: ")
 
-# Step 1 — Scrape
-df_raw = scrape_amazon(product)
-
-if df_raw is None or df_raw.empty:
-    print("❌ No reviews scraped. Exiting.")
-    exit()
+# Each step is a generator over batches of reviews; nothing holds the full set.
+# Step 1 — Scrape (runs ahead in the background, raw reviews saved as they arrive)
+stream = prefetch(batched(scrape_amazon_stream(product), BATCH_SIZE))
+stream = tee(stream, CsvSink("raw_reviews.csv", fieldnames=["rating", "text"]))
 
 # Step 2 — Clean
-df_clean = clean_reviews(df_raw)
+stream = clean_stage(stream)
 
 # Step 3 — Sentiment Analysis
-df_final = apply_sentiment(df_clean)
+stream = map_stage(add_sentiment_score)(sentiment_stage(stream))
 
-df_final.to_csv("final_processed_reviews.csv", index=False)
-print("\n📁 Saved final data → final_processed_reviews.csv")
+# Step 4 — Store incrementally (CSV + review store) + sample for the dashboard
+sample = SampleSink(DASHBOARD_SAMPLE)
+total = run(stream, [CsvSink("final_processed_reviews.csv"), StoreSink(), sample])
+
+if not total:
+    print("❌ No reviews scraped. Exiting.")
+    exit()
 
-# Step 4 — Dashboard
-show_dashboard(df_final)
+print(f"\n📁 Saved final data → final_processed_reviews.csv ({total} reviews)")
 
+# Step 5 — Dashboard
+show_dashboard(sample.frame())
@@ -0,0 +1,147 @@
+"""
+Search and review-page navigation for the Selenium scrapers.
+
+Direct mode (the default) opens the /s?k= search URL, the same URL the
+requests scraper builds in search_first_product_link, and jumps straight to
+/product-reviews/{asin} once the ASIN is known. Interactive mode is the
+original flow: load the homepage, dismiss popups, type the query with
+human-like delays and press Enter. It is kept as a fallback for sessions
+where Amazon insists on a real search interaction.
+
+    open_search(driver, query, direct=True, typer=human_type, on_home=handle_popups)
+    ...pick product_link...
+    open_reviews(driver, asin_from_url(product_link), direct=True, fallback=click_to_reviews)
+    NAV_STATS.print_summary()   # direct vs interactive timings per step
+"""
+import re
+import threading
+import time
+from collections import defaultdict
+from urllib.parse import quote_plus
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.keys import Keys
+
+from page_waits import wait_for, SEARCH_BOX, SEARCH_RESULTS, REVIEW_BLOCKS
+
+AMAZON_BASE = "https://www.amazon.in"
+
+_ASIN_RE = re.compile(r"/(?:dp|gp/product|product-reviews)/([A-Z0-9]{10})(?:[/?]|$)", re.I)
+_BARE_ASIN_RE = re.compile(r"^B0[A-Z0-9]{8}$", re.I)
+
+
+# ============ URLS ============
+def search_url(query: str, base: str = AMAZON_BASE) -> str:
+    return f"{base}/s?k={quote_plus(query.strip())}"
+
+
+def reviews_url(asin: str, base: str = AMAZON_BASE, sort: str = None) -> str:
+    """sort: Amazon's sortBy value ("recent" = newest first); None keeps the default (top reviews)."""
+    url = f"{base}/product-reviews/{asin}"
+    return f"{url}?sortBy={sort}" if sort else url
+
+
+def asin_from_url(url: str):
+    """ASIN from a /dp/, /gp/product/ or /product-reviews/ link, else None."""
+    m = _ASIN_RE.search(url or "")
+    return m.group(1).upper() if m else None
+
+
+def query_key(query: str) -> str:
+    """
+    Identity of a search for deduplication: "asin:B0DGH5K43K" for a product
+    link or bare ASIN, else "q:" + the query lower-cased with whitespace collapsed.
+    """
+    query = (query or "").strip()
+    asin = asin_from_url(query) or (query.upper() if _BARE_ASIN_RE.match(query) else None)
+    if asin:
+        return f"asin:{asin}"
+    return "q:" + " ".join(query.casefold().split())
+
+
+# ============ TIMING ============
+class NavStats:
+    """Count and total seconds per (step, mode), to compare direct and interactive navigation."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.times = defaultdict(lambda: [0, 0.0])   # (step, mode) -> [count, total s]
+
+    def record(self, step, mode, seconds):
+        with self._lock:
+            totals = self.times[(step, mode)]
+            totals[0] += 1
+            totals[1] += seconds
+
+    def summary(self) -> dict:
+        with self._lock:
+            out = defaultdict(dict)
+            for (step, mode), (count, total) in self.times.items():
+                out[step][mode] = {"count": count, "avg_s": total / count}
+            return dict(out)
+
+    def print_summary(self):
+        print(f"\n🧭 {'step':<10}{'direct':>12}{'interactive':>14}")
+        for step, modes in self.summary().items():
+            cells = [f"{modes[m]['avg_s']:.2f}s x{modes[m]['count']}" if m in modes else "-"
+                     for m in ("direct", "interactive")]
+            line = f"   {step:<10}{cells[0]:>12}{cells[1]:>14}"
+            if len(modes) == 2 and modes["direct"]["avg_s"] > 0:
+                line += f"   {modes['interactive']['avg_s'] / modes['direct']['avg_s']:.1f}x"
+            print(line)
+
+
+NAV_STATS = NavStats()
+
+
+# ============ NAVIGATION ============
+def open_search(driver, query: str, direct: bool = True, typer=None, on_home=None, base: str = AMAZON_BASE):
+    """
+    Land on the search results for query. Returns the results element, or None
+    when the results never rendered. Raises TimeoutException in interactive
+    mode when the homepage search box never shows up.
+
+    typer:   (element, text) callable used in interactive mode (default send_keys)
+    on_home: called with the driver after the homepage loads (popup handling)
+    """
+    mode = "direct" if direct else "interactive"
+    start = time.perf_counter()
+    if direct:
+        driver.get(search_url(query, base))
+    else:
+        driver.get(base + "/")
+        box = wait_for(driver, SEARCH_BOX, "home page", clickable=True)
+        if box is None:
+            raise TimeoutException(f"Amazon search box not found on {base}/ (captcha or layout change?)")
+        if on_home:
+            on_home(driver)
+        box.click()
+        if typer:
+            typer(box, query)
+        else:
+            box.send_keys(query)
+        box.send_keys(Keys.RETURN)
+    results = wait_for(driver, SEARCH_RESULTS, "search results")
+    seconds = time.perf_counter() - start
+    NAV_STATS.record("search", mode, seconds)
+    print(f"🧭 search ({mode}): {seconds:.2f}s")
+    return results
+
+
+def open_reviews(driver, asin, direct: bool = True, fallback=None, base: str = AMAZON_BASE, sort: str = None):
+    """
+    Get to the reviews page: straight to /product-reviews/{asin} when direct
+    and the ASIN is known, otherwise via fallback(driver) (the caller's
+    click-through path). Both are timed for the comparison table.
+    sort: sortBy for the direct URL (see reviews_url)
+    """
+    mode = "direct" if direct and asin else "interactive"
+    start = time.perf_counter()
+    if mode == "direct":
+        driver.get(reviews_url(asin, base, sort))
+        wait_for(driver, REVIEW_BLOCKS, "reviews page")
+    elif fallback is not None:
+        fallback(driver)
+    seconds = time.perf_counter() - start
+    NAV_STATS.record("reviews", mode, seconds)
+    print(f"🧭 reviews ({mode}): {seconds:.2f}s")
@@ -253,13 +253,31 @@ import time
 import random
 import re
 import csv
+import asyncio
 from datetime import datetime
-from typing import Tuple, Dict, List
+from typing import Tuple, Dict, List, Optional
 from urllib.parse import urlparse, parse_qs, unquote
 
 import requests
 from bs4 import BeautifulSoup
-from textblob import TextBlob
+
+import queue
+import threading
+from contextlib import contextmanager
+
+from http_client import get_client
+from response_cache import ResponseCache
+from review_extractor import Selectors, extract_page, extract_reviews
+from sentiment_cache import textblob_polarity
+from review_store import ReviewStore, get_review_store, page_is_known
+from review_parquet import DATASET_DIR, write_reviews
+
+# this scraper's own review selectors (kept as they were before the shared extractor)
+REVIEW_SELECTORS = Selectors(
+    blocks=("div[data-hook='review']", "div.review"),
+    star=("i[data-hook='review-star-rating'] span.a-icon-alt", "span.a-icon-alt"),
+    body=("span[data-hook='review-body'] span", "span.review-text"),
+)
 
 # fast headers
 HEADERS = {
@@ -272,6 +290,36 @@ HEADERS = {
 
 AUDIT_LOG = "audit_log.csv"
 
+BASE_URL = "https://www.amazon.in"
+
+# async mode: review pages requested per window, and the most of them in
+# flight against one host at a time (the rest of a window waits its turn)
+FETCH_WINDOW = 8
+MAX_CONCURRENCY_PER_HOST = 4
+
+# on-disk response cache for search / product / review pages
+USE_RESPONSE_CACHE = True
+CACHE_DIR = ".http_cache"
+CACHE_MAX_MB = 200
+
+_response_cache = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    global _response_cache
+    with _response_cache_lock:
+        if _response_cache is None:
+            _response_cache = ResponseCache(CACHE_DIR, max_bytes=CACHE_MAX_MB * 1024 * 1024)
+    return _response_cache
+
+
+def fetch(url: str):
+    """GET a page over the shared client, through the response cache when enabled."""
+    if USE_RESPONSE_CACHE:
+        return get_response_cache().get(get_client(), url, headers=HEADERS, timeout=15)
+    return get_client().get(url, headers=HEADERS, timeout=15)
+
 
 def log_search(query: str):
     """Append a timestamped audit log row."""
@@ -307,8 +355,8 @@ def extract_real_link(href: str) -> str:
 def search_first_product_link(query: str) -> str:
     """Return the most-likely product link from Amazon search results (or None)."""
     q = query.strip().replace(" ", "+")
-    url = f"https://www.amazon.in/s?k={q}"
-    r = requests.get(url, headers=HEADERS, timeout=15)
+    url = f"{BASE_URL}/s?k={q}"
+    r = fetch(url)
     soup = BeautifulSoup(r.content, "html.parser")
 
     # prefer /dp/ links
@@ -346,88 +394,313 @@ def get_asin_from_url(url: str) -> str:
     return m.group(1) if m else None
 
 
-def scrape_reviews_by_asin(asin: str, max_per_star: int = 5, max_pages: int = 10
-                          ) -> Dict[int, List[dict]]:
+def parse_review_blocks(content) -> List[Tuple[int, str, Optional[str], str]]:
     """
-    Scrape reviews for a product ASIN using requests.
-    Collect up to max_per_star reviews per star rating (5..1).
-    Returns dict: {5: [review dicts], ..., 1: [...]}
+    Parse one review page into (rating, text, review_id, date_text) tuples.
+    Blocks without a rating or with too little text are skipped.
+    Returns None if the page has no review blocks at all.
     """
-    collected = {5: [], 4: [], 3: [], 2: [], 1: []}
-    page = 1
-    user_delay = (0.6, 1.2)
+    blocks = extract_reviews(content, separator=" ", selectors=REVIEW_SELECTORS)
+    if blocks is None:
+        return None
 
-    while page <= max_pages:
-        reviews_url = f"https://www.amazon.in/product-reviews/{asin}/?pageNumber={page}"
-        r = requests.get(reviews_url, headers=HEADERS, timeout=15)
-        if r.status_code != 200:
-            break
-        soup = BeautifulSoup(r.content, "html.parser")
-        blocks = soup.select("div[data-hook='review']")
-        if not blocks:
-            # try alternate selector
-            blocks = soup.select("div.review")
-        if not blocks:
-            break
-
-        for b in blocks:
-            # parse rating
-            rating = None
-            rating_tag = b.select_one("i[data-hook='review-star-rating'] span.a-icon-alt")
-            if not rating_tag:
-                rating_tag = b.select_one("span.a-icon-alt")
-            if rating_tag:
-                m = re.search(r"(\d+)", rating_tag.get_text(strip=True))
-                if m:
-                    rating = int(m.group(1))
-            # parse text
-            body_tag = b.select_one("span[data-hook='review-body'] span")
-            if not body_tag:
-                body_tag = b.select_one("span.review-text")
-            text = body_tag.get_text(" ", strip=True) if body_tag else ""
-            if not text or len(text) < 10 or not rating:
-                continue
+    reviews = []
+    for b in blocks:
+        if not b.text or len(b.text) < 10 or not b.rating:
+            continue
+        reviews.append((b.rating, b.text, b.review_id, b.date_text))
+    return reviews
+
+
+def reviews_page_url(asin: str, page: int, sort: str = None) -> str:
+    """sort="recent" lists newest reviews first (incremental scrapes)."""
+    url = f"{BASE_URL}/product-reviews/{asin}/?pageNumber={page}"
+    return f"{url}&sortBy={sort}" if sort else url
+
+
+def new_reviews(reviews, known: set):
+    """
+    Incremental filter for one parsed page: None once the whole page is
+    already known (stop paging), else the reviews not seen before.
+    """
+    if page_is_known((r[2] for r in reviews), known):
+        return None
+    fresh = [r for r in reviews if r[2] not in known]
+    known.update(r[2] for r in fresh if r[2])
+    return fresh
+
+
+class ScoringPipeline:
+    """
+    Fetch/parse -> bounded queue -> scoring workers.
+
+    The fetch side calls submit() with each parsed page in page order. Per-star
+    slots are reserved right there (cheap), so the early-stop decision never
+    waits for sentiment; only the accepted reviews are queued, and scoring
+    workers attach TextBlob polarity while the next pages are downloading.
+    A full queue blocks submit() (backpressure). close() waits for the queue
+    to drain and returns the same buckets the inline loop used to build.
+    Every submitted review, kept or not, is also listed in `parsed`.
+    """
 
+    def __init__(self, max_per_star: int, workers: int = 1, queue_size: int = 8):
+        self.max_per_star = max_per_star
+        self.room = {s: max_per_star for s in [5, 4, 3, 2, 1]}
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.seconds = {"fetch": 0.0, "parse": 0.0, "queue wait": 0.0, "score": 0.0}
+        self.batches = 0
+        self.parsed = []
+        self._scored = []
+        self._error = None
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+        self._workers = [threading.Thread(target=self._score_loop, daemon=True) for _ in range(max(1, workers))]
+        for t in self._workers:
+            t.start()
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time a producer-side stage (fetch / parse)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[name] += time.perf_counter() - start
+
+    def full(self) -> bool:
+        return all(n <= 0 for n in self.room.values())
+
+    def submit(self, reviews: List[Tuple[int, str, Optional[str], str]]) -> bool:
+        """Reserve slots for a page's reviews and queue them. True once every bucket is full."""
+        self.parsed.extend(reviews)
+        accepted = []
+        for review in reviews:
             # if not already full for this rating, add
-            if len(collected[rating]) < max_per_star:
-                polarity = TextBlob(text).sentiment.polarity
+            if self.room.get(review[0], 0) > 0:
+                self.room[review[0]] -= 1
+                accepted.append(review)
+        if accepted:
+            with self.stage("queue wait"):
+                self.queue.put((self.batches, accepted))
+            self.batches += 1
+        return self.full()
+
+    def _score_loop(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            seq, batch = item
+            start = time.perf_counter()
+            try:
+                polarities = textblob_polarity([text for _, text, _, _ in batch])
+            except Exception as e:
+                # keep draining so submit() never blocks on a dead consumer; close() re-raises
+                self._error = e
+                continue
+            scored = []
+            for (rating, text, review_id, date_text), polarity in zip(batch, polarities):
                 sentiment = "Positive" if polarity > 0.1 else "Negative" if polarity < -0.1 else "Neutral"
-                collected[rating].append({
+                scored.append({
+                    "review_id": review_id,
                     "rating": rating,
                     "text": text,
+                    "date_text": date_text,
                     "sentiment": sentiment,
                     "polarity": polarity
                 })
+            with self._lock:
+                self._scored.append((seq, scored))
+                self.seconds["score"] += time.perf_counter() - start
+
+    def close(self) -> Dict[int, List[dict]]:
+        """Drain the queue, stop the workers and return {5: [...], ..., 1: [...]} in page order."""
+        for _ in self._workers:
+            self.queue.put(None)
+        for t in self._workers:
+            t.join()
+        self.wall_seconds = time.perf_counter() - self._started
+        if self._error is not None:
+            raise self._error
+        collected = {5: [], 4: [], 3: [], 2: [], 1: []}
+        for _, scored in sorted(self._scored, key=lambda item: item[0]):
+            for review in scored:
+                collected[review["rating"]].append(review)
+        return collected
+
+    def report(self) -> dict:
+        """Seconds per stage; busy time above wall time means the stages overlapped."""
+        out = {k: round(v, 3) for k, v in self.seconds.items()}
+        out["wall"] = round(getattr(self, "wall_seconds", time.perf_counter() - self._started), 3)
+        out["batches"] = self.batches
+        return out
+
+    def print_report(self):
+        r = self.report()
+        busy = r["fetch"] + r["parse"] + r["score"]
+        print(f"⏲ Pipeline: fetch {r['fetch']:.2f}s | parse {r['parse']:.2f}s | score {r['score']:.2f}s | "
+              f"queue wait {r['queue wait']:.2f}s | wall {r['wall']:.2f}s "
+              f"(busy/wall {busy / r['wall'] if r['wall'] else 0:.2f}, >1 means stages overlapped)")
+
+
+def store_reviews(store: ReviewStore, asin: str, collected: Dict[int, List[dict]], parsed=()):
+    """
+    Write the collected reviews and their TextBlob sentiment through to the
+    review store. Reviews scraped without an id get the store's stand-in id.
+    parsed: every (rating, text, review_id, date_text) read from the pages, also stored
+    (without sentiment) so an incremental run recognizes pages whose reviews
+    went past the per-star cap.
+    """
+    reviews = [r for star in [5, 4, 3, 2, 1] for r in collected.get(star, [])]
+    ids = store.add_reviews(asin, reviews + [{"rating": rating, "text": text, "review_id": rid, "date_text": day}
+                                             for rating, text, rid, day in parsed])[:len(reviews)]
+    for r, review_id in zip(reviews, ids):
+        r["review_id"] = review_id
+    store.add_sentiment([(i, r["polarity"], r["sentiment"]) for i, r in zip(ids, reviews)], "textblob")
+
+
+def scrape_reviews_by_asin(asin: str, max_per_star: int = 5, max_pages: int = 10,
+                           concurrency: int = 1, score_workers: int = 1,
+                           report: bool = False, store: ReviewStore = None,
+                           incremental: bool = False) -> Dict[int, List[dict]]:
+    """
+    Scrape reviews for a product ASIN using requests.
+    Collect up to max_per_star reviews per star rating (5..1).
+    concurrency > 1 requests that many pages per window, at most
+    MAX_CONCURRENCY_PER_HOST in flight (see scrape_reviews_by_asin_async).
+    Sentiment is attached by score_workers threads of a ScoringPipeline while
+    later pages are fetched; report=True prints the per-stage times.
+    store: ReviewStore to write the reviews + sentiment to (None: return only)
+    incremental: newest reviews first, only reviews not in the store yet, and
+    stop at the first page that is entirely known (uses the shared store when
+    store is None)
+    Returns dict: {5: [review dicts], ..., 1: [...]}
+    """
+    if concurrency > 1:
+        return asyncio.run(scrape_reviews_by_asin_async(
+            asin, max_per_star=max_per_star, max_pages=max_pages, concurrency=concurrency,
+            score_workers=score_workers, report=report, store=store, incremental=incremental))
+
+    known = (store or get_review_store()).known_review_ids(asin) if incremental else None
+    sort = "recent" if incremental else None
+    pipeline = ScoringPipeline(max_per_star, workers=score_workers)
+    page = 1
+    user_delay = (0.6, 1.2)
 
-        # stop early if collected enough for all stars
-        if all(len(collected[s]) >= max_per_star for s in [5,4,3,2,1]):
-            break
+    try:
+        while page <= max_pages:
+            with pipeline.stage("fetch"):
+                r = fetch(reviews_page_url(asin, page, sort))
+            if r.status_code != 200:
+                break
+            with pipeline.stage("parse"):
+                reviews = parse_review_blocks(r.content)
+            if reviews is not None and known is not None:
+                reviews = new_reviews(reviews, known)
+            if reviews is None:
+                break
+
+            # stop early if collected enough for all stars
+            if pipeline.submit(reviews):
+                break
 
-        page += 1
-        time.sleep(random.uniform(*user_delay))
+            page += 1
+            time.sleep(random.uniform(*user_delay))
+    finally:
+        collected = pipeline.close()
 
+    if store is not None:
+        store_reviews(store, asin, collected, pipeline.parsed)
+    if report:
+        pipeline.print_report()
+    return collected
+
+
+async def scrape_reviews_by_asin_async(asin: str, max_per_star: int = 5, max_pages: int = 10,
+                                       concurrency: int = FETCH_WINDOW,
+                                       score_workers: int = 1, report: bool = False,
+                                       store: ReviewStore = None,
+                                       incremental: bool = False) -> Dict[int, List[dict]]:
+    """
+    Async variant of scrape_reviews_by_asin.
+    Requests review pages in windows of `concurrency` pages, with at most
+    MAX_CONCURRENCY_PER_HOST of them in flight against one host, then processes each window in page order so the result is the same as the
+    sequential scrape. Stops after the window in which every star bucket fills up,
+    a page fails, a page has no reviews or (incremental) a page is entirely known.
+    """
+    known = (store or get_review_store()).known_review_ids(asin) if incremental else None
+    sort = "recent" if incremental else None
+    pipeline = ScoringPipeline(max_per_star, workers=score_workers)
+    user_delay = (0.6, 1.2)
+    host_limits: Dict[str, asyncio.Semaphore] = {}
+
+    async def fetch_page(page: int):
+        url = reviews_page_url(asin, page, sort)
+        host = urlparse(url).netloc
+        limit = host_limits.setdefault(host, asyncio.Semaphore(MAX_CONCURRENCY_PER_HOST))
+        async with limit:
+            try:
+                return await asyncio.to_thread(fetch, url)
+            except requests.RequestException:
+                return None
+
+    page = 1
+    try:
+        while page <= max_pages:
+            window = range(page, min(page + concurrency, max_pages + 1))
+            with pipeline.stage("fetch"):
+                responses = await asyncio.gather(*(fetch_page(p) for p in window))
+
+            done = False
+            for r in responses:
+                if r is None or r.status_code != 200:
+                    done = True
+                    break
+                with pipeline.stage("parse"):
+                    reviews = parse_review_blocks(r.content)
+                if reviews is not None and known is not None:
+                    reviews = new_reviews(reviews, known)
+                # submit() may block on a full queue; keep the event loop free meanwhile
+                if reviews is None or await asyncio.to_thread(pipeline.submit, reviews):
+                    done = True
+                    break
+            if done:
+                break
+
+            page += len(window)
+            await asyncio.sleep(random.uniform(*user_delay))
+    finally:
+        collected = await asyncio.to_thread(pipeline.close)
+
+    if store is not None:
+        await asyncio.to_thread(store_reviews, store, asin, collected, pipeline.parsed)
+    if report:
+        pipeline.print_report()
     return collected
 
 
 def get_product_title_from_asin(asin: str) -> str:
-    url = f"https://www.amazon.in/dp/{asin}"
-    r = requests.get(url, headers=HEADERS, timeout=15)
+    url = f"{BASE_URL}/dp/{asin}"
+    r = fetch(url)
     if r.status_code != 200:
         return None
-    soup = BeautifulSoup(r.content, "html.parser")
-    t = soup.select_one("#productTitle")
-    return t.get_text(strip=True) if t else None
+    return extract_page(r.content).product_title
 
 
 def scrape_product_reviews(query: str,
                            max_per_star: int = 5,
-                           max_pages: int = 10) -> Tuple[dict, str]:
+                           max_pages: int = 10,
+                           concurrency: int = 1,
+                           incremental: bool = False,
+                           export_csv: bool = True) -> Tuple[dict, str]:
     """
     Top-level function:
     - log audit
     - find product link -> asin
-    - collect reviews (max_per_star per rating)
+    - collect reviews (max_per_star per rating; incremental: only reviews new since the last run)
+    - append reviews not stored before to the Parquet dataset (DATASET_DIR, by ASIN / month)
     - return dict with title, asin, reviews_by_star
+    export_csv: also write <query>_reviews.csv
     """
     log_search(query)
     link = search_first_product_link(query)
@@ -437,7 +710,7 @@ def scrape_product_reviews(query: str,
     asin = get_asin_from_url(link)
     if not asin:
         # try parse from query page by visiting link (requests)
-        r = requests.get(link, headers=HEADERS, timeout=15)
+        r = fetch(link)
         soup = BeautifulSoup(r.content, "html.parser")
         # try to find canonical /dp/ link or data-asin
         can = soup.select_one("link[rel='canonical']")
@@ -447,10 +720,13 @@ def scrape_product_reviews(query: str,
         return {"error": "Could not determine ASIN from product link"}, link
 
     title = get_product_title_from_asin(asin) or query
-    reviews_by_star = scrape_reviews_by_asin(asin, max_per_star=max_per_star, max_pages=max_pages)
+    store = get_review_store()
+    store.upsert_product(asin, title=title, url=link)
+    known = store.known_review_ids(asin)
+    reviews_by_star = scrape_reviews_by_asin(asin, max_per_star=max_per_star, max_pages=max_pages,
+                                             concurrency=concurrency, report=True, store=store,
+                                             incremental=incremental)
 
-    # save CSV for convenience
-    filename = f"{re.sub(r'\\s+', '_', query.strip())}_reviews.csv"
     rows = []
     for star in [5,4,3,2,1]:
         for r in reviews_by_star.get(star, []):
@@ -459,14 +735,25 @@ def scrape_product_reviews(query: str,
                 "rating": r["rating"],
                 "text": r["text"],
                 "sentiment": r["sentiment"],
-                "polarity": r["polarity"]
+                "polarity": r["polarity"],
+                "review_id": r["review_id"],
+                "date_text": r["date_text"]
             })
-    if rows:
+
+    # columnar copy: only reviews this run added, so the dataset never holds duplicates
+    write_reviews([row for row in rows if row["review_id"] not in known], asin=asin)
+
+    # save CSV for convenience
+    safe_query = re.sub(r"\s+", "_", query.strip())
+    filename = f"{safe_query}_reviews.csv" if export_csv else None
+    if rows and filename:
         with open(filename, "w", newline="", encoding="utf-8") as f:
             fieldnames = ["star", "rating", "text", "sentiment", "polarity"]
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore")
             writer.writeheader()
             for row in rows:
                 writer.writerow(row)
 
-    return {"title": title, "asin": asin, "reviews": reviews_by_star, "csv": filename}, link
+    return {"title": title, "asin": asin, "reviews": reviews_by_star, "csv": filename, "parquet": DATASET_DIR,
+            "http_stats": get_client().stats.summary(),
+            "cache_stats": get_response_cache().stats() if USE_RESPONSE_CACHE else None}, link
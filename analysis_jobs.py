@@ -0,0 +1,213 @@
+"""
+Background analysis jobs for the Flask API.
+
+A scrape holds a browser for 20+ seconds, so the API hands it to a bounded
+executor and answers at once with a job id. Clients then poll the job or
+follow its Server-Sent Events stream:
+
+    JOBS = JobManager(workers=2)
+
+    job = JOBS.submit(run_analysis, product_query)     # run_analysis(query, progress=...)
+    JOBS.get(job.id).snapshot()                       # {"status", "progress", "result", ...}
+    for event in JOBS.events(job.id): ...             # "data: {...}\\n\\n" lines for SSE
+
+The job function receives a `progress(stage, **info)` callback (pages
+scraped, reviews found, ...); every call becomes an event. Finished jobs are
+kept for JOB_TTL seconds (at most MAX_JOBS), then dropped.
+
+Single flight: submit(..., key=...) with the key of a job that is still
+queued or running returns that job instead of starting another, so a burst
+of requests for one product costs one scrape and every caller gets the same
+result. stats() counts the requests coalesced this way.
+
+Request threads only append to a queue and read job state, so the web tier
+stays responsive however many analyses are waiting. `workers` should match
+the browser pool size; extra jobs wait in the queue with their position
+reported.
+"""
+import json
+import threading
+import time
+import traceback
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+JOB_TTL = 3600
+MAX_JOBS = 1000
+SSE_HEARTBEAT = 15     # seconds between keep-alive comments on an idle stream
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+
+class Job:
+    def __init__(self, name: str):
+        self.id = uuid.uuid4().hex
+        self.name = name
+        self.status = QUEUED
+        self.progress = {}
+        self.result = None
+        self.error = None
+        self.key = None
+        self.requests = 1             # callers sharing this job (1 + coalesced)
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.events = []             # every event so far; SSE clients replay from an index
+        self._cond = threading.Condition()
+
+    def _emit(self, event: str, **data):
+        with self._cond:
+            self.events.append({"event": event, "job": self.id, "status": self.status, **data})
+            self._cond.notify_all()
+
+    @property
+    def is_finished(self):
+        return self.status in (DONE, FAILED)
+
+    def snapshot(self, queue_position: int = None) -> dict:
+        with self._cond:
+            out = {
+                "jobId": self.id,
+                "query": self.name,
+                "status": self.status,
+                "progress": dict(self.progress),
+                "sharedBy": self.requests,
+                "createdAt": self.created,
+                "elapsed": round((self.finished or time.time()) - (self.started or self.created), 2),
+            }
+            if queue_position is not None and self.status == QUEUED:
+                out["queuePosition"] = queue_position
+            if self.status == DONE:
+                out["result"] = self.result
+            if self.status == FAILED:
+                out["error"] = self.error
+            return out
+
+    def wait_events(self, after: int, timeout: float) -> list:
+        """Events after index `after`, waiting up to timeout for new ones."""
+        with self._cond:
+            if len(self.events) <= after and not self.is_finished:
+                self._cond.wait(timeout)
+            return self.events[after:]
+
+
+class JobManager:
+    def __init__(self, workers: int = 2, ttl: float = JOB_TTL, max_jobs: int = MAX_JOBS):
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="analysis")
+        self._jobs = OrderedDict()   # id -> Job, oldest first
+        self._queue = []             # ids of queued jobs, in submission order
+        self._inflight = {}          # key -> unfinished Job
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.coalesced = 0
+        self.ttl = ttl
+        self.max_jobs = max_jobs
+
+    def submit(self, fn, name: str, *args, key: str = None, **kwargs) -> Job:
+        """
+        Run fn(name, *args, progress=callback, **kwargs) in the background, or
+        join the unfinished job already submitted with the same key.
+        """
+        with self._lock:
+            self.submitted += 1
+            running = self._inflight.get(key) if key is not None else None
+            if running is not None:
+                self.coalesced += 1
+                running.requests += 1
+                return running
+            job = Job(name)
+            job.key = key
+            self._expire()
+            self._jobs[job.id] = job
+            self._queue.append(job.id)
+            if key is not None:
+                self._inflight[key] = job
+        job._emit("queued")
+        self._pool.submit(self._run, job, fn, args, kwargs)
+        return job
+
+    def completed(self, name: str, result) -> dict:
+        """
+        Snapshot of a job that is already done (e.g. a cache hit), so clients see
+        one response shape. The job is not registered: it already carries its
+        result, and cache hits never push real jobs out of the MAX_JOBS budget.
+        """
+        job = Job(name)
+        job.status, job.result = DONE, result
+        job.started = job.finished = job.created
+        return job.snapshot()
+
+    def _run(self, job: Job, fn, args, kwargs):
+        with self._lock:
+            self._queue.remove(job.id)
+        job.status, job.started = RUNNING, time.time()
+        job._emit("started")
+
+        def progress(stage: str, **info):
+            with job._cond:
+                job.progress.update(info, stage=stage)
+            job._emit("progress", stage=stage, **info)
+
+        try:
+            result = fn(job.name, *args, progress=progress, **kwargs)
+        except Exception as e:
+            traceback.print_exc()
+            with self._lock:
+                self._inflight.pop(job.key, None)
+                job.status, job.error, job.finished = FAILED, str(e), time.time()
+            job._emit("failed", error=job.error)
+        else:
+            # leave the in-flight table in the same step as finishing, so a
+            # request arriving now either joins this job or finds the cached result
+            with self._lock:
+                self._inflight.pop(job.key, None)
+                job.status, job.result, job.finished = DONE, result, time.time()
+            job._emit("done", result=result)
+
+    def _expire(self):
+        now = time.time()
+        for job_id in [j.id for j in self._jobs.values()
+                       if j.is_finished and now - j.finished > self.ttl]:
+            del self._jobs[job_id]
+        while len(self._jobs) > self.max_jobs:
+            oldest = next((j for j in self._jobs.values() if j.is_finished), None)
+            if oldest is None:
+                break
+            del self._jobs[oldest.id]
+
+    def get(self, job_id: str):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def status(self, job_id: str):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            position = self._queue.index(job_id) + 1 if job_id in self._queue else None
+        return job.snapshot(position) if job else None
+
+    def events(self, job_id: str, heartbeat: float = SSE_HEARTBEAT):
+        """Server-Sent Events for one job: every event so far, then live ones until it finishes."""
+        job = self.get(job_id)
+        if job is None:
+            return
+        sent = 0
+        while True:
+            new = job.wait_events(sent, heartbeat)
+            if not new:
+                yield ": keep-alive\n\n"
+                continue
+            for event in new:
+                yield f"event: {event['event']}\ndata: {json.dumps(event, default=str)}\n\n"
+            sent += len(new)
+            if new[-1]["event"] in (DONE, FAILED):
+                return
+
+    def stats(self) -> dict:
+        with self._lock:
+            counts = {}
+            for job in self._jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+            return {"jobs": len(self._jobs), "queued": len(self._queue), **counts,
+                    "submitted": self.submitted, "coalesced": self.coalesced,
+                    "coalesced_pct": round(100 * self.coalesced / self.submitted, 1) if self.submitted else 0.0}
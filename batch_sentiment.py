@@ -0,0 +1,119 @@
+"""
+Batched VADER sentiment scoring.
+
+score_texts() takes any iterable of texts (list, pandas Series, generator)
+and returns the four VADER columns as NumPy arrays in input order:
+
+    scores = score_texts(df["text"])
+    df["compound"] = scores["compound"]
+    df["sentiment"] = sentiment_labels(scores["compound"])
+
+Small batches are scored in-process. Large ones are split into chunks and
+sharded across a persistent process pool, where each worker builds the VADER
+analyzer (lexicon + emoji table) once at start-up and reuses it for every
+chunk. Worker processes re-import the calling script on Windows/macOS
+(spawn), so scripts that score large batches need an
+`if __name__ == "__main__":` guard.
+"""
+import atexit
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+
+COLUMNS = ("neg", "neu", "pos", "compound")
+
+# below this many texts the pool start-up costs more than it saves
+MIN_PARALLEL = 5000
+CHUNK_SIZE = 2000
+
+POSITIVE_THRESHOLD = 0.05
+NEGATIVE_THRESHOLD = -0.05
+
+
+# ============ WORKER ============
+_analyzer = None
+
+
+def _get_analyzer():
+    global _analyzer
+    if _analyzer is None:
+        _analyzer = SentimentIntensityAnalyzer()
+    return _analyzer
+
+
+def _score_chunk(texts) -> np.ndarray:
+    """(len(texts), 4) array of neg/neu/pos/compound."""
+    analyzer = _get_analyzer()
+    out = np.empty((len(texts), len(COLUMNS)), dtype=np.float64)
+    for i, text in enumerate(texts):
+        s = analyzer.polarity_scores(text)
+        out[i] = (s["neg"], s["neu"], s["pos"], s["compound"])
+    return out
+
+
+# ============ POOL ============
+_pool = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown()
+            _pool = ProcessPoolExecutor(max_workers=workers, initializer=_get_analyzer)
+            _pool_workers = workers
+        return _pool
+
+
+def shutdown():
+    """Stop the worker processes (they are otherwise kept for the next batch)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
+
+
+atexit.register(shutdown)
+
+
+# ============ PUBLIC API ============
+def _clean(text) -> str:
+    if text is None or (isinstance(text, float) and text != text):  # None / NaN
+        return ""
+    return text if isinstance(text, str) else str(text)
+
+
+def score_texts(texts, workers: int = None, chunk_size: int = CHUNK_SIZE,
+                min_parallel: int = MIN_PARALLEL) -> dict:
+    """
+    VADER scores for every text, as {"neg", "neu", "pos", "compound"} -> float64 array.
+
+    workers: processes to use (default: CPU count); 1 forces in-process scoring
+    """
+    texts = [_clean(t) for t in texts]
+    workers = workers or os.cpu_count() or 1
+
+    if not texts:
+        matrix = np.empty((0, len(COLUMNS)), dtype=np.float64)
+    elif workers == 1 or len(texts) < min_parallel:
+        matrix = _score_chunk(texts)
+    else:
+        chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+        matrix = np.concatenate(list(_get_pool(workers).map(_score_chunk, chunks)))
+
+    return {col: np.ascontiguousarray(matrix[:, i]) for i, col in enumerate(COLUMNS)}
+
+
+def sentiment_labels(compound, labels=("negative", "neutral", "positive")) -> np.ndarray:
+    """Bucket compound scores with the usual VADER +/-0.05 thresholds."""
+    compound = np.asarray(compound, dtype=np.float64)
+    negative, neutral, positive = labels
+    return np.where(compound >= POSITIVE_THRESHOLD, positive,
+                    np.where(compound <= NEGATIVE_THRESHOLD, negative, neutral)).astype(object)
@@ -0,0 +1,102 @@
+"""
+CSV vs Parquet reload times for a dashboard-style read.
+
+Writes the same synthetic scored reviews (fixture vocabulary, deterministic)
+as a CSV file and as a review_parquet dataset, then times what a dashboard
+does on every refresh: load rating + sentiment (+ compound) for one product.
+The CSV has to be parsed in full, with dtypes inferred again each time; the
+Parquet read opens one product's partitions and decodes only the requested
+columns. The default 50 products x ~30 months write well over pyarrow's
+default limit of 1024 partitions in one call; every row must read back.
+
+    python benchmarks/columnar_benchmark.py
+    python benchmarks/columnar_benchmark.py --reviews 500000 --products 20
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+import pandas as pd
+
+from parse_benchmark import ROOT  # noqa: F401  (puts the repo root on sys.path)
+from sentiment_benchmark import make_texts
+from review_parquet import read_reviews, write_reviews
+
+COLUMNS = ["rating", "sentiment", "compound"]
+
+
+def make_reviews(n, products, seed=7):
+    rng = random.Random(seed)
+    texts = make_texts(min(n, 20000), seed)
+    start = date(2022, 1, 1)
+    out = []
+    for i in range(n):
+        compound = rng.uniform(-1, 1)
+        out.append({
+            "asin": f"B0{rng.randrange(products):08d}",
+            "review_id": f"R{i:012X}",
+            "rating": rng.randint(1, 5),
+            "text": texts[i % len(texts)],
+            "date": start + timedelta(days=rng.randrange(900)),
+            "compound": compound,
+            "sentiment": "positive" if compound >= 0.05 else "negative" if compound <= -0.05 else "neutral",
+        })
+    return out
+
+
+def dir_size(path):
+    return sum(os.path.getsize(os.path.join(d, f)) for d, _, files in os.walk(path) for f in files)
+
+
+def best_of(fn, repeat=3):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = fn()
+        times.append(time.perf_counter() - start)
+    return min(times), out
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CSV vs Parquet dashboard reload")
+    parser.add_argument("--reviews", type=int, default=200000, help="Synthetic reviews (default 200000)")
+    parser.add_argument("--products", type=int, default=50, help="Distinct ASINs (default 50)")
+    args = parser.parse_args()
+
+    reviews = make_reviews(args.reviews, args.products)
+    asin = reviews[0]["asin"]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "reviews.csv")
+        parquet_root = os.path.join(tmp, "reviews_parquet")
+        pd.DataFrame(reviews).to_csv(csv_path, index=False)
+        write_reviews(reviews, root=parquet_root)
+        partitions = sum(len(dirs) for d, dirs, _ in os.walk(parquet_root) if os.path.basename(d).startswith("asin="))
+        if len(read_reviews(parquet_root, columns=["rating"])) != len(reviews):
+            print("❌ Parquet dataset does not hold every written review")
+            sys.exit(1)
+
+        def from_csv():
+            df = pd.read_csv(csv_path)
+            return df.loc[df["asin"] == asin, COLUMNS]
+
+        csv_s, csv_df = best_of(from_csv)
+        pq_s, pq_df = best_of(lambda: read_reviews(parquet_root, columns=COLUMNS, asin=asin))
+
+        print(f"\n{args.reviews} reviews, {args.products} products in {partitions} partitions; "
+              f"reading {COLUMNS} for one product")
+        print(f"{'format':<10}{'on disk':>10}{'reload':>10}{'rows':>9}   dtypes")
+        print("-" * 72)
+        print(f"{'csv':<10}{os.path.getsize(csv_path) / 1e6:>8.1f}MB{csv_s:>9.3f}s{len(csv_df):>9}   "
+              f"{', '.join(str(t) for t in csv_df.dtypes)}")
+        print(f"{'parquet':<10}{dir_size(parquet_root) / 1e6:>8.1f}MB{pq_s:>9.3f}s{len(pq_df):>9}   "
+              f"{', '.join(str(t) for t in pq_df.dtypes)}")
+        print(f"⚡ {csv_s / pq_s:.1f}x faster reload")
+
+
+if __name__ == "__main__":
+    main()
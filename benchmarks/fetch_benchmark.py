@@ -0,0 +1,145 @@
+"""
+Sequential vs concurrent review-page fetching against a local stand-in server.
+
+Serves the fixture review pages from a threaded HTTP server on localhost with
+an artificial per-request latency, points the CHELLSHIBA scraper at it and runs
+scrape_reviews_by_asin both ways. Checks that both modes collect the same
+reviews, that the per-host concurrency cap is respected while each window asks
+for more pages than the cap allows, and reports the wall-clock speedup. Each run prints the scoring pipeline's per-stage times.
+
+    python benchmarks/fetch_benchmark.py
+    python benchmarks/fetch_benchmark.py --latency 0.5 --pages 10 --window 8 --cap 4
+"""
+import argparse
+import os
+import re
+import sys
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from parse_benchmark import FIXTURE_DIR, load_script
+from http_client import get_client
+
+REVIEW_FIXTURES = [
+    "reviews_histogram_bars.html",
+    "reviews_histogram_table.html",
+    "reviews_histogram_compact.html",
+]
+
+
+# ============ STAND-IN SERVER ============
+class StandInAmazon(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, latency, last_page):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.latency = latency
+        self.last_page = last_page
+        self.pages = [open(os.path.join(FIXTURE_DIR, f), "rb").read() for f in REVIEW_FIXTURES]
+        self.empty = open(os.path.join(FIXTURE_DIR, "reviews_empty.html"), "rb").read()
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.requests = 0
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # HTTP/1.1 so the pooled client can keep connections alive
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        srv = self.server
+        with srv.lock:
+            srv.in_flight += 1
+            srv.requests += 1
+            srv.max_in_flight = max(srv.max_in_flight, srv.in_flight)
+        try:
+            time.sleep(srv.latency)
+            m = re.search(r"pageNumber=(\d+)", self.path)
+            page = int(m.group(1)) if m else 1
+            body = srv.pages[(page - 1) % len(srv.pages)] if page <= srv.last_page else srv.empty
+            etag = f'"{zlib.crc32(body):08x}"'
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            with srv.lock:
+                srv.in_flight -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+# ============ RUN ============
+def timed_scrape(scraper, server, **kwargs):
+    server.requests = 0
+    server.max_in_flight = 0
+    start = time.perf_counter()
+    result = scraper.scrape_reviews_by_asin("B0TESTASIN", report=True, **kwargs)
+    return result, time.perf_counter() - start, server.requests, server.max_in_flight
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sequential vs async review fetching on a local server")
+    parser.add_argument("--latency", type=float, default=0.4, help="Server latency per page in seconds")
+    parser.add_argument("--pages", type=int, default=10, help="max_pages for the scrape (default 10)")
+    parser.add_argument("--window", type=int, default=8, help="Pages requested per window in async mode")
+    parser.add_argument("--cap", type=int, default=4, help="MAX_CONCURRENCY_PER_HOST for the async run")
+    parser.add_argument("--max-per-star", type=int, default=50,
+                        help="High enough that every page is needed (default 50)")
+    args = parser.parse_args()
+
+    server = StandInAmazon(args.latency, last_page=args.pages)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    scraper = load_script("amazon_scraper_local-CHELLSHIBA.py", "amazon_scraper_local")
+    scraper.BASE_URL = server.base_url
+    # every run must hit the server, not the on-disk page cache
+    scraper.USE_RESPONSE_CACHE = False
+    scraper.MAX_CONCURRENCY_PER_HOST = args.cap
+
+    try:
+        seq, seq_t, seq_n, seq_peak = timed_scrape(
+            scraper, server, max_per_star=args.max_per_star, max_pages=args.pages)
+        conc, conc_t, conc_n, conc_peak = timed_scrape(
+            scraper, server, max_per_star=args.max_per_star, max_pages=args.pages,
+            concurrency=args.window)
+    finally:
+        server.shutdown()
+
+    print(f"\n{'mode':<14}{'seconds':>9}{'requests':>10}{'peak in-flight':>16}")
+    print("-" * 49)
+    print(f"{'sequential':<14}{seq_t:>9.2f}{seq_n:>10}{seq_peak:>16}")
+    print(f"{f'async {args.window}/{args.cap}':<14}{conc_t:>9.2f}{conc_n:>10}{conc_peak:>16}")
+    print(f"\n⚡ {seq_t / conc_t:.1f}x faster")
+    get_client().stats.print_summary()
+
+    ok = True
+    if seq != conc:
+        print("❌ Async mode collected different reviews than sequential mode")
+        ok = False
+    if conc_peak > args.cap:
+        print(f"❌ Concurrency cap exceeded: {conc_peak} > {args.cap}")
+        ok = False
+    if not ok:
+        sys.exit(1)
+    print("✔ Same reviews collected, concurrency cap respected")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+"""
+Regenerate the offline HTML fixture corpus in benchmarks/fixtures/.
+
+The pages mirror the Amazon.in markup our parsers target (search results,
+product page and every review-page layout handled by the scrapers) and are
+padded with navigation / script noise so they weigh roughly what a saved
+live page does. Output is deterministic, so re-running only changes the
+files when this script changes.
+
+    python benchmarks/make_fixtures.py
+"""
+import os
+import random
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+WORDS = (
+    "battery sound quality bass earbuds charging case fit comfortable price value "
+    "delivery packaging product good great excellent poor bad worst average noise "
+    "connection bluetooth call mic volume design build premium cheap money worth "
+    "month days usage broke stopped working return replacement seller amazing love"
+).split()
+
+PCTS = {5: 58, 4: 21, 3: 9, 2: 4, 1: 8}
+
+
+# ============ NOISE ============
+def noise(rng, blocks):
+    """Nav bars, inline scripts and widget divs that real pages carry around the data."""
+    out = []
+    for i in range(blocks):
+        out.append(
+            f'<div class="a-section a-spacing-none nav-widget-{i}" data-csa-c-id="w{rng.randrange(10**8)}">'
+            f'<ul class="a-unordered-list a-nostyle a-horizontal">'
+            + "".join(
+                f'<li><a class="a-link-normal nav-a" href="/gp/browse/{rng.randrange(10**6)}">'
+                f"<span>{rng.choice(WORDS).title()}</span></a></li>"
+                for _ in range(8)
+            )
+            + "</ul></div>"
+        )
+        out.append(
+            "<script type=\"text/javascript\">P.when('A').execute(function(A){"
+            f"var w{i}={{'k':'{rng.randrange(10**12):x}','v':[{','.join(str(rng.randrange(999)) for _ in range(30))}]}};"
+            "});</script>"
+        )
+    return "\n".join(out)
+
+
+def sentence(rng, n):
+    return " ".join(rng.choice(WORDS) for _ in range(n)).capitalize() + "."
+
+
+def page(title, body, rng, noise_blocks=60):
+    return (
+        "<!doctype html><html lang=\"en-in\"><head><meta charset=\"utf-8\">"
+        f"<title>{title}</title>"
+        '<link rel="stylesheet" href="https://m.media-amazon.com/images/I/21lRUPVRZ9L.css">'
+        "</head><body>"
+        f'<header id="navbar">{noise(rng, noise_blocks // 2)}</header>'
+        f'<div id="a-page">{body}</div>'
+        f'<footer id="navFooter">{noise(rng, noise_blocks // 2)}</footer>'
+        "</body></html>"
+    )
+
+
+# ============ REVIEW BLOCKS ============
+def review_block(rng, idx, rating, alt_layout=False):
+    rid = f"R{rng.randrange(16**12):012X}"[:14]
+    body = "<br>".join(sentence(rng, rng.randint(8, 30)) for _ in range(rng.randint(1, 4)))
+    title = sentence(rng, rng.randint(2, 6))
+    day = rng.randint(1, 28)
+    month = rng.choice(["January", "March", "June", "August", "October", "December"])
+    year = rng.choice([2023, 2024, 2025])
+
+    if alt_layout:
+        # older / regional markup: no data-hook on the block or body
+        return (
+            f'<div id="{rid}" class="a-section review aok-relative">'
+            f'<div class="a-row"><i data-hook="cmps-review-star-rating" class="a-icon a-icon-star a-star-{rating}">'
+            f'<span class="a-icon-alt">{rating}.0 out of 5 stars</span></i>'
+            f'<span class="a-text-bold review-title"><span>{title}</span></span></div>'
+            f'<span class="a-size-base a-color-secondary review-date">Reviewed in India on {day} {month} {year}</span>'
+            f'<div class="a-row review-data"><span class="a-size-base review-text"><span>{body}</span></span></div>'
+            "</div>"
+        )
+
+    return (
+        f'<div id="{rid}" data-hook="review" class="a-section review aok-relative">'
+        f'<div id="customer_review-{rid}" class="a-section celwidget">'
+        f'<div data-hook="genome-widget" class="a-profile"><span class="a-profile-name">Customer {idx}</span></div>'
+        '<div class="a-row">'
+        f'<a class="a-link-normal" title="{rating}.0 out of 5 stars" href="/gp/customer-reviews/{rid}">'
+        f'<i data-hook="review-star-rating" class="a-icon a-icon-star a-star-{rating} review-rating">'
+        f'<span class="a-icon-alt">{rating}.0 out of 5 stars</span></i></a>'
+        f'<a data-hook="review-title" class="a-size-base a-link-normal review-title a-text-bold" href="/gp/customer-reviews/{rid}">'
+        f"<span>{title}</span></a></div>"
+        f'<span data-hook="review-date" class="a-size-base a-color-secondary review-date">Reviewed in India on {day} {month} {year}</span>'
+        '<div class="a-row a-spacing-mini review-data review-format-strip">'
+        '<span data-hook="format-strip" class="a-color-secondary">Colour: Black</span></div>'
+        '<div class="a-row a-spacing-small review-data">'
+        f'<span data-hook="review-body" class="a-size-base review-text review-text-content"><span>{body}</span></span></div>'
+        f'<div class="a-row"><span data-hook="helpful-vote-statement">{rng.randint(1, 90)} people found this helpful</span></div>'
+        "</div></div>"
+    )
+
+
+def review_list(rng, count, alt_layout=False):
+    ratings = [5, 4, 3, 2, 1]
+    return (
+        '<div id="cm_cr-review_list" class="a-section a-spacing-none review-views celwidget">'
+        + "".join(review_block(rng, i, ratings[i % 5], alt_layout) for i in range(count))
+        + "</div>"
+        '<div id="cm_cr-pagination_bar"><ul class="a-pagination">'
+        '<li class="a-disabled">Previous page</li>'
+        '<li class="a-last"><a href="/product-reviews/B0TESTASIN/?pageNumber=2">Next page</a></li></ul></div>'
+    )
+
+
+# ============ HISTOGRAM LAYOUTS ============
+def histogram_bars():
+    return "".join(
+        f'<li><a class="a-link-normal" href="/product-reviews/B0TESTASIN/?filterByStar={s}_star">'
+        f'<div data-hook="histogram-bar" class="a-row a-spacing-small">'
+        f'<span class="a-size-base">{s} star</span>'
+        f'<div class="a-meter"><div class="a-meter-bar" style="width: {p}%;"></div></div>'
+        f'<span class="a-size-base a-text-right">{p}%</span></div></a></li>'
+        for s, p in PCTS.items()
+    )
+
+
+def histogram_table():
+    rows = "".join(
+        '<tr class="a-histogram-row a-align-center">'
+        f'<td class="aok-nowrap"><span class="a-size-base"><a class="a-link-normal" href="/product-reviews/B0TESTASIN/?filterByStar={s}_star">{s} star</a></span></td>'
+        f'<td class="a-span10"><div class="a-meter"><div class="a-meter-bar" style="width: {p}%;"></div></div></td>'
+        f'<td class="a-text-right a-nowrap"><span class="a-size-base">{p}%</span></td></tr>'
+        for s, p in PCTS.items()
+    )
+    return f'<table id="histogramTable" class="a-normal a-align-middle a-spacing-base">{rows}</table>'
+
+
+def histogram_compact():
+    return "".join(
+        f'<div class="a-row"><span data-hook="histogram-bar-label">{s} star</span>'
+        f'<span data-hook="histogram-bar-percentage">{p}%</span></div>'
+        for s, p in PCTS.items()
+    )
+
+
+def rating_summary():
+    return (
+        '<span data-hook="rating-out-of-text" class="a-size-medium a-color-base">4.2 out of 5</span>'
+        '<span id="acrCustomerReviewText" class="a-size-base">12,842 ratings</span>'
+    )
+
+
+# ============ PAGES ============
+def build_reviews_page(name, histogram, seed, count=10, alt_layout=False):
+    rng = random.Random(seed)
+    body = (
+        '<div id="cm_cr-product_info">'
+        '<a data-hook="product-link" class="a-link-normal" href="/dp/B0TESTASIN">boAt Airdopes 141 TWS Earbuds</a>'
+        f"{rating_summary()}{histogram}</div>"
+        + review_list(rng, count, alt_layout)
+    )
+    return name, page("Amazon.in:Customer reviews: boAt Airdopes 141", body, rng)
+
+
+def build_product_page(seed):
+    rng = random.Random(seed)
+    body = (
+        '<div id="centerCol"><h1 id="title"><span id="productTitle" class="a-size-large product-title-word-break">'
+        "        boAt Airdopes 141 Bluetooth TWS Earbuds with 42H Playtime        </span></h1>"
+        '<div id="averageCustomerReviews"><span id="acrPopover" title="4.2 out of 5 stars">'
+        '<span class="a-icon-alt">4.2 out of 5 stars</span></span>'
+        '<a id="acrCustomerReviewLink" href="#customerReviews"><span id="acrCustomerReviewText">12,842 ratings</span></a></div>'
+        '<span class="a-price"><span class="a-offscreen">₹1,099</span><span class="a-price-whole">1,099</span></span></div>'
+        '<div id="customerReviews">'
+        '<span data-hook="rating-out-of-text" class="a-size-medium a-color-base">4.2 out of 5</span>'
+        f"{histogram_table()}"
+        + "".join(review_block(rng, i, [5, 4, 3, 2, 1][i % 5]) for i in range(8))
+        + "</div>"
+    )
+    return "product_page.html", page("boAt Airdopes 141 : Amazon.in: Electronics", body, rng, noise_blocks=120)
+
+
+def build_search_page(seed):
+    rng = random.Random(seed)
+    results = []
+    for i in range(24):
+        asin = f"B0{rng.randrange(36**8):08X}"[:10]
+        href = (
+            f"/sspa/click?ie=UTF8&spc=MToxMjM&url=%2FboAt-Airdopes-{i}%2Fdp%2F{asin}%2Fref%3Dsr_1_{i}_sspa"
+            if i % 6 == 0 else f"/boAt-Airdopes-{i}/dp/{asin}/ref=sr_1_{i}?keywords=boat+airdopes"
+        )
+        results.append(
+            f'<div data-asin="{asin}" data-component-type="s-search-result" class="s-result-item s-asin">'
+            f'<a class="a-link-normal s-no-outline" href="{href}"><img class="s-image" src="https://m.media-amazon.com/images/I/{asin}.jpg"></a>'
+            '<h2 class="a-size-mini a-spacing-none a-color-base s-line-clamp-2">'
+            f'<a class="a-link-normal s-underline-text s-underline-link-text s-link-style a-text-normal" href="{href}">'
+            f'<span class="a-size-medium a-color-base a-text-normal">boAt Airdopes {100 + i} {sentence(rng, 6)}</span></a></h2>'
+            '<span class="a-icon-alt">4.1 out of 5 stars</span>'
+            f'<span class="a-price-whole">{rng.randint(899, 2999):,}</span></div>'
+        )
+    body = '<div class="s-main-slot s-result-list s-search-results">' + "".join(results) + "</div>"
+    return "search_results.html", page("Amazon.in : boat airdopes 141", body, rng, noise_blocks=100)
+
+
+def build_all():
+    return [
+        build_search_page(1),
+        build_product_page(2),
+        build_reviews_page("reviews_histogram_bars.html", histogram_bars(), 3),
+        build_reviews_page("reviews_histogram_table.html", histogram_table(), 4),
+        build_reviews_page("reviews_histogram_compact.html", histogram_compact(), 5),
+        build_reviews_page("reviews_alt_layout.html", histogram_table(), 6, alt_layout=True),
+        build_reviews_page("reviews_empty.html", histogram_table(), 7, count=0),
+    ]
+
+
+if __name__ == "__main__":
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    for name, html in build_all():
+        path = os.path.join(FIXTURE_DIR, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(html)
+        print(f"📁 {path} ({len(html) // 1024} KB)")
@@ -0,0 +1,230 @@
+"""
+Offline parse-throughput benchmark for the HTML parsers in the repo.
+
+Runs every parser function against the saved pages in benchmarks/fixtures/
+and reports pages/sec, reviews/sec and peak memory per function. No network,
+no browser.
+
+    python benchmarks/parse_benchmark.py
+    python benchmarks/parse_benchmark.py --repeat 50 --json results.json
+    python benchmarks/parse_benchmark.py --baseline results.json --tolerance 0.2
+    python benchmarks/parse_benchmark.py --check
+
+With --baseline the run exits non-zero if any parser got slower than the
+saved run by more than the tolerance, so it can gate a change offline.
+--check verifies every review_extractor backend returns identical records
+for every fixture page.
+"""
+import argparse
+import importlib.util
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import review_extractor
+FIXTURE_DIR = os.path.join(ROOT, "benchmarks", "fixtures")
+
+REVIEW_PAGES = [
+    "reviews_histogram_bars.html",
+    "reviews_histogram_table.html",
+    "reviews_histogram_compact.html",
+    "reviews_alt_layout.html",
+    "reviews_empty.html",
+]
+
+
+# ============ LOADING ============
+def load_script(filename, module_name):
+    """Import one of the repo's scripts by file path (their names are not importable)."""
+    path = os.path.join(ROOT, filename)
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def load_fixtures(names=None):
+    pages = {}
+    for name in names or sorted(os.listdir(FIXTURE_DIR)):
+        if not name.endswith(".html"):
+            continue
+        with open(os.path.join(FIXTURE_DIR, name), "rb") as f:
+            pages[name] = f.read()
+    return pages
+
+
+# ============ TARGETS ============
+def build_targets():
+    """
+    Each target: (name, callable(html_bytes) -> result, review counter, fixture names).
+    Review counter maps the parser's return value to the number of reviews it produced.
+    """
+    nivisha = load_script("Review Analytics Engine- Nivisha.py", "nivisha_engine")
+    chellshiba = load_script("amazon_scraper_local-CHELLSHIBA.py", "amazon_scraper_local")
+    brindha = load_script("Database Integration - Brindha.py", "database_integration")
+    charu = load_script("Review Cleaning & Preprocessing Engine- Charu.py", "cleaning_engine")
+
+    return [
+        (
+            "Nivisha.extract_histogram",
+            nivisha.extract_histogram,
+            lambda result: 0,
+            REVIEW_PAGES + ["product_page.html"],
+        ),
+        (
+            "CHELLSHIBA.parse_review_blocks",
+            chellshiba.parse_review_blocks,
+            lambda result: len(result or []),
+            REVIEW_PAGES,
+        ),
+        (
+            "Brindha.parse_review_page",
+            lambda html: brindha.parse_review_page(html.decode("utf-8")),
+            len,
+            REVIEW_PAGES,
+        ),
+        (
+            "Charu.parse_reviews_page",
+            lambda html: charu.parse_reviews_page(html.decode("utf-8")),
+            lambda result: len(result[1]),
+            REVIEW_PAGES,
+        ),
+    ] + [
+        (
+            f"review_extractor[{backend}]",
+            lambda html, backend=backend: review_extractor.extract_page(html, backend=backend),
+            lambda page: len(page.reviews or []),
+            REVIEW_PAGES + ["product_page.html"],
+        )
+        for backend in review_extractor.BACKENDS
+    ]
+
+
+# ============ MEASUREMENT ============
+def measure(fn, count_reviews, pages, repeat):
+    # warm-up pass (imports, selector compilation, regex caches)
+    for html in pages.values():
+        fn(html)
+
+    n_pages = 0
+    n_reviews = 0
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for html in pages.values():
+            n_reviews += count_reviews(fn(html))
+            n_pages += 1
+    elapsed = time.perf_counter() - start
+
+    # peak memory is measured in a separate pass; tracemalloc skews timings
+    peak = 0
+    for html in pages.values():
+        tracemalloc.start()
+        fn(html)
+        _, page_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peak = max(peak, page_peak)
+
+    return {
+        "pages": n_pages,
+        "reviews": n_reviews,
+        "seconds": elapsed,
+        "pages_per_sec": n_pages / elapsed if elapsed else 0.0,
+        "reviews_per_sec": n_reviews / elapsed if elapsed else 0.0,
+        "peak_mem_kb": peak / 1024,
+    }
+
+
+def run(repeat=20, only=None):
+    results = {}
+    for name, fn, count_reviews, fixture_names in build_targets():
+        if only and only not in name:
+            continue
+        pages = load_fixtures(fixture_names)
+        results[name] = measure(fn, count_reviews, pages, repeat)
+    return results
+
+
+def print_report(results):
+    print(f"\n{'parser':<36}{'pages/s':>10}{'reviews/s':>12}{'peak KB':>10}")
+    print("-" * 68)
+    for name, r in results.items():
+        print(f"{name:<36}{r['pages_per_sec']:>10.1f}{r['reviews_per_sec']:>12.1f}{r['peak_mem_kb']:>10.0f}")
+
+    base = results.get("review_extractor[bs4]")
+    if base and base["pages_per_sec"]:
+        for name, r in results.items():
+            if name.startswith("review_extractor[") and name != "review_extractor[bs4]":
+                print(f"⚡ {name}: {r['pages_per_sec'] / base['pages_per_sec']:.1f}x faster than html.parser")
+    print()
+
+
+def check_backends():
+    """Return fixture names where the extractor backends disagree with bs4."""
+    mismatched = []
+    for name, html in load_fixtures().items():
+        for separator, fallback in [("", False), (" ", True)]:
+            expected = review_extractor.extract_page(html, separator, fallback, backend="bs4")
+            for backend in review_extractor.BACKENDS:
+                if review_extractor.extract_page(html, separator, fallback, backend=backend) != expected:
+                    mismatched.append(f"{name} [{backend}]")
+    return mismatched
+
+
+def compare(results, baseline, tolerance):
+    """Return the names of parsers that regressed beyond tolerance vs the baseline run."""
+    regressed = []
+    for name, r in results.items():
+        old = baseline.get(name)
+        if not old or not old.get("pages_per_sec"):
+            continue
+        ratio = r["pages_per_sec"] / old["pages_per_sec"]
+        marker = "✔" if ratio >= 1 - tolerance else "❌"
+        print(f"{marker} {name}: {ratio:.2f}x of baseline")
+        if ratio < 1 - tolerance:
+            regressed.append(name)
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline HTML parse-throughput benchmark")
+    parser.add_argument("--repeat", type=int, default=20, help="Passes over the fixture corpus (default 20)")
+    parser.add_argument("--only", help="Run only parsers whose name contains this string")
+    parser.add_argument("--json", help="Write results to this JSON file")
+    parser.add_argument("--baseline", help="Compare against a previous --json results file")
+    parser.add_argument("--check", action="store_true", help="Check extractor backends give identical output")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Allowed slowdown vs baseline before failing (default 0.2 = 20%%)")
+    args = parser.parse_args()
+
+    if args.check:
+        mismatched = check_backends()
+        if mismatched:
+            print("❌ Backend output differs:", ", ".join(sorted(set(mismatched))))
+            sys.exit(1)
+        print(f"✔ Identical output across backends: {', '.join(review_extractor.BACKENDS)}")
+        return
+
+    results = run(repeat=args.repeat, only=args.only)
+    print_report(results)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"📁 Saved results -> {args.json}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressed = compare(results, baseline, args.tolerance)
+        if regressed:
+            print("❌ Parse regression:", ", ".join(regressed))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
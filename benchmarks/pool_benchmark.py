@@ -0,0 +1,151 @@
+"""
+Driver pool reuse check with stand-in browsers (no Chrome needed).
+
+Each stand-in driver takes --cold-start seconds to "launch", keeps cookies
+and per-origin storage, and answers the DevTools calls DriverPool._reset
+makes. Leases alternate between Amazon and Flipkart pages and open an extra
+tab now and then. Checks that every reset driver goes back into the idle
+queue (one launch per pool slot, nothing discarded), that no lease sees the
+previous lease's cookies or storage, and that Storage.clearDataForOrigin is
+only ever called with real origins.
+
+    python benchmarks/pool_benchmark.py
+    python benchmarks/pool_benchmark.py --leases 200 --size 2 --cold-start 0.5
+"""
+import argparse
+import sys
+import time
+from urllib.parse import urlparse
+
+from parse_benchmark import ROOT  # noqa: F401  (puts the repo root on sys.path)
+from driver_pool import DriverPool
+
+PAGES = [
+    "https://www.amazon.in/s?k=boat+airdopes",
+    "https://www.flipkart.com/search?q=boat+airdopes",
+    "https://www.amazon.in/product-reviews/B0DGH5K43K",
+]
+EXTRA_TAB = "https://www.amazon.com/gp/help"
+
+
+# ============ STAND-IN DRIVER ============
+class _SwitchTo:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def window(self, handle):
+        self.driver.current = handle
+
+
+class StandInDriver:
+    def __init__(self, cold_start):
+        time.sleep(cold_start)
+        self.tabs = {"tab-0": "about:blank"}
+        self.current = "tab-0"
+        self.cookies = set()
+        self.storage = {}                # origin -> keys
+        self.cleared_origins = []
+        self.switch_to = _SwitchTo(self)
+
+    @staticmethod
+    def _origin(url):
+        parts = urlparse(url)
+        return f"{parts.scheme}://{parts.netloc}" if parts.netloc else None
+
+    @property
+    def window_handles(self):
+        return list(self.tabs)
+
+    @property
+    def current_url(self):
+        return self.tabs[self.current]
+
+    def get(self, url):
+        self.tabs[self.current] = url
+        origin = self._origin(url)
+        if origin:
+            self.cookies.add(origin)
+            self.storage.setdefault(origin, set()).add("session")
+
+    def open_tab(self, url):
+        handle = f"tab-{len(self.tabs)}"
+        self.tabs[handle] = "about:blank"
+        self.current = handle
+        self.get(url)
+
+    def close(self):
+        del self.tabs[self.current]
+
+    def execute_script(self, script):
+        origin = self._origin(self.current_url)
+        if origin is None:
+            raise RuntimeError("no storage on about:blank")
+        if "localStorage.clear" in script:
+            self.storage.pop(origin, None)
+
+    def execute_cdp_cmd(self, cmd, params):
+        if cmd == "Network.clearBrowserCookies":
+            self.cookies.clear()
+        elif cmd == "Storage.clearDataForOrigin":
+            origin = params["origin"]
+            parts = urlparse(origin)
+            if parts.scheme not in ("http", "https") or not parts.netloc:
+                raise ValueError(f"Invalid origin: {origin!r}")
+            self.cleared_origins.append(origin)
+            self.storage.pop(origin, None)
+        else:
+            raise ValueError(f"Unknown command {cmd}")
+
+    def quit(self):
+        pass
+
+
+# ============ RUN ============
+def main():
+    parser = argparse.ArgumentParser(description="Driver pool reuse with stand-in browsers")
+    parser.add_argument("--leases", type=int, default=60)
+    parser.add_argument("--size", type=int, default=2)
+    parser.add_argument("--cold-start", type=float, default=0.2, help="Seconds per stand-in launch")
+    args = parser.parse_args()
+
+    drivers = []
+
+    def factory():
+        drivers.append(StandInDriver(args.cold_start))
+        return drivers[-1]
+
+    pool = DriverPool(factory, size=args.size, max_uses=args.leases + 1)
+    leaked = 0
+    start = time.perf_counter()
+    for i in range(args.leases):
+        with pool.lease() as driver:
+            if driver.cookies or driver.storage:
+                leaked += 1
+            driver.get(PAGES[i % len(PAGES)])
+            if i % 5 == 4:
+                driver.open_tab(EXTRA_TAB)
+    elapsed = time.perf_counter() - start
+    stats = pool.stats()
+    pool.close()
+
+    cleared = sorted({o for d in drivers for o in d.cleared_origins})
+    print(f"{args.leases} leases in {elapsed:.2f}s ({elapsed / args.leases * 1000:.1f} ms each, "
+          f"cold start {args.cold_start * 1000:.0f} ms)")
+    print(f"created {stats['created']} | reused {stats['reused']} | discarded {stats['discarded']} "
+          f"| idle {stats['idle']}")
+    print(f"origins cleared: {', '.join(cleared)}")
+
+    ok = True
+    if stats["created"] > args.size or stats["discarded"] or stats["idle"] != stats["created"]:
+        print("❌ Reset drivers did not all go back into the idle queue")
+        ok = False
+    if leaked:
+        print(f"❌ {leaked} leases saw cookies or storage from an earlier lease")
+        ok = False
+    if not ok:
+        sys.exit(1)
+    print("✔ Every reset driver reused, no cookies or storage carried between leases")
+
+
+if __name__ == "__main__":
+    main()
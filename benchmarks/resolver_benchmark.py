@@ -0,0 +1,109 @@
+"""
+Fuzzy query resolver: lookup latency and added hit rate at 100k known queries.
+
+Known queries are synthetic product searches ("boat airdopes 141",
+"samsung galaxy m34 5g 8gb", ...). Lookups are variants users actually type:
+case / hyphen changes (exact after normalization), an extra word, a typo -
+which should resolve - and the same product with a different model number,
+which must not.
+
+    python benchmarks/resolver_benchmark.py
+    python benchmarks/resolver_benchmark.py --queries 20000 --lookups 2000
+"""
+import argparse
+import random
+import statistics
+import time
+
+from parse_benchmark import ROOT  # noqa: F401  (puts the repo root on sys.path)
+from query_resolver import QueryResolver, tokenize
+
+BRANDS = ["boat", "samsung", "redmi", "realme", "oneplus", "noise", "jbl", "sony", "apple", "lenovo",
+          "hp", "dell", "asus", "boult", "fire boltt", "mi", "iqoo", "vivo", "oppo", "nothing"]
+LINES = ["airdopes", "rockerz", "galaxy", "note", "narzo", "nord", "colorfit", "tune", "wh", "iphone",
+         "ideapad", "victus", "inspiron", "vivobook", "buds", "smart band", "neo", "phone", "watch", "pad"]
+EXTRAS = ["earbuds", "5g", "wireless", "bluetooth", "black", "pro", "max", "lite", "plus", "128gb"]
+
+
+def make_queries(n, seed=3):
+    rng = random.Random(seed)
+    out = set()
+    while len(out) < n:
+        words = [rng.choice(BRANDS), rng.choice(LINES), str(rng.randrange(10, 2000))]
+        words += rng.sample(EXTRAS, rng.randrange(0, 3))
+        out.add(" ".join(words))
+    return sorted(out)
+
+
+def typo(word, rng):
+    if len(word) < 5:
+        return word
+    i = rng.randrange(1, len(word) - 1)
+    return word[:i] + word[i + 1:]
+
+
+def variants(queries, n, seed=5):
+    rng = random.Random(seed)
+    out = []
+    for _ in range(n):
+        q = rng.choice(queries)
+        words = q.split()
+        kind = rng.choice(["case", "extra", "typo", "number"])
+        if kind == "case":
+            v = "-".join(w.upper() if rng.random() < 0.5 else w for w in words)
+        elif kind == "extra":
+            v = q + " " + rng.choice(["earbuds", "online", "best price", "india"])
+        elif kind == "typo":
+            i = max(range(len(words)), key=lambda j: len(words[j]) if not words[j].isdigit() else 0)
+            v = " ".join(typo(w, rng) if j == i else w for j, w in enumerate(words))
+        else:
+            v = " ".join(str(int(w) + 1) if w.isdigit() else w for w in words)
+        out.append((kind, q, v))
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fuzzy query resolver benchmark")
+    parser.add_argument("--queries", type=int, default=100000, help="Known queries (default 100000)")
+    parser.add_argument("--lookups", type=int, default=5000, help="Variant lookups (default 5000)")
+    args = parser.parse_args()
+
+    queries = make_queries(args.queries)
+    resolver = QueryResolver(max_queries=args.queries)
+    start = time.perf_counter()
+    for i, q in enumerate(queries):
+        resolver.add(q, f"target:{i}")
+    build_s = time.perf_counter() - start
+    target = {q: f"target:{i}" for i, q in enumerate(queries)}
+    query_of = {t: q for q, t in target.items()}
+
+    def numbers(q):
+        return sorted(t for t in tokenize(q) if t[0].isdigit())
+
+    results = {}
+    times = []
+    for kind, original, query in variants(queries, args.lookups):
+        start = time.perf_counter()
+        got = resolver.resolve(query)
+        times.append(time.perf_counter() - start)
+        stats = results.setdefault(kind, [0, 0, 0])
+        stats[2] += 1
+        if got == target[original]:
+            stats[0] += 1
+        elif got is not None and numbers(query_of[got]) != numbers(query):
+            # another known query with the variant's numbers is a legitimate match
+            stats[1] += 1
+
+    times.sort()
+    print(f"\n{len(queries)} known queries indexed in {build_s:.2f}s; {args.lookups} lookups")
+    print(f"lookup mean {statistics.mean(times) * 1000:.3f} ms, p99 {times[int(0.99 * (len(times) - 1))] * 1000:.3f} ms")
+    print(f"{'variant':<10}{'resolved':>10}{'wrong':>8}{'n':>7}")
+    print("-" * 35)
+    for kind, (ok, bad, n) in sorted(results.items()):
+        print(f"{kind:<10}{ok / n:>9.1%}{bad:>8}{n:>7}")
+    print("(number: a different model - 'resolved' should be 0%; wrong = matched a query with other numbers)")
+    print("resolver:", resolver.stats())
+
+
+if __name__ == "__main__":
+    main()
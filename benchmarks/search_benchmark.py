@@ -0,0 +1,102 @@
+"""
+BM25 review search: build, snapshot and query times.
+
+Reviews are synthetic: the fixture vocabulary (common review words, present
+in a large share of reviews) mixed with a Zipf-distributed long tail of
+product / feature words, the way real review text is distributed. Queries
+mix one common word with rarer ones, with and without rating / sentiment
+filters.
+
+    python benchmarks/search_benchmark.py
+    python benchmarks/search_benchmark.py --reviews 3000000
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from parse_benchmark import ROOT  # noqa: F401  (puts the repo root on sys.path)
+from make_fixtures import WORDS
+from review_search import ReviewIndex
+
+TAIL_WORDS = 50000
+
+
+def make_rows(n, seed=11):
+    rng = random.Random(seed)
+    tail = [f"w{i}x" for i in range(TAIL_WORDS)]
+    weights = [1 / (i + 1) for i in range(TAIL_WORDS)]
+    labels = ["positive", "neutral", "negative", None]
+    for start in range(0, n, 10000):
+        count = min(10000, n - start)
+        tails = rng.choices(tail, weights, k=count * 6)
+        for i in range(count):
+            words = [rng.choice(WORDS) for _ in range(rng.randint(4, 20))] + tails[i * 6:i * 6 + rng.randint(1, 6)]
+            rng.shuffle(words)
+            yield (start + i + 1, f"B0{rng.randrange(500):08d}", rng.randint(1, 5), " ".join(words),
+                   rng.choice(labels))
+
+
+def make_queries(seed=13):
+    rng = random.Random(seed)
+    out = []
+    for _ in range(60):
+        words = [rng.choice(WORDS)] + [f"w{int(rng.paretovariate(1.0)) % TAIL_WORDS}x" for _ in range(rng.randint(0, 2))]
+        out.append(" ".join(words))
+    return out
+
+
+def timed(fn, queries):
+    times = []
+    for q in queries:
+        start = time.perf_counter()
+        fn(q)
+        times.append(time.perf_counter() - start)
+    times.sort()
+    return statistics.mean(times) * 1000, times[int(0.95 * (len(times) - 1))] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BM25 review search benchmark")
+    parser.add_argument("--reviews", type=int, default=1000000, help="Synthetic reviews (default 1000000)")
+    args = parser.parse_args()
+
+    index = ReviewIndex()
+    start = time.perf_counter()
+    index.add(make_rows(args.reviews))
+    build_s = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "review_index.npz")
+        start = time.perf_counter()
+        index.save(path)
+        save_s = time.perf_counter() - start
+        start = time.perf_counter()
+        index = ReviewIndex.load(path)
+        load_s = time.perf_counter() - start
+        size_mb = os.path.getsize(path) / 1e6
+
+    # incremental adds land in the tail until the next merge
+    index.add((args.reviews + i, asin, rating, text, label)
+              for i, (_, asin, rating, text, label) in enumerate(make_rows(20000, seed=12), 1))
+
+    queries = make_queries()
+    print(f"\n{args.reviews} reviews indexed in {build_s:.1f}s; snapshot {size_mb:.0f} MB, "
+          f"save {save_s:.2f}s, load {load_s:.2f}s")
+    print(index.stats())
+    print(f"{'query':<34}{'mean':>10}{'p95':>10}")
+    print("-" * 54)
+    for label, fn in (
+        ("top 10", lambda q: index.search(q, k=10)),
+        ("top 10, rating <= 2", lambda q: index.search(q, k=10, max_rating=2)),
+        ("top 10, negative", lambda q: index.search(q, k=10, sentiment="negative")),
+        ("top 10, one product", lambda q: index.search(q, k=10, asin="B000000007")),
+    ):
+        mean, p95 = timed(fn, queries)
+        print(f"{label:<34}{mean:>8.2f}ms{p95:>8.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
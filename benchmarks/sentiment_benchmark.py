@@ -0,0 +1,81 @@
+"""
+Per-row vs batched VADER scoring throughput.
+
+Generates synthetic review texts (fixture vocabulary, deterministic) and
+scores them three ways:
+- the old per-row df["text"].apply(polarity_scores)
+- batch_sentiment.score_texts in-process
+- batch_sentiment.score_texts across the process pool
+
+It checks that all three agree and reports texts/sec plus the projected time
+for 1M archived reviews.
+
+    python benchmarks/sentiment_benchmark.py
+    python benchmarks/sentiment_benchmark.py --texts 200000 --workers 8
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from parse_benchmark import ROOT  # noqa: F401  (puts the repo root on sys.path)
+from make_fixtures import sentence
+import batch_sentiment
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+
+
+def make_texts(n, seed=7):
+    rng = random.Random(seed)
+    return [" ".join(sentence(rng, rng.randint(6, 18)) for _ in range(rng.randint(1, 4))) for _ in range(n)]
+
+
+def per_row(texts):
+    analyzer = SentimentIntensityAnalyzer()
+    s = pd.Series(texts).apply(analyzer.polarity_scores)
+    df = pd.DataFrame(list(s))
+    return {col: df[col].to_numpy() for col in batch_sentiment.COLUMNS}
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    out = fn(*args, **kwargs)
+    return out, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-row vs batched VADER scoring")
+    parser.add_argument("--texts", type=int, default=50000, help="Number of synthetic reviews (default 50000)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Pool size (default: CPU count)")
+    args = parser.parse_args()
+
+    texts = make_texts(args.texts)
+    runs = []
+    base, t = timed(per_row, texts)
+    runs.append(("per-row apply", t, base))
+    out, t = timed(batch_sentiment.score_texts, texts, workers=1)
+    runs.append(("batch x1", t, out))
+    # first call includes worker start-up; that is the cost a one-off archive job pays
+    out, t = timed(batch_sentiment.score_texts, texts, workers=args.workers, min_parallel=0)
+    runs.append((f"batch pool x{args.workers}", t, out))
+
+    print(f"\n{len(texts)} texts")
+    print(f"{'mode':<18}{'seconds':>9}{'texts/s':>11}{'1M reviews':>12}")
+    print("-" * 50)
+    for name, seconds, _ in runs:
+        rate = len(texts) / seconds
+        print(f"{name:<18}{seconds:>9.2f}{rate:>11.0f}{1_000_000 / rate / 60:>10.1f} m")
+
+    for name, _, out in runs[1:]:
+        for col in batch_sentiment.COLUMNS:
+            if not np.array_equal(out[col], base[col]):
+                print(f"❌ {name}: {col} differs from per-row scores")
+                sys.exit(1)
+    print("✔ All modes return identical scores")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Bulk-load and query benchmark for review_store.
+
+Loads synthetic reviews (fixture vocabulary, deterministic) for a spread of
+products into a fresh store file through ReviewStore.add_reviews, the same
+batched path the scrapers use, and reports rows/sec for the load plus the
+latency of the indexed reads: (asin, rating), (asin, review_date range) and
+known review ids.
+
+    python benchmarks/store_benchmark.py                      # 1M reviews
+    python benchmarks/store_benchmark.py --reviews 200000 --batch 2000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+
+from parse_benchmark import ROOT  # noqa: F401  (puts the repo root on sys.path)
+from make_fixtures import sentence
+from review_store import ReviewStore
+
+
+def make_batches(n, products, batch, seed=7, distinct_texts=20000):
+    """
+    (asin, [review dicts]) batches, n reviews spread evenly over the products.
+    Texts are drawn from a fixed pool so generation stays cheap.
+    """
+    rng = random.Random(seed)
+    texts = [" ".join(sentence(rng, rng.randint(6, 18)) for _ in range(rng.randint(1, 4)))
+             for _ in range(distinct_texts)]
+    start = date(2021, 1, 1)
+    for p in range(products):
+        asin = f"B0{p:08d}"
+        first, end = n * p // products, n * (p + 1) // products
+        for lo in range(first, end, batch):
+            yield asin, [{
+                "review_id": f"R{i:012X}",
+                "rating": rng.choice((5, 5, 5, 4, 4, 3, 2, 1, 1)),
+                "title": sentence(rng, 4),
+                "text": texts[rng.randrange(distinct_texts)],
+                "date": start + timedelta(days=rng.randrange(1500)),
+            } for i in range(lo, min(lo + batch, end))]
+
+
+def load(store, batches):
+    """add_reviews per batch; returns (rows, seconds spent in the store)."""
+    loaded = 0
+    seconds = 0.0
+    for asin, rows in batches:
+        start = time.perf_counter()
+        store.add_reviews(asin, rows)
+        seconds += time.perf_counter() - start
+        loaded += len(rows)
+    return loaded, seconds
+
+
+def timed_query(label, fn, repeat=200):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        out = fn()
+    ms = (time.perf_counter() - start) / repeat * 1000
+    print(f"  {label:<34}{ms:>8.2f} ms   ({len(out)} rows)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="review_store bulk-load benchmark")
+    parser.add_argument("--reviews", type=int, default=1_000_000, help="Reviews to load (default 1M)")
+    parser.add_argument("--products", type=int, default=500, help="Distinct ASINs (default 500)")
+    parser.add_argument("--batch", type=int, default=5000, help="Rows per add_reviews call (default 5000)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "reviews.db")
+        store = ReviewStore(path)
+
+        loaded, seconds = load(store, make_batches(args.reviews, args.products, args.batch))
+        size_mb = sum(os.path.getsize(os.path.join(tmp, f)) for f in os.listdir(tmp)) / 1e6
+
+        print(f"\nLoaded {loaded} reviews for {args.products} products in {seconds:.1f}s "
+              f"→ {loaded / seconds:,.0f} rows/s  ({size_mb:.0f} MB on disk incl. WAL)")
+        print(store.counts())
+
+        asin = "B000000007"
+        print("\nIndexed reads (one product):")
+        timed_query("rating >= 4", lambda: store.reviews(asin, min_rating=4, limit=100))
+        timed_query("rating <= 2, newest 50", lambda: store.reviews(asin, max_rating=2, limit=50))
+        timed_query("2023 date range", lambda: store.reviews(asin, since="2023-01-01", until="2023-12-31"))
+        timed_query("known review ids", lambda: store.known_review_ids(asin), repeat=20)
+
+        # re-loading the same reviews must not add rows (review id is unique)
+        again, seconds = load(store, make_batches(args.reviews, args.products, args.batch))
+        print(f"\nRe-load of {again} known reviews: {seconds:.1f}s ({again / seconds:,.0f} rows/s), "
+              f"rows now {store.counts()['reviews']}")
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
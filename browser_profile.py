@@ -0,0 +1,173 @@
+"""
+"Lean" Chrome profile for the Selenium scrapers.
+
+The scrapers only read text (title, price, rating, review bodies), so a lean
+browser:
+- uses the eager page-load strategy (driver.get returns at DOMContentLoaded)
+- disables images
+- blocks images, fonts, media and third-party ad / analytics hosts through
+  DevTools (Network.setBlockedURLs)
+
+track_page() measures time-to-extract, bytes transferred and blocked requests
+per page, and estimates bytes saved against full (non-lean) loads of the same
+kind of page:
+
+    options = apply_lean_options(uc.ChromeOptions())
+    driver = uc.Chrome(options=options)
+    enable_request_blocking(driver)
+
+    with track_page(driver, "product", lean=True):
+        driver.get(url)
+        ...extract...
+"""
+import json
+import time
+from contextlib import contextmanager
+
+BLOCKED_URL_PATTERNS = [
+    # images
+    "*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.svg*", "*.ico*", "*.avif*",
+    # fonts
+    "*.woff*", "*.ttf*", "*.otf*", "*.eot*",
+    # media
+    "*.mp4*", "*.webm*", "*.m3u8*", "*.ts?*", "*.mp3*",
+    # third-party ads / analytics / tracking
+    "*doubleclick.net*", "*googlesyndication.com*", "*googletagmanager.com*",
+    "*google-analytics.com*", "*amazon-adsystem.com*", "*facebook.net*",
+    "*scorecardresearch.com*", "*criteo.*", "*adsrvr.org*", "*hotjar.com*",
+    # first-party beacons that never affect page text
+    "*fls-eu.amazon.*", "*fls-na.amazon.*", "*unagi.amazon.*", "*unagi-na.amazon.*",
+    "*/1.flipkart.com/*",
+]
+
+
+# ============ PROFILE ============
+def apply_lean_options(options):
+    """Configure (uc.)ChromeOptions for a lean profile. Returns the same options."""
+    options.page_load_strategy = "eager"
+    options.add_argument("--blink-settings=imagesEnabled=false")
+    options.add_experimental_option("prefs", {
+        "profile.managed_default_content_settings.images": 2,
+        "profile.default_content_setting_values.notifications": 2,
+    })
+    # performance log lets track_page count blocked requests
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    return options
+
+
+def enable_request_blocking(driver, patterns=None):
+    """Block resource URLs for this browser session via DevTools."""
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns or BLOCKED_URL_PATTERNS})
+    return driver
+
+
+# ============ METRICS ============
+_TRANSFER_JS = """
+const nav = performance.getEntriesByType('navigation')[0];
+let total = nav ? nav.transferSize : 0;
+for (const r of performance.getEntriesByType('resource')) total += r.transferSize || 0;
+return total;
+"""
+
+
+def _transferred_bytes(driver):
+    try:
+        return int(driver.execute_script(_TRANSFER_JS) or 0)
+    except Exception:
+        return None
+
+
+def _blocked_requests(driver):
+    """Count requests Chrome refused since the log was last read (lean browsers only)."""
+    try:
+        entries = driver.get_log("performance")
+    except Exception:
+        return None
+    blocked = 0
+    for entry in entries:
+        try:
+            msg = json.loads(entry["message"])["message"]
+        except (KeyError, ValueError):
+            continue
+        if msg.get("method") == "Network.loadingFailed" and msg.get("params", {}).get("blockedReason"):
+            blocked += 1
+    return blocked
+
+
+class PageStats:
+    """
+    Per-page load metrics, with a running full-load baseline per page kind.
+    Only running totals are kept, so long-lived processes don't grow with every page.
+    """
+
+    def __init__(self):
+        self._totals = {}    # lean -> {"pages", "seconds", "max_seconds", "sized", "bytes", "blocked"}
+        self._baseline = {}  # kind -> (total bytes, count) of non-lean loads
+
+    def record(self, kind, url, lean, seconds, transferred, blocked):
+        saved = None
+        if transferred is not None:
+            if not lean:
+                total, count = self._baseline.get(kind, (0, 0))
+                self._baseline[kind] = (total + transferred, count + 1)
+            elif kind in self._baseline:
+                total, count = self._baseline[kind]
+                saved = max(0, total // count - transferred)
+        totals = self._totals.setdefault(bool(lean), {"pages": 0, "seconds": 0.0, "max_seconds": 0.0,
+                                                      "sized": 0, "bytes": 0, "blocked": 0})
+        totals["pages"] += 1
+        totals["seconds"] += seconds
+        totals["max_seconds"] = max(totals["max_seconds"], seconds)
+        if transferred is not None:
+            totals["sized"] += 1
+            totals["bytes"] += transferred
+        totals["blocked"] += blocked or 0
+        return {
+            "kind": kind, "url": url, "lean": lean, "seconds": seconds,
+            "bytes": transferred, "blocked": blocked, "bytes_saved": saved,
+        }
+
+    def summary(self) -> dict:
+        out = {}
+        for lean in (True, False):
+            totals = self._totals.get(lean)
+            if not totals:
+                continue
+            out["lean" if lean else "full"] = {
+                "pages": totals["pages"],
+                "avg_seconds": totals["seconds"] / totals["pages"],
+                "max_seconds": totals["max_seconds"],
+                "avg_kb": totals["bytes"] / totals["sized"] / 1024 if totals["sized"] else None,
+                "blocked": totals["blocked"],
+            }
+        return out
+
+
+PAGE_STATS = PageStats()
+
+
+def _fmt_kb(n):
+    return f"{n / 1024:.0f} KB" if n is not None else "n/a"
+
+
+@contextmanager
+def track_page(driver, kind: str, lean: bool = False, stats: PageStats = PAGE_STATS):
+    """Time a navigate-and-extract step and log what the page cost to load."""
+    start = time.perf_counter()
+    yield
+    seconds = time.perf_counter() - start
+    transferred = _transferred_bytes(driver)
+    blocked = _blocked_requests(driver) if lean else None
+    try:
+        url = driver.current_url
+    except Exception:
+        url = None
+    page = stats.record(kind, url, lean, seconds, transferred, blocked)
+
+    line = f"📉 {kind}: {seconds:.2f}s to extract, {_fmt_kb(transferred)} transferred"
+    if lean:
+        line += f", {blocked if blocked is not None else 'n/a'} requests blocked"
+        if page["bytes_saved"] is not None:
+            line += f", ~{_fmt_kb(page['bytes_saved'])} saved"
+    print(line)
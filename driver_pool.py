@@ -0,0 +1,258 @@
+"""
+Reusable Chrome WebDriver pool for the Selenium scrapers.
+
+Starting Chrome (and resolving chromedriver) is most of a short scrape's
+latency, so long-running callers - the scheduler and the Flask API - lease
+browsers from a pool instead of launching one per call:
+
+    POOL = DriverPool(uc_factory, size=2, max_uses=20)
+
+    with POOL.lease() as driver:
+        driver.get(url)
+
+Between leases a driver is reset (extra tabs closed, every cookie and the
+storage of RESET_ORIGINS plus each open tab's origin cleared through
+DevTools, parked on about:blank), so e.g. Amazon and Flipkart leases never
+see each other's session. It is recycled after max_uses leases, and
+discarded if the lease raised or the reset fails.
+
+Both factories take lean=True for the image/font/tracker-blocking profile in
+browser_profile.py; DevTools URL blocking survives the reset between leases.
+"""
+import atexit
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from urllib.parse import urlparse
+
+from browser_profile import apply_lean_options, enable_request_blocking
+
+# sites the scrapers log in to / browse; their storage is cleared between leases
+RESET_ORIGINS = ("https://www.amazon.in", "https://www.flipkart.com")
+
+
+def _origin(url):
+    parts = urlparse(url or "")
+    return f"{parts.scheme}://{parts.netloc}" if parts.scheme in ("http", "https") and parts.netloc else None
+
+
+# ============ FACTORIES ============
+@lru_cache(maxsize=1)
+def chromedriver_path():
+    """Resolve chromedriver once per process instead of on every launch."""
+    from webdriver_manager.chrome import ChromeDriverManager
+    return ChromeDriverManager().install()
+
+
+def chrome_factory(headless=True, options=None, lean=False):
+    """Plain selenium Chrome with a cached chromedriver path. lean=True: see browser_profile."""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+    from selenium.webdriver.chrome.options import Options
+
+    if options is None:
+        options = Options()
+        if headless:
+            options.add_argument("--headless")
+    if lean:
+        apply_lean_options(options)
+    driver = webdriver.Chrome(service=Service(chromedriver_path()), options=options)
+    return enable_request_blocking(driver) if lean else driver
+
+
+def uc_factory(headless=False, options=None, lean=False):
+    """undetected_chromedriver Chrome with the flags the scrapers already use."""
+    import undetected_chromedriver as uc
+
+    if options is None:
+        options = uc.ChromeOptions()
+        if headless:
+            options.add_argument("--headless=new")
+        options.add_argument("--start-maximized")
+        options.add_argument("--disable-gpu")
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-dev-shm-usage")
+    if lean:
+        apply_lean_options(options)
+    driver = uc.Chrome(options=options)
+    return enable_request_blocking(driver) if lean else driver
+
+
+# ============ POOL ============
+class DriverPool:
+    def __init__(self, factory, size: int = 2, max_uses: int = 25, lease_timeout: float = 300):
+        """
+        factory:       zero-arg callable returning a new WebDriver
+        size:          max browsers alive at once (leases beyond this wait)
+        max_uses:      leases before a browser is quit and replaced
+        lease_timeout: seconds to wait for a free browser before raising
+        """
+        self.factory = factory
+        self.size = size
+        self.max_uses = max_uses
+        self.lease_timeout = lease_timeout
+
+        self._idle = queue.LifoQueue()
+        self._uses = {}
+        self._alive = 0
+        self._lock = threading.Lock()
+        self._create_lock = threading.Lock()
+        self._closed = False
+
+        self.created = 0
+        self.leases = 0
+        self.recycled = 0
+        self.discarded = 0
+        self.cold_start_seconds = 0.0
+        self.wait_seconds = 0.0
+
+        atexit.register(self.close)
+
+    # ---------- lifecycle ----------
+    def _create(self):
+        # serialize launches; concurrent uc.Chrome() calls race on patching chromedriver
+        with self._create_lock:
+            start = time.perf_counter()
+            driver = self.factory()
+            elapsed = time.perf_counter() - start
+        with self._lock:
+            self.created += 1
+            self.cold_start_seconds += elapsed
+            self._uses[id(driver)] = 0
+        print(f"🚗 Started browser #{self.created} in {elapsed:.1f}s")
+        return driver
+
+    def _destroy(self, driver):
+        with self._lock:
+            self._alive -= 1
+            self._uses.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def _reset(self, driver):
+        origins = set(RESET_ORIGINS)
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            origins.add(_origin(driver.current_url))
+            driver.close()
+        driver.switch_to.window(handles[0])
+        origins.add(_origin(driver.current_url))
+        origins.discard(None)
+        try:
+            driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+        except Exception:
+            pass  # about:blank / data: pages have no storage
+        if hasattr(driver, "execute_cdp_cmd"):
+            # delete_all_cookies / localStorage.clear only reach the current origin;
+            # CDP takes one real origin per call (no wildcard)
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            for origin in sorted(origins):
+                driver.execute_cdp_cmd("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"})
+        else:
+            driver.delete_all_cookies()
+        driver.get("about:blank")
+
+    def warm(self, count: int = None):
+        """Start browsers ahead of the first lease."""
+        for _ in range(min(count or self.size, self.size)):
+            with self._lock:
+                if self._alive >= self.size:
+                    return
+                self._alive += 1
+            try:
+                self._idle.put(self._create())
+            except Exception:
+                with self._lock:
+                    self._alive -= 1
+                raise
+
+    # ---------- leasing ----------
+    def _acquire(self):
+        if self._closed:
+            raise RuntimeError("DriverPool is closed")
+        start = time.perf_counter()
+        try:
+            driver = self._idle.get_nowait()
+        except queue.Empty:
+            driver = None
+            with self._lock:
+                can_create = self._alive < self.size
+                if can_create:
+                    self._alive += 1
+            if can_create:
+                try:
+                    driver = self._create()
+                except Exception:
+                    with self._lock:
+                        self._alive -= 1
+                    raise
+            else:
+                try:
+                    driver = self._idle.get(timeout=self.lease_timeout)
+                except queue.Empty:
+                    raise TimeoutError(f"No browser free after {self.lease_timeout}s (pool size {self.size})")
+        with self._lock:
+            self.leases += 1
+            self.wait_seconds += time.perf_counter() - start
+            self._uses[id(driver)] = self._uses.get(id(driver), 0) + 1
+        return driver
+
+    def _release(self, driver, healthy: bool):
+        if self._closed or not healthy:
+            with self._lock:
+                self.discarded += 1
+            self._destroy(driver)
+            return
+        if self._uses.get(id(driver), 0) >= self.max_uses:
+            with self._lock:
+                self.recycled += 1
+            self._destroy(driver)
+            return
+        try:
+            self._reset(driver)
+        except Exception:
+            with self._lock:
+                self.discarded += 1
+            self._destroy(driver)
+            return
+        self._idle.put(driver)
+
+    @contextmanager
+    def lease(self):
+        """Borrow a browser for the duration of the with-block."""
+        driver = self._acquire()
+        healthy = False
+        try:
+            yield driver
+            healthy = True
+        finally:
+            self._release(driver, healthy)
+
+    # ---------- reporting / shutdown ----------
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "alive": self._alive,
+                "idle": self._idle.qsize(),
+                "created": self.created,
+                "leases": self.leases,
+                "reused": self.leases - self.created,
+                "recycled": self.recycled,
+                "discarded": self.discarded,
+                "avg_cold_start_s": self.cold_start_seconds / self.created if self.created else 0.0,
+                "avg_wait_s": self.wait_seconds / self.leases if self.leases else 0.0,
+            }
+
+    def close(self):
+        self._closed = True
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._destroy(driver)
@@ -0,0 +1,166 @@
+"""
+Shared pooled HTTP client for the requests-based scrapers.
+
+One requests.Session per process with a keep-alive connection pool, so
+consecutive search / product / review pages reuse the same TCP+TLS
+connection instead of paying a fresh handshake each time. Responses are
+negotiated as gzip (and brotli when the brotli package is installed) and
+every request's timing is recorded in client.stats.
+
+    from http_client import get_client
+    r = get_client().get(url, headers=HEADERS)
+
+Pool sizes are tunable with configure(pool_maxsize=..., ...) before first use.
+"""
+import threading
+import time
+from collections import deque, Counter
+from dataclasses import dataclass
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import brotli  # noqa: F401  (urllib3 decodes br when this is importable)
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        ACCEPT_ENCODING = "gzip, deflate, br"
+    except ImportError:
+        ACCEPT_ENCODING = "gzip, deflate"
+
+DEFAULT_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+    ),
+    "Accept-Language": "en-US,en;q=0.9",
+    "Accept-Encoding": ACCEPT_ENCODING,
+    "Connection": "keep-alive",
+}
+
+
+# ============ STATS ============
+@dataclass
+class RequestTiming:
+    url: str
+    status: int
+    seconds: float        # full request incl. body download
+    ttfb: float           # time until response headers arrived
+    bytes: int            # decoded body size
+    encoding: str         # Content-Encoding the server answered with
+
+
+class ClientStats:
+    """Thread-safe per-request timing log plus running totals."""
+
+    def __init__(self, keep_last: int = 500):
+        self._lock = threading.Lock()
+        self.timings = deque(maxlen=keep_last)
+        self.requests = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.total_bytes = 0
+        self.status_counts = Counter()
+
+    def record(self, timing: RequestTiming):
+        with self._lock:
+            self.timings.append(timing)
+            self.requests += 1
+            self.total_seconds += timing.seconds
+            self.total_bytes += timing.bytes
+            self.status_counts[timing.status] += 1
+
+    def record_error(self):
+        with self._lock:
+            self.errors += 1
+
+    def summary(self) -> dict:
+        with self._lock:
+            recent = sorted(t.seconds for t in self.timings)
+            return {
+                "requests": self.requests,
+                "errors": self.errors,
+                "avg_ms": 1000 * self.total_seconds / self.requests if self.requests else 0.0,
+                "p50_ms": 1000 * recent[len(recent) // 2] if recent else 0.0,
+                "p95_ms": 1000 * recent[int(len(recent) * 0.95)] if recent else 0.0,
+                "total_kb": self.total_bytes / 1024,
+                "status": dict(self.status_counts),
+            }
+
+    def print_summary(self):
+        s = self.summary()
+        print(f"🌐 HTTP: {s['requests']} requests, {s['errors']} errors | "
+              f"avg {s['avg_ms']:.0f} ms, p50 {s['p50_ms']:.0f} ms, p95 {s['p95_ms']:.0f} ms | "
+              f"{s['total_kb']:.0f} KB")
+
+
+# ============ CLIENT ============
+class HttpClient:
+    def __init__(self, headers: dict = None, pool_connections: int = 10, pool_maxsize: int = 10,
+                 retries: int = 2, timeout: float = 15):
+        """
+        pool_connections: number of hosts to keep a connection pool for
+        pool_maxsize:     keep-alive connections kept per host (>= concurrent fetches)
+        retries:          retries on connection errors and 5xx, with backoff
+        """
+        self.timeout = timeout
+        self.session = requests.Session()
+        retry = Retry(total=retries, backoff_factor=0.3, status_forcelist=(500, 502, 503, 504),
+                      allowed_methods=("GET", "HEAD"), raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update(DEFAULT_HEADERS)
+        if headers:
+            self.session.headers.update(headers)
+        self.stats = ClientStats()
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """requests.get() over the pooled session; headers= are merged with the session defaults."""
+        kwargs.setdefault("timeout", self.timeout)
+        start = time.perf_counter()
+        try:
+            r = self.session.get(url, **kwargs)
+        except requests.RequestException:
+            self.stats.record_error()
+            raise
+        self.stats.record(RequestTiming(
+            url=url,
+            status=r.status_code,
+            seconds=time.perf_counter() - start,
+            ttfb=r.elapsed.total_seconds(),
+            bytes=len(r.content),
+            encoding=r.headers.get("Content-Encoding", "identity"),
+        ))
+        return r
+
+    def close(self):
+        self.session.close()
+
+
+_client = None
+_client_lock = threading.Lock()
+_client_options = {}
+
+
+def configure(**options):
+    """Set HttpClient options (pool sizes, retries, timeout) for the shared client; rebuilds it."""
+    global _client
+    with _client_lock:
+        _client_options.update(options)
+        if _client is not None:
+            _client.close()
+            _client = None
+
+
+def get_client() -> HttpClient:
+    """The process-wide shared client, created on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = HttpClient(**_client_options)
+    return _client
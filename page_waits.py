@@ -0,0 +1,156 @@
+"""
+Readiness waits for the Selenium scrapers, replacing fixed time.sleep() calls.
+
+Each wait polls for a concrete condition (search results rendered,
+#productTitle present, review blocks swapped in after "Next") and returns as
+soon as it holds, or gives up after a timeout. Timeouts do not raise: the
+scrapers already treat missing elements as "not found", so a wait returns
+None and the page is parsed as-is.
+
+Every wait is timed and logged:
+
+    wait_for(driver, PRODUCT_TITLE, "product title")
+    # ⏱ product title: 0.42s
+
+    click_and_wait(driver, next_link, REVIEW_BLOCKS, "next reviews page")
+    WAIT_STATS.print_summary()
+"""
+import random
+import threading
+import time
+from collections import defaultdict
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from review_extractor import ALT_BLOCK_SELECTOR, BLOCK_SELECTOR
+
+DEFAULT_TIMEOUT = 10
+POLL_SECONDS = 0.1
+VERBOSE = True
+
+# ============ READINESS CONDITIONS ============
+SEARCH_BOX = "#twotabsearchtextbox"
+SEARCH_RESULTS = "div[data-component-type='s-search-result']"
+PRODUCT_TITLE = "#productTitle"
+PRICE = "span.a-price-whole, span.a-offscreen"
+REVIEW_BLOCKS = f"{BLOCK_SELECTOR}, {ALT_BLOCK_SELECTOR}"
+HISTOGRAM = "div[data-hook='histogram-bar'], table#histogramTable"
+POPUPS = "input[data-action-type='DISMISS'], span[data-action-type='DISMISS']"
+FLIPKART_TITLE = "span.B_NuCI"
+
+
+# ============ STATS ============
+class WaitStats:
+    """Count / total / max wait duration per label (running totals, not every wait)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.waits = defaultdict(lambda: [0, 0.0, 0.0])   # label -> [count, total s, max s]
+        self.timeouts = defaultdict(int)
+
+    def record(self, label, seconds, ok):
+        with self._lock:
+            totals = self.waits[label]
+            totals[0] += 1
+            totals[1] += seconds
+            totals[2] = max(totals[2], seconds)
+            if not ok:
+                self.timeouts[label] += 1
+
+    def summary(self) -> dict:
+        with self._lock:
+            return {
+                label: {
+                    "count": count,
+                    "avg_s": total / count,
+                    "max_s": longest,
+                    "timeouts": self.timeouts[label],
+                }
+                for label, (count, total, longest) in self.waits.items()
+            }
+
+    def total_seconds(self) -> float:
+        with self._lock:
+            return sum(total for _, total, _ in self.waits.values())
+
+    def print_summary(self):
+        print(f"⏱ Waits: {self.total_seconds():.1f}s total")
+        for label, s in self.summary().items():
+            print(f"   {label:<24} x{s['count']:<3} avg {s['avg_s']:.2f}s  max {s['max_s']:.2f}s"
+                  + (f"  ({s['timeouts']} timed out)" if s["timeouts"] else ""))
+
+
+WAIT_STATS = WaitStats()
+
+
+def _until(driver, condition, label, timeout):
+    start = time.perf_counter()
+    try:
+        result = WebDriverWait(driver, timeout, poll_frequency=POLL_SECONDS).until(condition)
+        ok = True
+    except TimeoutException:
+        result, ok = None, False
+    seconds = time.perf_counter() - start
+    WAIT_STATS.record(label, seconds, ok)
+    if VERBOSE:
+        print(f"⏱ {label}: {seconds:.2f}s" + ("" if ok else f" (timed out after {timeout}s)"))
+    return result
+
+
+# ============ WAITS ============
+def wait_for(driver, selector: str, label: str = None, timeout: float = DEFAULT_TIMEOUT,
+             clickable: bool = False):
+    """First element matching the CSS selector once present (or clickable), else None."""
+    locator = (By.CSS_SELECTOR, selector)
+    condition = EC.element_to_be_clickable(locator) if clickable else EC.presence_of_element_located(locator)
+    return _until(driver, condition, label or selector, timeout)
+
+
+def wait_for_any(driver, selectors, label: str = None, timeout: float = DEFAULT_TIMEOUT):
+    """The first of several selectors to match (e.g. reviews or "no reviews" notice), else None."""
+    def matched(d):
+        for selector in selectors:
+            if d.find_elements(By.CSS_SELECTOR, selector):
+                return selector
+        return False
+    return _until(driver, matched, label or " | ".join(selectors), timeout)
+
+
+def wait_ready(driver, label: str = "document ready", timeout: float = DEFAULT_TIMEOUT):
+    """DOM parsed (readyState past 'loading'); the fallback when no element marks readiness."""
+    return _until(driver, lambda d: d.execute_script("return document.readyState") != "loading",
+                  label, timeout)
+
+
+def wait_gone(driver, element, label: str = "popup closed", timeout: float = 3):
+    """Element detached or hidden, e.g. a dismissed popup."""
+    def gone(_):
+        try:
+            return not element.is_displayed()
+        except WebDriverException:
+            return True
+    return _until(driver, gone, label, timeout)
+
+
+def click_and_wait(driver, element, selector: str, label: str = None, timeout: float = DEFAULT_TIMEOUT):
+    """
+    Click (via JS) and wait for the next content matching selector.
+
+    Waits for the current first match (or the whole document when there is
+    none) to go stale first, so in-place AJAX swaps such as Amazon's review
+    pagination are not mistaken for the old page.
+    """
+    label = label or selector
+    current = driver.find_elements(By.CSS_SELECTOR, selector)
+    old = current[0] if current else driver.find_element(By.TAG_NAME, "html")
+    driver.execute_script("arguments[0].click();", element)
+    _until(driver, EC.staleness_of(old), f"{label} (unload)", timeout)
+    return wait_for(driver, selector, label, timeout)
+
+
+def polite_pause(low: float = 0.3, high: float = 1.0):
+    """Short random gap between consecutive page requests (not a readiness wait)."""
+    time.sleep(random.uniform(low, high))
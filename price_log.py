@@ -0,0 +1,423 @@
+"""
+Append-only price history log.
+
+Replaces the read-modify-write price_history.json: each scheduler tick
+appends its observations as JSON lines to the active segment, so a tick costs
+one small write no matter how much history exists, and a crash can at worst
+leave a torn last line (dropped on the next open).
+
+    log = PriceLog("price_history")
+    log.append_many([{"product": "B0DGH5K43K", "price": "1,299", "title": ...}, ...])
+    log.history("B0DGH5K43K", since="2025-01-01")               # change points
+    log.series("B0DGH5K43K", "2025-01-01", every_minutes=10)    # full series, rebuilt
+
+Change-only, delta-encoded: an observation identical to the product's last
+state is not written at all. A change is written as a delta against that
+state ({"t", "p", "d": {...}} holding only what changed: the price
+difference "dp", the new price text, and the new title or a "tt"
+[kept-prefix, new-suffix] edit). The first record of a product in each
+segment is a full keyframe, so every segment decodes on its own. For a
+product whose price rarely moves, a day of 10-minute ticks is a handful
+of short lines instead of 144 full ones; stats() reports the ratio.
+
+Layout (one directory):
+- seg-000001.jsonl ...  segments; the highest number is the active one,
+                        the rest are sealed once they pass SEGMENT_BYTES
+- seg-000001.idx.json   per sealed segment: product -> first / last time,
+                        the byte spans holding its records and its last state
+Reads for one product open only the sealed segments whose index says the
+product has records in the requested time range, seek straight to those
+spans, and scan just the (bounded) active segment.
+
+Compaction: once COMPACT_AFTER raw segments are sealed they are merged into
+one segment sorted by product and time (re-encoded as one keyframe plus
+deltas per product), so each product is a single span.
+Compacted segments are never merged again, which keeps compaction cost per
+tick constant.
+"""
+import json
+import os
+import re
+import threading
+from datetime import datetime, timedelta
+
+from review_store import parse_number
+
+LOG_DIR = os.environ.get("PRICE_LOG_DIR", "price_history")
+SEGMENT_BYTES = 1024 * 1024
+COMPACT_AFTER = 8
+INDEX_VERSION = 2
+_FIELDS = ("price", "text", "title", "m")
+
+_SEGMENT_RE = re.compile(r"^seg-(\d{6})\.jsonl$")
+
+
+def _now() -> str:
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _encode(record: dict) -> bytes:
+    return (json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def _scan(path: str):
+    """(offset, end, record) for every complete line of a segment."""
+    with open(path, "rb") as f:
+        offset = 0
+        for line in f:
+            end = offset + len(line)
+            if line.endswith(b"\n"):
+                try:
+                    yield offset, end, json.loads(line)
+                except ValueError:
+                    pass
+            offset = end
+
+
+# ---------- record encoding ----------
+def _state_of(rec: dict) -> dict:
+    """Full state from a keyframe (also the format of logs written before delta encoding)."""
+    return {field: rec.get(field) for field in _FIELDS}
+
+
+def _apply(state: dict, rec: dict):
+    """State after one record; None for a delta with nothing to apply it to."""
+    if "d" not in rec:
+        return _state_of(rec)
+    if state is None:
+        return None
+    delta = rec["d"]
+    state = dict(state)
+    if "dp" in delta:
+        state["price"] = round(state["price"] + delta["dp"], 2)
+    if "tt" in delta:
+        keep, suffix = delta["tt"]
+        state["title"] = state["title"][:keep] + suffix
+    for field in _FIELDS:
+        if field in delta:
+            state[field] = delta[field]
+    return state
+
+
+def _keyframe(t: str, product: str, state: dict) -> dict:
+    rec = {"t": t, "p": product, "price": state["price"]}
+    rec.update((field, state[field]) for field in ("text", "title", "m") if state[field] is not None)
+    return rec
+
+
+def _delta(t: str, product: str, old: dict, new: dict) -> dict:
+    delta = {}
+    if new["price"] != old["price"]:
+        if new["price"] is None or old["price"] is None:
+            delta["price"] = new["price"]
+        else:
+            delta["dp"] = round(new["price"] - old["price"], 2)
+    if new["text"] != old["text"]:
+        delta["text"] = new["text"]
+    if new["title"] != old["title"]:
+        before, after = old["title"] or "", new["title"]
+        keep = len(os.path.commonprefix([before, after or ""]))
+        if after is not None and old["title"] is not None and keep > 8:
+            delta["tt"] = [keep, after[keep:]]
+        else:
+            delta["title"] = after
+    if new["m"] != old["m"]:
+        delta["m"] = new["m"]
+    return {"t": t, "p": product, "d": delta}
+
+
+def _encode_changes(changes):
+    """(product, time, state) sorted by product and time -> keyframe + deltas per product, no repeats."""
+    last_product, last_state = None, None
+    for product, t, state in changes:
+        if product != last_product:
+            yield _encode(_keyframe(t, product, state))
+        elif state != last_state:
+            yield _encode(_delta(t, product, last_state, state))
+        last_product, last_state = product, state
+
+
+def _decode(path: str):
+    """(start, end, record, state) for every record of a segment, states rebuilt per product."""
+    states = {}
+    for start, end, rec in _scan(path):
+        state = _apply(states.get(rec["p"]), rec)
+        if state is not None:
+            states[rec["p"]] = state
+            yield start, end, rec, state
+
+
+def build_index(path: str, level: int = 0) -> dict:
+    """Index one segment: {"size", "level", "products": {product: {first, last, spans, state}}}."""
+    products = {}
+    for start, end, rec, state in _decode(path):
+        entry = products.get(rec["p"])
+        if entry is None:
+            products[rec["p"]] = {"first": rec["t"], "last": rec["t"], "spans": [[start, end]], "state": state}
+            continue
+        entry["first"] = min(entry["first"], rec["t"])
+        if rec["t"] >= entry["last"]:
+            entry["last"], entry["state"] = rec["t"], state
+        if entry["spans"][-1][1] == start:
+            entry["spans"][-1][1] = end
+        else:
+            entry["spans"].append([start, end])
+    return {"v": INDEX_VERSION, "size": os.path.getsize(path), "level": level, "products": products}
+
+
+class PriceLog:
+    def __init__(self, path: str = LOG_DIR, segment_bytes: int = SEGMENT_BYTES, compact_after: int = COMPACT_AFTER):
+        """
+        path:          log directory (created if missing)
+        segment_bytes: roll to a new segment after this many bytes
+        compact_after: merge sealed raw segments once there are this many
+        """
+        self.path = path
+        self.segment_bytes = segment_bytes
+        self.compact_after = compact_after
+        self._lock = threading.Lock()
+        self._indexes = {}
+        self._state = {}        # product -> last state written
+        self._written = set()   # products with a keyframe in the active segment
+        # since open: observations offered, records written, bytes written vs. full records
+        self.observations = 0
+        self.records = 0
+        self.bytes_written = 0
+        self.full_bytes = 0
+        os.makedirs(path, exist_ok=True)
+        numbers = self._segment_numbers()
+        self._active = numbers[-1] if numbers else 1
+        self._repair_tail()
+        self._load_state()
+
+    # ---------- files ----------
+    def _segment_numbers(self) -> list:
+        return sorted(int(m.group(1)) for m in map(_SEGMENT_RE.match, os.listdir(self.path)) if m)
+
+    def _segment_path(self, n: int) -> str:
+        return os.path.join(self.path, f"seg-{n:06d}.jsonl")
+
+    def _index_path(self, n: int) -> str:
+        return os.path.join(self.path, f"seg-{n:06d}.idx.json")
+
+    def _repair_tail(self):
+        """Cut a torn last line left by a crash mid-append."""
+        path = self._segment_path(self._active)
+        if not os.path.exists(path):
+            return
+        with open(path, "rb+") as f:
+            data = f.read()
+            if data and not data.endswith(b"\n"):
+                f.truncate(data.rfind(b"\n") + 1)
+
+    def _load_state(self):
+        for n in self._segment_numbers():
+            if n != self._active:
+                self._state.update((p, e["state"]) for p, e in self._index(n)["products"].items())
+        if os.path.exists(self._segment_path(self._active)):
+            for _, _, rec, state in _decode(self._segment_path(self._active)):
+                self._state[rec["p"]] = state
+                self._written.add(rec["p"])
+
+    def _write_index(self, n: int, index: dict):
+        tmp = self._index_path(n) + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(index, f, separators=(",", ":"))
+        os.replace(tmp, self._index_path(n))
+        self._indexes[n] = index
+
+    def _index(self, n: int) -> dict:
+        """Sealed segment index, rebuilt if missing or stale (e.g. crash during compaction)."""
+        index = self._indexes.get(n)
+        size = os.path.getsize(self._segment_path(n))
+        if index is None:
+            try:
+                with open(self._index_path(n), encoding="utf-8") as f:
+                    index = json.load(f)
+            except (OSError, ValueError):
+                index = None
+        if index is None or index["size"] != size or index.get("v") != INDEX_VERSION:
+            index = build_index(self._segment_path(n), level=index["level"] if index else 0)
+            self._write_index(n, index)
+        self._indexes[n] = index
+        return index
+
+    # ---------- writing ----------
+    def append_many(self, observations) -> int:
+        """
+        observations: dicts with product, price (text or number) and optional
+        title, marketplace, time (defaults to now); a missing title or
+        marketplace keeps the previous one. Only observations that differ
+        from the product's last state are written, in one append per call.
+        Returns the number of records written.
+        """
+        now = _now()
+        with self._lock:
+            lines = []
+            for obs in observations:
+                product, t = obs["product"], obs.get("time") or now
+                old = self._state.get(product)
+                price = obs.get("price")
+                new = {
+                    "price": parse_number(price),
+                    "text": str(price) if price is not None and not isinstance(price, (int, float)) else None,
+                    "title": obs.get("title") or (old or {}).get("title"),
+                    "m": obs.get("marketplace") or (old or {}).get("m"),
+                }
+                self.observations += 1
+                self.full_bytes += len(_encode(_keyframe(t, product, new)))
+                if new == old:
+                    continue
+                if old is None or product not in self._written:
+                    lines.append(_encode(_keyframe(t, product, new)))
+                    self._written.add(product)
+                else:
+                    lines.append(_encode(_delta(t, product, old, new)))
+                self._state[product] = new
+            if not lines:
+                return 0
+            self.records += len(lines)
+            self.bytes_written += sum(map(len, lines))
+            path = self._segment_path(self._active)
+            with open(path, "ab") as f:
+                f.write(b"".join(lines))
+                f.flush()
+                os.fsync(f.fileno())
+            if os.path.getsize(path) >= self.segment_bytes:
+                self._roll()
+        return len(lines)
+
+    def append(self, product: str, price, title: str = None, marketplace: str = None, time: str = None):
+        return self.append_many([{"product": product, "price": price, "title": title,
+                                  "marketplace": marketplace, "time": time}])
+
+    def _roll(self):
+        self._write_index(self._active, build_index(self._segment_path(self._active)))
+        self._active += 1
+        self._written = set()
+        raw = [n for n in self._segment_numbers() if n < self._active and self._index(n)["level"] == 0]
+        if len(raw) >= self.compact_after:
+            self._compact(raw)
+
+    # ---------- compaction ----------
+    def compact(self):
+        """Merge every sealed raw segment now (normally done automatically on roll)."""
+        with self._lock:
+            raw = [n for n in self._segment_numbers() if n < self._active and self._index(n)["level"] == 0]
+            if len(raw) > 1:
+                self._compact(raw)
+
+    def _compact(self, numbers):
+        states = {}
+        for n in numbers:
+            for _, _, rec, state in _decode(self._segment_path(n)):
+                states[(rec["p"], rec["t"])] = state
+        target = numbers[-1]
+        tmp = self._segment_path(target) + ".tmp"
+        with open(tmp, "wb") as f:
+            for line in _encode_changes((p, t, states[p, t]) for p, t in sorted(states)):
+                f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+        # Readers drop duplicate (product, time) pairs, so a crash between
+        # these steps leaves extra copies but never loses a record.
+        os.replace(tmp, self._segment_path(target))
+        self._write_index(target, build_index(self._segment_path(target), level=1))
+        for n in numbers[:-1]:
+            os.remove(self._segment_path(n))
+            if os.path.exists(self._index_path(n)):
+                os.remove(self._index_path(n))
+            self._indexes.pop(n, None)
+
+    # ---------- reading ----------
+    def _changes(self, product: str, since: str = None, until: str = None):
+        """(state before `since` or None, {time: state} of the changes in range)."""
+        found = {}
+        prior = (None, None)
+
+        def keep(t, state):
+            nonlocal prior
+            if since is not None and t < since:
+                if prior[0] is None or t > prior[0]:
+                    prior = (t, state)
+            elif until is None or t <= until:
+                found[t] = state
+
+        with self._lock:
+            for n in self._segment_numbers():
+                if n == self._active:
+                    continue
+                entry = self._index(n)["products"].get(product)
+                if entry is None or (until and entry["first"] > until):
+                    continue
+                if since and entry["last"] < since:
+                    keep(entry["last"], entry["state"])
+                    continue
+                state = None
+                with open(self._segment_path(n), "rb") as f:
+                    for start, end in entry["spans"]:
+                        f.seek(start)
+                        for line in f.read(end - start).splitlines():
+                            rec = json.loads(line)
+                            state = _apply(state, rec)
+                            if state is not None:
+                                keep(rec["t"], state)
+            if os.path.exists(self._segment_path(self._active)):
+                for _, _, rec, state in _decode(self._segment_path(self._active)):
+                    if rec["p"] == product:
+                        keep(rec["t"], state)
+        return prior[1], found
+
+    @staticmethod
+    def _row(t, state):
+        return {"time": t, "price": state["price"], "text": state["text"], "title": state["title"],
+                "marketplace": state["m"]}
+
+    def history(self, product: str, since: str = None, until: str = None) -> list:
+        """Change points of one product as {time, price, text, title, marketplace} dicts in time order."""
+        _, found = self._changes(product, since, until)
+        return [self._row(t, state) for t, state in sorted(found.items())]
+
+    def series(self, product: str, start: str = None, end: str = None, every_minutes: float = 10) -> list:
+        """
+        Full series rebuilt from the changes: the product's state every
+        `every_minutes` from start (default: first record) to end (default: now).
+        """
+        prior, found = self._changes(product, start, end)
+        changes = sorted(found.items())
+        if start is None:
+            if not changes:
+                return []
+            start = changes[0][0]
+        fmt = "%Y-%m-%d %H:%M:%S"
+        t = datetime.strptime(start, fmt) if len(start) > 10 else datetime.strptime(start, "%Y-%m-%d")
+        stop = datetime.strptime(end, fmt) if end and len(end) > 10 else \
+            datetime.strptime(end, "%Y-%m-%d") if end else datetime.now()
+        out, i, state = [], 0, prior
+        while t <= stop:
+            stamp = t.strftime(fmt)
+            while i < len(changes) and changes[i][0] <= stamp:
+                state = changes[i][1]
+                i += 1
+            if state is not None:
+                out.append(self._row(stamp, state))
+            t += timedelta(minutes=every_minutes)
+        return out
+
+    def products(self) -> set:
+        with self._lock:
+            return set(self._state)
+
+    def stats(self) -> dict:
+        with self._lock:
+            numbers = self._segment_numbers()
+            return {
+                "segments": len(numbers),
+                "compacted": sum(1 for n in numbers if n != self._active and self._index(n)["level"] > 0),
+                "bytes": sum(os.path.getsize(self._segment_path(n)) for n in numbers),
+                "active_bytes": os.path.getsize(self._segment_path(self._active))
+                if os.path.exists(self._segment_path(self._active)) else 0,
+                "observations": self.observations,
+                "records_written": self.records,
+                "compression": self.full_bytes / self.bytes_written if self.bytes_written else None,
+            }
@@ -0,0 +1,142 @@
+"""
+Fuzzy query resolver in front of the result cache.
+
+"boat airdopes 141", "Boat Airdopes-141" and "boAt airdopes 141 earbuds"
+are one product; the resolver maps a new query onto a query that was already
+analyzed (and so onto its cache key, usually "asin:...") when they are close
+enough, instead of starting another scrape.
+
+    resolver = QueryResolver(threshold=88)
+    resolver.add("boat airdopes 141", "asin:B0DGH5K43K")
+    resolver.resolve("boAt airdopes 141 earbuds")   # -> "asin:B0DGH5K43K"
+    resolver.resolve("boat airdopes 131")           # -> None (model number differs)
+
+Matching rules:
+- queries are tokenized into lower-case words and numbers ("airdopes-141",
+  "iphone15" -> airdopes 141, iphone 15)
+- numbers must match exactly: they are model numbers, sizes, storage
+- score: rapidfuzz token_set_ratio >= threshold, and at least MIN_COVERAGE of
+  the longer query's words shared, so "boat" alone does not match every boAt product
+
+Blocking index: queries are filed under (their numbers, the first PREFIX
+letters of each word). A lookup scores only the queries sharing its numbers
+and at least one word prefix, so it stays fast at 100k known queries.
+"""
+import re
+import threading
+from collections import OrderedDict, defaultdict
+
+from rapidfuzz import fuzz, process
+
+THRESHOLD = 88
+PREFIX = 3
+MIN_COVERAGE = 0.6
+MAX_QUERIES = 100000
+MAX_CANDIDATES = 200
+
+_TOKEN_RE = re.compile(r"[a-z]+|\d+(?:\.\d+)?")
+
+
+def tokenize(query: str) -> list:
+    return _TOKEN_RE.findall((query or "").casefold())
+
+
+def _signature(tokens):
+    """(sorted numbers, word prefixes) used for blocking."""
+    numbers = tuple(sorted(t for t in tokens if t[0].isdigit()))
+    prefixes = {t[:PREFIX] for t in tokens if not t[0].isdigit() and len(t) >= 2}
+    return numbers, prefixes
+
+
+class QueryResolver:
+    def __init__(self, threshold: float = THRESHOLD, max_queries: int = MAX_QUERIES):
+        """
+        threshold:     minimum rapidfuzz token_set_ratio (0-100) for a fuzzy match
+        max_queries:   known queries kept; the oldest are forgotten first
+        """
+        self.threshold = threshold
+        self.max_queries = max_queries
+        self._targets = OrderedDict()                         # normalized query -> target key
+        self._blocks = defaultdict(lambda: defaultdict(set))  # numbers -> prefix -> queries
+        self._lock = threading.Lock()
+        self.lookups = 0
+        self.exact_hits = 0
+        self.fuzzy_hits = 0
+
+    def add(self, query: str, target: str):
+        """Remember that `query` was answered by cache key `target`."""
+        tokens = tokenize(query)
+        if not tokens:
+            return
+        text = " ".join(tokens)
+        with self._lock:
+            if text in self._targets:
+                self._targets.move_to_end(text)
+                self._targets[text] = target
+                return
+            self._targets[text] = target
+            numbers, prefixes = _signature(tokens)
+            for prefix in prefixes:
+                self._blocks[numbers][prefix].add(text)
+            while len(self._targets) > self.max_queries:
+                self._forget(next(iter(self._targets)))
+
+    def _forget(self, text):
+        del self._targets[text]
+        numbers, prefixes = _signature(text.split())
+        block = self._blocks[numbers]
+        for prefix in prefixes:
+            block[prefix].discard(text)
+            if not block[prefix]:
+                del block[prefix]
+        if not block:
+            del self._blocks[numbers]
+
+    def _candidates(self, tokens) -> list:
+        numbers, prefixes = _signature(tokens)
+        block = self._blocks.get(numbers)
+        if not block:
+            return []
+        shared = defaultdict(int)
+        for prefix in prefixes:
+            for text in block.get(prefix, ()):
+                shared[text] += 1
+        # most shared prefixes first; the long tail of one-word overlaps can't pass coverage anyway
+        return sorted(shared, key=shared.get, reverse=True)[:MAX_CANDIDATES]
+
+    def resolve(self, query: str):
+        """Target key of the same or a close-enough known query, else None."""
+        tokens = tokenize(query)
+        text = " ".join(tokens)
+        with self._lock:
+            self.lookups += 1
+            if not tokens:
+                return None
+            target = self._targets.get(text)
+            if target is not None:
+                self.exact_hits += 1
+                return target
+            candidates = self._candidates(tokens)
+            words = set(tokens)
+            for match, score, _ in process.extract(text, candidates, scorer=fuzz.token_set_ratio,
+                                                   score_cutoff=self.threshold, limit=5):
+                other = set(match.split())
+                if len(words & other) / max(len(words), len(other)) >= MIN_COVERAGE:
+                    self.fuzzy_hits += 1
+                    return self._targets[match]
+            return None
+
+    def __len__(self):
+        return len(self._targets)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "queries": len(self._targets),
+                "blocks": sum(len(b) for b in self._blocks.values()),
+                "lookups": self.lookups,
+                "exact_hits": self.exact_hits,
+                "fuzzy_hits": self.fuzzy_hits,
+                # share of lookups answered only because of fuzzy matching
+                "added_hit_rate": round(self.fuzzy_hits / self.lookups, 3) if self.lookups else 0.0,
+            }
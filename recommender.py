@@ -0,0 +1,231 @@
+"""
+Similar-product recommendations from a precomputed neighbor table.
+
+Each analyzed product gets one vector made of three unit-length blocks:
+- review text: TF-IDF over the product's review texts, terms hashed into
+  TEXT_DIM buckets (1 + log tf, idf over the products seen so far)
+- sentiment mix: share of negative / neutral / positive reviews
+- rating histogram: share of 1..5 star ratings
+scaled by the square roots of TEXT_WEIGHT / SENTIMENT_WEIGHT / RATING_WEIGHT,
+so the cosine of two vectors is the weighted sum of the three block cosines.
+
+    recs = Recommender.load("recommendations.npz")     # or Recommender() for an empty table
+    recs.add("asin:B0DGH5K43K", texts, sentiments, histogram, name="boAt Airdopes 141", asin="B0DGH5K43K")
+    recs.recommendations("asin:B0DGH5K43K")             # top TOP_N similar products, best first
+    recs.save("recommendations.npz")
+
+The top TOP_N neighbors of every product are kept up to date as products
+are added: a new product is compared with every known one (one matrix-vector
+product), takes its own top TOP_N, and enters the lists of the products it
+now beats. Re-adding a product recomputes the lists it used to be in.
+recommendations() only reads the table. A product's text vector keeps the
+idf of when it was last added; re-analysis refreshes it.
+
+Snapshot: one .npz written to a temporary file and renamed, like the review
+search index.
+"""
+import json
+import math
+import os
+import threading
+import zlib
+from collections import Counter
+
+import numpy as np
+
+from review_search import tokenize
+
+TEXT_DIM = 2048
+TEXT_WEIGHT = 0.7
+SENTIMENT_WEIGHT = 0.15
+RATING_WEIGHT = 0.15
+TOP_N = 10
+RECS_PATH = os.environ.get("RECOMMENDER_PATH", "recommendations.npz")
+
+SENTIMENT_LABELS = ("negative", "neutral", "positive")
+_DIM = TEXT_DIM + len(SENTIMENT_LABELS) + 5
+
+
+def _unit(values):
+    norm = float(np.linalg.norm(values))
+    return values / norm if norm else values
+
+
+def _grow(matrix, rows):
+    if rows <= len(matrix):
+        return matrix
+    grown = np.zeros((max(rows, 2 * len(matrix), 64), matrix.shape[1]), dtype=matrix.dtype)
+    grown[:len(matrix)] = matrix
+    return grown
+
+
+def term_counts(texts) -> np.ndarray:
+    """1 + log(tf) per hashed term bucket over all of a product's review texts."""
+    counts = np.zeros(TEXT_DIM, dtype=np.float32)
+    for term, tf in Counter(t for text in texts for t in tokenize(text)).items():
+        counts[zlib.crc32(term.encode("utf-8")) % TEXT_DIM] += tf
+    nonzero = counts > 0
+    counts[nonzero] = 1 + np.log(counts[nonzero])
+    return counts
+
+
+class Recommender:
+    def __init__(self, top_n: int = TOP_N):
+        """top_n: neighbors kept (and served at most) per product"""
+        self.top_n = top_n
+        self._lock = threading.Lock()
+        self._rows = {}                                            # product id -> row
+        self._meta = []                                            # row -> {"id", "name", "asin", ...}
+        self._tf = np.zeros((0, TEXT_DIM), dtype=np.float16)       # row -> term_counts
+        self._vectors = np.zeros((0, _DIM), dtype=np.float32)      # row -> unit vector
+        self._df = np.zeros(TEXT_DIM, dtype=np.int32)              # products per term bucket
+        self._neighbors = []                                       # row -> [(score, row)], best first
+        self._listed_in = []                                       # row -> rows whose lists hold it
+        self.adds = 0
+        self.updates = 0
+
+    # ---------- building ----------
+    def _vector(self, tf, sentiments, histogram):
+        idf = np.log((1 + len(self._rows)) / (1 + self._df)).astype(np.float32) + 1
+        mix = Counter(label for label in (str(s or "").lower() for s in sentiments) if label in SENTIMENT_LABELS)
+        stars = np.array([float((histogram or {}).get(star, 0) or 0) for star in range(1, 6)], dtype=np.float32)
+        return np.concatenate([
+            _unit(tf * idf) * math.sqrt(TEXT_WEIGHT),
+            _unit(np.array([mix[s] for s in SENTIMENT_LABELS], dtype=np.float32)) * math.sqrt(SENTIMENT_WEIGHT),
+            _unit(stars) * math.sqrt(RATING_WEIGHT),
+        ])
+
+    def add(self, product_id: str, texts, sentiments, histogram, **meta):
+        """
+        Add or refresh a product and update the neighbor table.
+
+        texts:       its review texts
+        sentiments:  one label per review ("positive" / "neutral" / "negative", any case)
+        histogram:   {star: share or count} for stars 1..5
+        meta:        returned with the product in other products' recommendations
+                     (name, asin, averageRating, ...)
+        """
+        tf = term_counts(texts)
+        with self._lock:
+            row = self._rows.get(product_id)
+            if row is None:
+                row = len(self._rows)
+                self._rows[product_id] = row
+                self._meta.append(None)
+                self._neighbors.append([])
+                self._listed_in.append(set())
+                self._tf = _grow(self._tf, row + 1)
+                self._vectors = _grow(self._vectors, row + 1)
+                self.adds += 1
+            else:
+                self._df -= self._tf[row] > 0
+                self.updates += 1
+            self._meta[row] = {"id": product_id, **meta}
+            self._tf[row] = tf
+            self._df += tf > 0
+            self._vectors[row] = self._vector(tf, sentiments, histogram)
+
+            count = len(self._rows)
+            scores = self._vectors[:count] @ self._vectors[row]
+            scores[row] = -np.inf
+            self._set_neighbors(row, scores)
+
+            # the lists that held this product were ranked with its old vector
+            for other in list(self._listed_in[row]):
+                self._set_neighbors(other, self._scores_of(other))
+            # lists it now beats: still short, or above their last entry
+            floors = np.array([lst[-1][0] if len(lst) >= self.top_n else -np.inf
+                               for lst in self._neighbors], dtype=np.float32)
+            for other in np.flatnonzero(scores > floors):
+                other = int(other)
+                if row not in (r for _, r in self._neighbors[other]):
+                    self._insert(other, row, float(scores[other]))
+
+    def _scores_of(self, row):
+        scores = self._vectors[:len(self._rows)] @ self._vectors[row]
+        scores[row] = -np.inf
+        return scores
+
+    def _set_neighbors(self, row, scores):
+        for _, old in self._neighbors[row]:
+            self._listed_in[old].discard(row)
+        size = min(self.top_n, len(scores) - 1)
+        if size <= 0:
+            self._neighbors[row] = []
+            return
+        top = np.argpartition(-scores, size - 1)[:size]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        self._neighbors[row] = [(float(scores[i]), int(i)) for i in top]
+        for i in top:
+            self._listed_in[int(i)].add(row)
+
+    def _insert(self, row, other, score):
+        neighbors = self._neighbors[row]
+        at = next((i for i, (s, _) in enumerate(neighbors) if score > s), len(neighbors))
+        neighbors.insert(at, (score, other))
+        self._listed_in[other].add(row)
+        if len(neighbors) > self.top_n:
+            _, dropped = neighbors.pop()
+            self._listed_in[dropped].discard(row)
+
+    # ---------- serving ----------
+    def recommendations(self, product_id: str, n: int = None) -> list:
+        """Up to n (default top_n) most similar products, best first; [] for an unknown product."""
+        with self._lock:
+            row = self._rows.get(product_id)
+            if row is None:
+                return []
+            neighbors = self._neighbors[row][:n or self.top_n]
+            return [{**self._meta[other], "similarity": round(score, 4)} for score, other in neighbors]
+
+    def __contains__(self, product_id):
+        return product_id in self._rows
+
+    def __len__(self):
+        return len(self._rows)
+
+    # ---------- snapshot ----------
+    def save(self, path: str = RECS_PATH):
+        with self._lock:
+            count = len(self._rows)
+            neighbors = np.full((count, self.top_n), -1, dtype=np.int32)
+            scores = np.zeros((count, self.top_n), dtype=np.float32)
+            for row, lst in enumerate(self._neighbors):
+                for i, (score, other) in enumerate(lst):
+                    neighbors[row, i], scores[row, i] = other, score
+            meta = {"top_n": self.top_n, "products": self._meta}
+            tmp = path + ".tmp"
+            with open(tmp, "wb") as f:
+                np.savez(f, tf=self._tf[:count], vectors=self._vectors[:count], df=self._df,
+                         neighbors=neighbors, scores=scores,
+                         meta=np.frombuffer(json.dumps(meta).encode("utf-8"), dtype=np.uint8))
+            os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str = RECS_PATH) -> "Recommender":
+        """The snapshot at path, or an empty table if there is none yet."""
+        if not os.path.exists(path):
+            return cls()
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(data["meta"].tobytes().decode("utf-8"))
+            recs = cls(meta["top_n"])
+            recs._tf, recs._vectors, recs._df = data["tf"], data["vectors"], data["df"]
+            neighbors, scores = data["neighbors"], data["scores"]
+        recs._meta = meta["products"]
+        recs._rows = {m["id"]: row for row, m in enumerate(recs._meta)}
+        recs._listed_in = [set() for _ in recs._meta]
+        for row in range(len(recs._meta)):
+            recs._neighbors.append([(float(s), int(o)) for s, o in zip(scores[row], neighbors[row]) if o >= 0])
+            for _, other in recs._neighbors[row]:
+                recs._listed_in[other].add(row)
+        return recs
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "products": len(self._rows),
+                "top_n": self.top_n,
+                "adds": self.adds,
+                "updates": self.updates,
+                "memory_mb": round((self._tf.nbytes + self._vectors.nbytes) / 1e6, 1),
+            }
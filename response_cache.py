@@ -0,0 +1,315 @@
+"""
+On-disk HTTP response cache for the requests-based scrapers.
+
+Bodies are stored zlib-compressed under <cache dir>/<xx>/<key>.bin, with a
+SQLite index holding URL, page type, expiry, validators and last access.
+
+- Keys come from the normalized URL (tracking params, /ref= segments and
+  product slugs removed), so the same page reached via different links hits
+  the same entry.
+- Each page type (search / product / reviews) has its own TTL.
+- Expired entries with an ETag or Last-Modified are revalidated with a
+  conditional GET; a 304 refreshes the entry without downloading the body.
+- Total body size is bounded; least-recently-used entries are evicted.
+- Only pages that look complete are stored (page_is_complete: no captcha /
+  robot check, and review blocks, #productTitle or search results present
+  for those page types), so a blocked fetch is retried instead of being
+  served from the cache for a whole TTL. Pass validate= to override.
+
+    cache = ResponseCache(".http_cache")
+    r = cache.get(get_client(), url, headers=HEADERS)   # fresh hit -> no network
+    cache.stats()                                        # hits / misses / ...
+"""
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+DEFAULT_TTLS = {
+    "search": 60 * 60,
+    "product": 6 * 60 * 60,
+    "reviews": 3 * 60 * 60,
+    "other": 60 * 60,
+}
+
+# query params that never change page content
+TRACKING_PARAMS = {
+    "ref", "ref_", "qid", "sr", "crid", "sprefix", "th", "psc", "smid", "spla",
+    "dib", "dib_tag", "content-id", "_encoding", "linkcode", "tag", "ascsubtag",
+}
+TRACKING_PREFIXES = ("pd_rd_", "pf_rd_", "utm_")
+
+# robot-check / captcha interstitials are served with status 200
+BLOCKED_MARKERS = (b"/errors/validateCaptcha", b"Robot Check", b"api-services-support@amazon.com")
+CONTENT_MARKERS = {
+    "reviews": re.compile(rb"""data-hook=["']review["']|class=["'](?:[^"']*\s)?review(?:\s[^"']*)?["']"""),
+    "product": re.compile(rb"""id=["']productTitle["']"""),
+    "search": re.compile(rb"s-search-result"),
+}
+
+
+# ============ URL NORMALIZATION ============
+def page_type(url: str) -> str:
+    path = urlsplit(url).path
+    if "/product-reviews/" in path:
+        return "reviews"
+    if "/dp/" in path or "/gp/product/" in path:
+        return "product"
+    if path.rstrip("/") == "/s":
+        return "search"
+    return "other"
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form of a page URL, used as the cache key."""
+    parts = urlsplit(url.strip())
+    path = parts.path
+
+    # /Some-Product-Slug/dp/ASIN/ref=sr_1_1 -> /dp/ASIN
+    path = re.sub(r"/ref=[^/]*", "", path)
+    m = re.search(r"/(dp|gp/product|product-reviews)/([A-Za-z0-9]{10})", path)
+    if m:
+        path = f"/{m.group(1)}/{m.group(2).upper()}"
+    path = path.rstrip("/") or "/"
+
+    params = []
+    for k, v in parse_qsl(parts.query, keep_blank_values=False):
+        kl = k.lower()
+        if kl in TRACKING_PARAMS or kl.startswith(TRACKING_PREFIXES):
+            continue
+        if kl == "k":
+            v = " ".join(v.lower().split())
+        params.append((k, v))
+    # product pages carry nothing but tracking in the query string
+    if page_type(url) == "product":
+        params = []
+
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(sorted(params)), ""))
+
+
+def cache_key(url: str) -> str:
+    return hashlib.sha1(normalize_url(url).encode("utf-8")).hexdigest()
+
+
+def page_is_complete(url: str, content: bytes) -> bool:
+    """Worth caching: not a captcha page, and has the content its page type is fetched for."""
+    if any(marker in content for marker in BLOCKED_MARKERS):
+        return False
+    marker = CONTENT_MARKERS.get(page_type(url))
+    return marker is None or marker.search(content) is not None
+
+
+# ============ RESPONSE ============
+class CachedResponse:
+    """The subset of requests.Response the scrapers use, rebuilt from the cache."""
+    from_cache = True
+
+    def __init__(self, url, status_code, content, headers):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers
+        self.encoding = "utf-8"
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding, errors="replace")
+
+
+# ============ CACHE ============
+class ResponseCache:
+    def __init__(self, path: str = ".http_cache", max_bytes: int = 200 * 1024 * 1024, ttls: dict = None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        os.makedirs(path, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(path, "index.db"), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                page_type TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                status INTEGER NOT NULL,
+                headers TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                stored_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )""")
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_entries_access ON entries(last_access)")
+        self._db.commit()
+        self._total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.stores = 0
+        self.rejected = 0
+        self.evictions = 0
+
+    # ---------- files ----------
+    def _body_path(self, key):
+        return os.path.join(self.path, key[:2], key + ".bin")
+
+    def _read_body(self, key):
+        try:
+            with open(self._body_path(key), "rb") as f:
+                return zlib.decompress(f.read())
+        except (OSError, zlib.error):
+            return None
+
+    def _write_body(self, key, content):
+        data = zlib.compress(content, 6)
+        path = self._body_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        return len(data)
+
+    # ---------- index ----------
+    def _row(self, key):
+        return self._db.execute(
+            "SELECT url, status, headers, etag, last_modified, expires_at, size FROM entries WHERE key = ?",
+            (key,)).fetchone()
+
+    def _delete(self, key, size):
+        self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+        self._total -= size
+        try:
+            os.remove(self._body_path(key))
+        except OSError:
+            pass
+
+    def _evict(self):
+        if self._total <= self.max_bytes:
+            return
+        rows = self._db.execute("SELECT key, size FROM entries ORDER BY last_access ASC").fetchall()
+        for key, size in rows:
+            if self._total <= self.max_bytes:
+                break
+            self._delete(key, size)
+            self.evictions += 1
+
+    def store(self, url, response, validate=page_is_complete):
+        """Cache a 200 response body with its validators, if validate(url, body) accepts it."""
+        if response.status_code != 200:
+            return
+        if validate is not None and not validate(url, response.content):
+            with self._lock:
+                self.rejected += 1
+            return
+        key = cache_key(url)
+        now = time.time()
+        ptype = page_type(url)
+        headers = {k: v for k, v in response.headers.items()
+                   if k.lower() in ("content-type", "etag", "last-modified")}
+        with self._lock:
+            old = self._row(key)
+            size = self._write_body(key, response.content)
+            if old:
+                self._total -= old[6]
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, normalize_url(url), ptype, size, response.status_code, json.dumps(headers),
+                 response.headers.get("ETag"), response.headers.get("Last-Modified"),
+                 now, now + self.ttls[ptype], now))
+            self._total += size
+            self.stores += 1
+            self._evict()
+            self._db.commit()
+
+    # ---------- fetch ----------
+    def get(self, client, url, validate=page_is_complete, **kwargs):
+        """
+        GET through the cache. Fresh entries are returned without touching the
+        network; stale ones are revalidated when they carry validators.
+        validate(url, body) decides whether a fetched page may be stored.
+        """
+        key = cache_key(url)
+        now = time.time()
+        with self._lock:
+            row = self._row(key)
+            body = self._read_body(key) if row else None
+            if row and body is None:
+                # index row without a body file (deleted by hand / crash)
+                self._delete(key, row[6])
+                self._db.commit()
+                row = None
+
+        if row:
+            cached_url, status, headers, etag, last_modified, expires_at, _ = row
+            cached = CachedResponse(url, status, body, json.loads(headers))
+            if expires_at > now:
+                with self._lock:
+                    self.hits += 1
+                    self._db.execute("UPDATE entries SET last_access = ? WHERE key = ?", (now, key))
+                    self._db.commit()
+                return cached
+
+            if etag or last_modified:
+                conditional = dict(kwargs.pop("headers", None) or {})
+                if etag:
+                    conditional["If-None-Match"] = etag
+                if last_modified:
+                    conditional["If-Modified-Since"] = last_modified
+                r = client.get(url, headers=conditional, **kwargs)
+                if r.status_code == 304:
+                    with self._lock:
+                        self.revalidated += 1
+                        self._db.execute(
+                            "UPDATE entries SET expires_at = ?, last_access = ? WHERE key = ?",
+                            (now + self.ttls[page_type(url)], now, key))
+                        self._db.commit()
+                    return cached
+                with self._lock:
+                    self.misses += 1
+                self.store(url, r, validate)
+                r.from_cache = False
+                return r
+
+        with self._lock:
+            self.misses += 1
+        r = client.get(url, **kwargs)
+        self.store(url, r, validate)
+        r.from_cache = False
+        return r
+
+    # ---------- maintenance ----------
+    def stats(self) -> dict:
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            lookups = self.hits + self.misses + self.revalidated
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "revalidated": self.revalidated,
+                "hit_rate": (self.hits + self.revalidated) / lookups if lookups else 0.0,
+                "stores": self.stores,
+                "rejected": self.rejected,
+                "evictions": self.evictions,
+                "entries": entries,
+                "size_mb": self._total / (1024 * 1024),
+                "max_mb": self.max_bytes / (1024 * 1024),
+            }
+
+    def clear(self):
+        with self._lock:
+            for key, size in self._db.execute("SELECT key, size FROM entries").fetchall():
+                self._delete(key, size)
+            self._db.commit()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,157 @@
+"""
+Bounded in-process cache for analysis results.
+
+Replaces the API's ever-growing SEARCH_HISTORY_INDEX dict:
+
+- keys are normalized by the caller (amazon_nav.query_key) and a result can
+  be stored under its ASIN with the queries that resolved to it as aliases,
+  so "Boat Airdopes 141", "boat airdopes 141" and the product link share one entry
+- LRU eviction bounded by entry count and by estimated bytes (the size of
+  the entry's JSON encoding, which is what the API sends anyway)
+- entries are fresh for `ttl` seconds, then stale for `stale_ttl` more:
+  get() still returns a stale value (fresh=False) so the caller can serve it
+  at once and refresh in the background; after that the entry is gone
+
+    cache = ResultCache(max_entries=500, max_bytes=64 * 1024 * 1024, ttl=3600)
+    value, fresh = cache.get("q:boat airdopes 141")     # (None, None) on a miss
+    cache.put("asin:B0DGH5K43K", result, aliases=["q:boat airdopes 141"])
+    cache.stats()
+"""
+import json
+import threading
+import time
+from collections import OrderedDict
+
+MAX_ENTRIES = 500
+MAX_BYTES = 64 * 1024 * 1024
+TTL = 3600
+STALE_TTL = 24 * 3600
+ENTRY_OVERHEAD = 256     # rough per-entry bookkeeping (dict slots, timestamps, key)
+
+
+class _Entry:
+    __slots__ = ("value", "size", "stored", "aliases")
+
+    def __init__(self, value, size, stored):
+        self.value = value
+        self.size = size
+        self.stored = stored
+        self.aliases = set()
+
+
+def estimate_size(value) -> int:
+    try:
+        return len(json.dumps(value, default=str).encode("utf-8")) + ENTRY_OVERHEAD
+    except (TypeError, ValueError):
+        return ENTRY_OVERHEAD
+
+
+class ResultCache:
+    def __init__(self, max_entries: int = MAX_ENTRIES, max_bytes: int = MAX_BYTES,
+                 ttl: float = TTL, stale_ttl: float = STALE_TTL):
+        """
+        max_entries:   LRU bound on stored results (aliases don't count)
+        max_bytes:     LRU bound on the estimated size of stored results
+        ttl:           seconds an entry is served as fresh
+        stale_ttl:     further seconds it may be served stale while a refresh runs
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._entries = OrderedDict()    # key -> _Entry, least recently used first
+        self._aliases = {}               # alias key -> entry key
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _resolve(self, key):
+        return self._aliases.get(key, key)
+
+    def _drop(self, key):
+        entry = self._entries.pop(key)
+        self.bytes -= entry.size
+        for alias in entry.aliases:
+            if self._aliases.get(alias) == key:
+                del self._aliases[alias]
+
+    def get(self, key: str):
+        """(value, fresh) for a hit, (None, None) for a miss or an entry past its stale window."""
+        with self._lock:
+            real = self._resolve(key)
+            entry = self._entries.get(real)
+            if entry is None:
+                self.misses += 1
+                return None, None
+            age = time.time() - entry.stored
+            if age > self.ttl + self.stale_ttl:
+                self._drop(real)
+                self.expirations += 1
+                self.misses += 1
+                return None, None
+            self._entries.move_to_end(real)
+            fresh = age <= self.ttl
+            if fresh:
+                self.hits += 1
+            else:
+                self.stale_hits += 1
+            return entry.value, fresh
+
+    def put(self, key: str, value, aliases=()):
+        """Store value under key; aliases (other normalized keys) resolve to it."""
+        size = estimate_size(value)
+        with self._lock:
+            if key in self._aliases:
+                # key used to be an alias of another entry; it now has its own
+                del self._aliases[key]
+            old = self._entries.get(key)
+            entry = _Entry(value, size, time.time())
+            if old is not None:
+                entry.aliases = old.aliases
+                self._drop(key)
+                self._aliases.update((alias, key) for alias in entry.aliases)
+            for alias in aliases:
+                if alias == key:
+                    continue
+                if alias in self._entries:
+                    self._drop(alias)
+                self._aliases[alias] = key
+                entry.aliases.add(alias)
+            self._entries[key] = entry
+            self.bytes += size
+            while self._entries and (len(self._entries) > self.max_entries or self.bytes > self.max_bytes):
+                oldest = next(iter(self._entries))
+                if oldest == key and len(self._entries) == 1:
+                    break
+                self._drop(oldest)
+                self.evictions += 1
+
+    def invalidate(self, key: str):
+        with self._lock:
+            real = self._resolve(key)
+            if real in self._entries:
+                self._drop(real)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "aliases": len(self._aliases),
+                "bytes": self.bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.hits + self.stale_hits) / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
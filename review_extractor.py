@@ -0,0 +1,339 @@
+"""
+Shared Amazon review-page extractor.
+
+Turns a product / reviews page into typed records (Review, ReviewPage) so the
+scrapers stop carrying their own copy of the BeautifulSoup selector logic.
+
+Parsing runs on the fastest backend installed:
+    selectolax (lexbor) -> lxml (+ cssselect) -> BeautifulSoup(html.parser)
+BeautifulSoup is only used when neither fast backend is available, or when a
+fast backend fails on a page. Force one with REVIEW_PARSER=selectolax|lxml|bs4
+or the backend= argument.
+
+Text is extracted the way bs4's get_text(separator, strip=True) does it, so
+every backend produces identical records.
+
+Which elements hold a review and its fields is a Selectors profile. The
+default reads every layout the scrapers know; a scraper that must keep its
+own historical output passes its own profile:
+
+    extract_reviews(html, selectors=Selectors(blocks=("div[data-hook='review']",)))
+"""
+import os
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+try:
+    import lxml.html
+    import lxml.etree
+    from lxml.cssselect import CSSSelector
+except ImportError:
+    CSSSelector = None
+
+from bs4 import BeautifulSoup
+
+
+BLOCK_SELECTOR = "div[data-hook='review'], div[data-hook='review-collapsed']"
+ALT_BLOCK_SELECTOR = "div.review"
+STAR_SELECTOR = "[data-hook='review-star-rating'], [data-hook='cmps-review-star-rating']"
+BODY_SELECTORS = ("span[data-hook='review-body'] span", "span.review-text")
+TITLE_SELECTORS = ("a[data-hook='review-title'] span", ".review-title span")
+DATE_SELECTORS = ("span[data-hook='review-date']", "span.review-date")
+
+_SEP = "\x1f"
+
+
+# ============ SELECTORS ============
+@dataclass(frozen=True)
+class Selectors:
+    """
+    CSS selectors per review field. Each is a tuple tried in order and the
+    first selector that matches wins (blocks: the first that matches any block).
+
+    fallback_on_empty: with block_text_fallback, also use the block's text when
+    the body element exists but is empty (not only when it is missing)
+    """
+    blocks: tuple = (BLOCK_SELECTOR, ALT_BLOCK_SELECTOR)
+    star: tuple = (STAR_SELECTOR, "span.a-icon-alt")
+    body: tuple = BODY_SELECTORS
+    title: tuple = TITLE_SELECTORS
+    date: tuple = DATE_SELECTORS
+    fallback_on_empty: bool = False
+
+
+DEFAULT_SELECTORS = Selectors()
+
+
+# ============ RECORDS ============
+@dataclass
+class Review:
+    review_id: Optional[str]
+    rating: Optional[int]
+    title: str
+    text: str
+    date_text: str
+
+
+@dataclass
+class ReviewPage:
+    # None when the page has no review blocks at all (end of pagination / captcha)
+    reviews: Optional[List[Review]]
+    histogram: Dict[int, int] = field(default_factory=dict)
+    product_title: Optional[str] = None
+    global_rating: Optional[float] = None
+    global_count: Optional[int] = None
+
+
+# ============ BACKENDS ============
+def _join(parts, separator):
+    return separator.join(p for p in (s.strip() for s in parts) if p)
+
+
+class _SelectolaxBackend:
+    name = "selectolax"
+
+    def parse(self, html):
+        tree = LexborHTMLParser(html)
+        tree.strip_tags(["script", "style", "noscript"])
+        return tree.root
+
+    def select(self, node, css):
+        found = node.css(css)
+        if "," in css:
+            # lexbor lists an element once per selector group it matches; bs4 / lxml once
+            seen = set()
+            found = [n for n in found if not (n.mem_id in seen or seen.add(n.mem_id))]
+        return found
+
+    def select_one(self, node, css):
+        return node.css_first(css)
+
+    def text(self, node, separator=""):
+        return _join(node.text(deep=True, separator=_SEP, strip=False).split(_SEP), separator)
+
+    def attr(self, node, name):
+        return node.attributes.get(name)
+
+
+@lru_cache(maxsize=None)
+def _compiled(css):
+    return CSSSelector(css, translator="html")
+
+
+class _LxmlBackend:
+    name = "lxml"
+
+    def parse(self, html):
+        root = lxml.html.document_fromstring(html)
+        lxml.etree.strip_elements(root, "script", "style", "noscript", with_tail=False)
+        return root
+
+    def select(self, node, css):
+        return _compiled(css)(node)
+
+    def select_one(self, node, css):
+        found = _compiled(css)(node)
+        return found[0] if found else None
+
+    def text(self, node, separator=""):
+        return _join(node.itertext(), separator)
+
+    def attr(self, node, name):
+        return node.get(name)
+
+
+class _SoupBackend:
+    name = "bs4"
+
+    def parse(self, html):
+        return BeautifulSoup(html, "html.parser")
+
+    def select(self, node, css):
+        return node.select(css)
+
+    def select_one(self, node, css):
+        return node.select_one(css)
+
+    def text(self, node, separator=""):
+        return node.get_text(separator, strip=True)
+
+    def attr(self, node, name):
+        value = node.get(name)
+        # bs4 returns multi-valued attributes (class) as lists
+        return " ".join(value) if isinstance(value, list) else value
+
+
+BACKENDS = {}
+if LexborHTMLParser is not None:
+    BACKENDS["selectolax"] = _SelectolaxBackend()
+if CSSSelector is not None:
+    BACKENDS["lxml"] = _LxmlBackend()
+BACKENDS["bs4"] = _SoupBackend()
+
+
+def get_backend(name=None):
+    """Resolve a backend by name; 'auto' / None picks the fastest one installed."""
+    name = name or os.environ.get("REVIEW_PARSER", "auto")
+    if name == "auto":
+        return next(iter(BACKENDS.values()))
+    if name not in BACKENDS:
+        raise ValueError(f"Parser backend '{name}' is not installed (available: {', '.join(BACKENDS)})")
+    return BACKENDS[name]
+
+
+# ============ FIELD HELPERS ============
+def _first(be, node, selectors):
+    for css in selectors:
+        found = be.select_one(node, css)
+        if found is not None:
+            return found
+    return None
+
+
+def _first_int(text, pattern=r"(\d+(?:\.\d+)?)"):
+    m = re.search(pattern, text or "")
+    return int(float(m.group(1))) if m else None
+
+
+def _review_id(be, block):
+    rid = be.attr(block, "id")
+    if rid and rid.startswith("customer_review-"):
+        rid = rid[len("customer_review-"):]
+    return rid or None
+
+
+def _parse_review(be, block, separator, block_text_fallback, selectors):
+    star = _first(be, block, selectors.star)
+    rating = _first_int(be.text(star, " ")) if star is not None else None
+
+    body = _first(be, block, selectors.body)
+    text = be.text(body, separator) if body is not None else ""
+    if block_text_fallback and (body is None or (selectors.fallback_on_empty and not text)):
+        text = be.text(block, separator)
+
+    title = _first(be, block, selectors.title)
+    date = _first(be, block, selectors.date)
+
+    return Review(
+        review_id=_review_id(be, block),
+        rating=rating,
+        title=be.text(title) if title is not None else "",
+        text=text,
+        date_text=be.text(date) if date is not None else "",
+    )
+
+
+def _parse_histogram(be, root):
+    histogram = {}
+
+    # --- Method 1: New Amazon 2024-2025 Layout ---
+    for bar in be.select(root, "div[data-hook='histogram-bar']"):
+        star_label = be.select_one(bar, "span.a-size-base")
+        pct_label = be.select_one(bar, "span.a-size-base.a-text-right")
+        if star_label is not None and pct_label is not None:
+            m = re.search(r"(\d+)", be.text(star_label))
+            pct = be.text(pct_label).replace("%", "").strip()
+            if m and pct.isdigit():
+                histogram[int(m.group(1))] = int(pct)
+
+    # --- Method 2: Old Histogram Table ---
+    if not histogram:
+        for row in be.select(root, "table#histogramTable tr"):
+            label = be.select_one(row, "a")
+            if label is None:
+                label = be.select_one(row, "span")
+            if label is None:
+                continue
+            m = re.search(r"(\d)\s*star", be.text(label, " "))
+            if not m:
+                continue
+            pct_td = be.select_one(row, "td.a-text-right")
+            if pct_td is not None:
+                pct = be.text(pct_td).replace("%", "").strip()
+                if pct.isdigit():
+                    histogram[int(m.group(1))] = int(pct)
+
+    # --- Method 3: Fallback Compact Style ---
+    if not histogram:
+        labels = be.select(root, "span[data-hook='histogram-bar-label']")
+        percents = be.select(root, "span[data-hook='histogram-bar-percentage']")
+        if labels and len(labels) == len(percents):
+            for l, p in zip(labels, percents):
+                m = re.search(r"(\d+)", be.text(l))
+                pct = be.text(p).replace("%", "")
+                if m and pct.isdigit():
+                    histogram[int(m.group(1))] = int(pct)
+
+    return histogram
+
+
+def _parse(be, html, separator, block_text_fallback, selectors):
+    root = be.parse(html)
+
+    blocks = None
+    for css in selectors.blocks:
+        blocks = be.select(root, css)
+        if blocks:
+            break
+    reviews = [_parse_review(be, b, separator, block_text_fallback, selectors) for b in blocks] if blocks else None
+
+    page = ReviewPage(reviews=reviews, histogram=_parse_histogram(be, root))
+
+    title = be.select_one(root, "#productTitle")
+    if title is not None:
+        page.product_title = be.text(title)
+
+    rating = be.select_one(root, "span[data-hook='rating-out-of-text']")
+    if rating is not None:
+        m = re.search(r"\d+(?:\.\d+)?", be.text(rating, " "))
+        if m:
+            page.global_rating = float(m.group())
+
+    count = be.select_one(root, "#acrCustomerReviewText")
+    if count is not None:
+        digits = re.sub(r"[^\d]", "", be.text(count))
+        if digits:
+            page.global_count = int(digits)
+
+    return page
+
+
+# ============ PUBLIC API ============
+def extract_page(html, separator: str = "", block_text_fallback: bool = False,
+                 backend: Optional[str] = None, selectors: Selectors = DEFAULT_SELECTORS) -> ReviewPage:
+    """
+    Parse a product or reviews page in one pass.
+
+    separator:           joins text nodes inside a review body (bs4 get_text semantics)
+    block_text_fallback: use the whole block's text when the body span is missing
+    selectors:           which elements are review blocks and fields (see Selectors)
+    """
+    be = get_backend(backend)
+    if be.name != "bs4" and isinstance(html, bytes):
+        html = html.decode("utf-8", errors="replace")
+    try:
+        return _parse(be, html, separator, block_text_fallback, selectors)
+    except Exception:
+        if be.name == "bs4":
+            raise
+        # malformed page or selector the fast backend chokes on
+        return _parse(BACKENDS["bs4"], html, separator, block_text_fallback, selectors)
+
+
+def extract_reviews(html, separator: str = "", block_text_fallback: bool = False,
+                    backend: Optional[str] = None,
+                    selectors: Selectors = DEFAULT_SELECTORS) -> Optional[List[Review]]:
+    """Review records in page order, or None when the page has no review blocks."""
+    return extract_page(html, separator, block_text_fallback, backend, selectors).reviews
+
+
+def extract_histogram(html, backend: Optional[str] = None) -> Dict[int, int]:
+    """{star: percent} from whichever histogram layout the page uses."""
+    return extract_page(html, backend=backend).histogram
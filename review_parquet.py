@@ -0,0 +1,177 @@
+"""
+Columnar (Parquet) review datasets.
+
+Reviews are written as a Hive-partitioned Parquet dataset, one directory per
+product and month:
+
+    reviews_parquet/asin=B0DGH5K43K/month=2024-03/part-<run>-0.parquet
+
+with compact, typed columns: ratings as int8, VADER / TextBlob scores as
+float32, dates as date32 and the sentiment label dictionary-encoded (a
+pandas categorical on read). Reloading for a dashboard then reads only the
+columns and partitions it asks for, with no text re-parsing or dtype
+inference:
+
+    df = read_reviews("reviews_parquet", columns=["rating", "sentiment"], asin="B0DGH5K43K")
+
+Writers: write_reviews() for a list of records, ParquetSink for the
+review_stream pipeline (buffers rows into large row groups).
+"""
+import os
+import shutil
+import uuid
+from datetime import date
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from review_store import parse_review_date
+
+DATASET_DIR = "reviews_parquet"
+ROW_GROUP_ROWS = 50000
+
+SCHEMA = pa.schema([
+    ("review_id", pa.string()),
+    ("rating", pa.int8()),
+    ("star", pa.int8()),
+    ("title", pa.string()),
+    ("text", pa.string()),
+    ("date", pa.date32()),
+    ("neg", pa.float32()),
+    ("neu", pa.float32()),
+    ("pos", pa.float32()),
+    ("compound", pa.float32()),
+    ("polarity", pa.float32()),
+    ("sentiment", pa.dictionary(pa.int8(), pa.string())),
+    ("asin", pa.string()),
+    ("month", pa.string()),
+])
+PARTITIONING = ds.partitioning(pa.schema([("asin", pa.string()), ("month", pa.string())]), flavor="hive")
+_INT_COLUMNS = {"rating", "star"}
+_FLOAT_COLUMNS = {"neg", "neu", "pos", "compound", "polarity"}
+
+
+def _field(record, name):
+    if isinstance(record, dict):
+        return record.get(name)
+    return getattr(record, name, None)
+
+
+def _as_date(value):
+    if isinstance(value, date) or value is None:
+        return value
+    iso = parse_review_date(str(value))
+    return date.fromisoformat(iso) if iso else None
+
+
+def to_table(reviews, asin: str = None) -> pa.Table:
+    """Arrow table in SCHEMA from Review records or dicts; asin fills records without one."""
+    columns = {name: [] for name in SCHEMA.names}
+    for r in reviews:
+        day = _as_date(_field(r, "date") or _field(r, "date_text"))
+        for name in SCHEMA.names:
+            if name == "date":
+                value = day
+            elif name == "month":
+                value = day.strftime("%Y-%m") if day else "unknown"
+            elif name == "asin":
+                value = _field(r, "asin") or asin or "unknown"
+            else:
+                value = _field(r, name)
+                if value is not None and name in _INT_COLUMNS:
+                    value = int(value)
+                elif value is not None and name in _FLOAT_COLUMNS:
+                    value = float(value)
+                elif value is not None and name == "sentiment":
+                    value = str(value).lower()
+            columns[name].append(value)
+    return pa.Table.from_pydict(columns, schema=SCHEMA)
+
+
+def write_table(table: pa.Table, root: str = DATASET_DIR):
+    """Append a table to the dataset (new files per partition, existing ones untouched)."""
+    if table.num_rows:
+        # pyarrow refuses more than 1024 partitions per write by default; many products x months exceed it
+        partitions = table.group_by(["asin", "month"]).aggregate([]).num_rows
+        pq.write_to_dataset(
+            table, root, partitioning=PARTITIONING, existing_data_behavior="overwrite_or_ignore",
+            basename_template=f"part-{uuid.uuid4().hex[:12]}-{{i}}.parquet",
+            row_group_size=ROW_GROUP_ROWS, max_partitions=max(partitions, 1024))
+
+
+def write_reviews(reviews, asin: str = None, root: str = DATASET_DIR) -> int:
+    table = to_table(reviews, asin)
+    write_table(table, root)
+    return table.num_rows
+
+
+def drop_partition(root: str, asin: str):
+    """Delete every month of one product (to rewrite it as a fresh snapshot)."""
+    shutil.rmtree(os.path.join(root, f"asin={asin}"), ignore_errors=True)
+
+
+def _filter(asin=None, months=None, min_rating=None):
+    expr = None
+    for clause in (
+        (ds.field("asin") == asin) if asin else None,
+        ds.field("month").isin(list(months)) if months else None,
+        (ds.field("rating") >= min_rating) if min_rating is not None else None,
+    ):
+        if clause is not None:
+            expr = clause if expr is None else expr & clause
+    return expr
+
+
+def read_table(root: str = DATASET_DIR, columns=None, asin: str = None, months=None, min_rating: int = None):
+    """
+    Load only `columns` (default all) for the matching partitions. asin / months
+    prune whole directories; min_rating is pushed down to the row groups.
+    """
+    if not os.path.isdir(root):
+        return SCHEMA.empty_table().select(list(columns) if columns else SCHEMA.names)
+    dataset = ds.dataset(root, format="parquet", partitioning=PARTITIONING, schema=SCHEMA)
+    return dataset.to_table(columns=list(columns) if columns else None,
+                            filter=_filter(asin, months, min_rating))
+
+
+def read_reviews(root: str = DATASET_DIR, columns=None, asin: str = None, months=None, min_rating: int = None):
+    """read_table as a pandas DataFrame (sentiment comes back categorical)."""
+    return read_table(root, columns, asin, months, min_rating).to_pandas()
+
+
+def iter_column(root: str, column: str, asin: str = None, batch_rows: int = 10000):
+    """Stream one column's values batch by batch (e.g. texts for a TF-IDF pass)."""
+    if not os.path.isdir(root):
+        return
+    dataset = ds.dataset(root, format="parquet", partitioning=PARTITIONING, schema=SCHEMA)
+    for batch in dataset.to_batches(columns=[column], filter=_filter(asin), batch_size=batch_rows):
+        yield from batch.column(0).to_pylist()
+
+
+class ParquetSink:
+    """review_stream sink: buffers batches and appends them to the dataset ROW_GROUP_ROWS at a time."""
+
+    def __init__(self, root: str = DATASET_DIR, asin: str = None, buffer_rows: int = ROW_GROUP_ROWS):
+        self.root = root
+        self.asin = asin
+        self.buffer_rows = buffer_rows
+        self.rows = 0
+        self._pending = []
+        self._pending_rows = 0
+
+    def write(self, batch):
+        self._pending.append(to_table(batch, self.asin))
+        self._pending_rows += len(batch)
+        self.rows += len(batch)
+        if self._pending_rows >= self.buffer_rows:
+            self.flush()
+
+    def flush(self):
+        if self._pending:
+            write_table(pa.concat_tables(self._pending), self.root)
+            self._pending = []
+            self._pending_rows = 0
+
+    def close(self):
+        self.flush()
@@ -0,0 +1,566 @@
+"""
+In-process BM25 full-text search over stored review texts.
+
+    index = ReviewIndex.load("review_index.npz")   # or ReviewIndex() for an empty one
+    index.sync(get_review_store())                 # index reviews stored since the last sync
+    index.search("battery drains fast", k=10, max_rating=2, sentiment="negative")
+    index.save("review_index.npz")
+
+Layout (numpy, compact enough for a few million reviews in memory):
+- per review ("doc"): store row id, token count, rating, sentiment code, ASIN code
+- per term: a posting list of (doc, term frequency, BM25 impact). Postings
+  live in one CSR block (offsets / docs / tfs / impacts arrays) plus a small
+  per-term tail that incremental adds append to; the tail is merged into the
+  block once it passes MERGE_POSTINGS and on save()
+- impact = the BM25 term-frequency / length part, tf * (k1 + 1) / (tf + k1 *
+  (1 - b + b * len / avg_len)), precomputed (float16) at merge time, so a
+  query only multiplies by idf; tail postings are scored on the fly
+- long lists (common words) also keep an impact-ordered head: the top
+  1/HEAD_FRACTION of their postings by impact. Queries on them run a
+  threshold algorithm over the heads and usually stop after a few thousand
+  postings instead of scoring hundreds of thousands
+- lists in at least 1/DENSE_FRACTION of all reviews also keep a dense
+  per-review impact row (float16, 0 where the term is absent): looking such
+  a term up for a set of candidates is a gather instead of a binary search
+  or a scatter over its postings, for 2 bytes per review
+- otherwise (short lists only, an ASIN filter, more than MAX_HEAD_TERMS
+  long lists, or heads too shallow for the filters) a query scores every
+  posting of its terms, applies the rating / sentiment / ASIN filters, sums
+  per doc in a reusable dense buffer and takes the top k with argpartition -
+  no per-document Python work either way. The k-th best score from the heads
+  prunes this path MaxScore-style: terms whose summed max impacts can't
+  reach it are only looked up for the surviving candidates. With more than
+  MAX_HEAD_TERMS long lists, heads rounds run until it leaves one term to scan
+
+Docs are added in store row-id order, so sync() only asks the store for
+rows after the last one indexed. Sentiment labels are taken as stored when a
+review is indexed (VADER preferred); sync() then replays the store's
+sentiment log, so reviews scored or rescored after they were indexed get
+their current label.
+
+Snapshot: one .npz (arrays + vocabulary + metadata), written to a temporary
+file and renamed, so a crash mid-save keeps the previous snapshot.
+"""
+import json
+import math
+import os
+import re
+import threading
+from array import array
+from collections import Counter
+
+import numpy as np
+
+K1 = 1.2
+B = 0.75
+MERGE_POSTINGS = 500_000
+LONG_POSTINGS = 20000    # lists at least this long get an impact-ordered head
+HEAD_FRACTION = 8        # ... holding the top 1/HEAD_FRACTION of their postings by impact
+DENSE_FRACTION = 16      # lists in at least 1/DENSE_FRACTION of all reviews get a per-review impact row
+MAX_HEAD_TERMS = 2       # queries with more long lists than this only use the heads for a MaxScore bound
+INDEX_PATH = os.environ.get("REVIEW_INDEX_PATH", "review_index.npz")
+
+SENTIMENTS = {"negative": 0, "neutral": 1, "positive": 2}
+_SENTIMENT_NAMES = {v: k for k, v in SENTIMENTS.items()}
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset("""
+a an and are as at be but by for from has have i if in is it its of on or so that the their them
+they this to was were will with my me we you your our it's its im i've very just also too
+""".split())
+
+
+def tokenize(text: str) -> list:
+    return [t for t in _TOKEN_RE.findall((text or "").lower()) if len(t) > 1 and t not in STOPWORDS]
+
+
+def _distinct(docs):
+    """Sorted distinct doc ids (np.unique, but sorting beats its hashing for doc ids)."""
+    docs = np.sort(docs)
+    keep = np.empty(len(docs), dtype=bool)
+    keep[:1] = True
+    np.not_equal(docs[1:], docs[:-1], out=keep[1:])
+    return docs[keep]
+
+
+class _Column:
+    """Growable numpy column (amortized appends, zero-copy reads)."""
+
+    def __init__(self, dtype, data=None):
+        self.data = np.empty(1024, dtype=dtype) if data is None else np.asarray(data, dtype=dtype)
+        self.size = 0 if data is None else len(data)
+
+    def extend(self, values):
+        values = np.asarray(values, dtype=self.data.dtype)
+        need = self.size + len(values)
+        if need > len(self.data):
+            grown = np.empty(max(need, 2 * len(self.data)), dtype=self.data.dtype)
+            grown[:self.size] = self.data[:self.size]
+            self.data = grown
+        self.data[self.size:need] = values
+        self.size = need
+
+    @property
+    def view(self):
+        return self.data[:self.size]
+
+
+class ReviewIndex:
+    def __init__(self, k1: float = K1, b: float = B):
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.RLock()
+        self._vocab = {}                               # term -> term id
+        self._offsets = np.zeros(1, dtype=np.int64)    # CSR block: term id -> [start, end)
+        self._docs = np.empty(0, dtype=np.uint32)
+        self._tfs = np.empty(0, dtype=np.uint16)
+        self._impacts = np.empty(0, dtype=np.float16)
+        self._heads = {}                               # term id -> (docs, impacts) by impact, long lists
+        self._dense = {}                               # term id -> per-doc block impact (0 if absent), dense lists
+        self._max_impacts = np.zeros(0, dtype=np.float32)   # term id -> max impact in the block
+        self._tail = {}                                # term id -> (array of docs, array of tfs)
+        self._tail_postings = 0
+        self._scratch = np.zeros(0, dtype=np.float32)   # per-doc score accumulator for queries
+        self._row_ids = _Column(np.int64)
+        self._lengths = _Column(np.uint16)
+        self._ratings = _Column(np.int8)
+        self._sentiment = _Column(np.int8)
+        self._asin_codes = _Column(np.int32)
+        self._asins = []
+        self._asin_ids = {}
+        self.total_length = 0
+        self.last_row_id = 0
+        self.last_label_seq = 0
+
+    # ---------- building ----------
+    def add(self, rows) -> int:
+        """rows: (row_id, asin, rating, text, sentiment label) in increasing row_id order."""
+        row_ids, lengths, ratings, sentiments, asins = [], [], [], [], []
+        with self._lock:
+            doc = self._row_ids.size
+            for row_id, asin, rating, text, label in rows:
+                if row_id <= self.last_row_id:
+                    continue
+                counts = Counter(tokenize(text))
+                for term, tf in counts.items():
+                    tid = self._vocab.setdefault(term, len(self._vocab))
+                    tail = self._tail.get(tid)
+                    if tail is None:
+                        tail = self._tail[tid] = (array("I"), array("H"))
+                    tail[0].append(doc)
+                    tail[1].append(min(tf, 65535))
+                length = sum(counts.values())
+                self._tail_postings += len(counts)
+                self.total_length += length
+                code = self._asin_ids.get(asin)
+                if code is None:
+                    code = self._asin_ids[asin] = len(self._asins)
+                    self._asins.append(asin)
+                row_ids.append(row_id)
+                lengths.append(min(length, 65535))
+                ratings.append(int(rating) if rating is not None else 0)
+                sentiments.append(SENTIMENTS.get(str(label).lower(), -1) if label else -1)
+                asins.append(code)
+                self.last_row_id = row_id
+                doc += 1
+            for column, values in ((self._row_ids, row_ids), (self._lengths, lengths), (self._ratings, ratings),
+                                   (self._sentiment, sentiments), (self._asin_codes, asins)):
+                column.extend(values)
+            if self._tail_postings >= MERGE_POSTINGS:
+                self._merge()
+        return len(row_ids)
+
+    def set_sentiment(self, rows) -> int:
+        """rows: (row_id, label) for indexed reviews; row ids not indexed are skipped."""
+        rows = [(row_id, label) for row_id, label in rows if row_id is not None]
+        with self._lock:
+            if not rows or not self._row_ids.size:
+                return 0
+            row_ids = np.asarray([r[0] for r in rows], dtype=np.int64)
+            positions = np.minimum(np.searchsorted(self._row_ids.view, row_ids), self._row_ids.size - 1)
+            indexed = self._row_ids.view[positions] == row_ids
+            codes = np.asarray([SENTIMENTS.get(str(label).lower(), -1) if label else -1 for _, label in rows],
+                               dtype=np.int8)
+            self._sentiment.data[positions[indexed]] = codes[indexed]
+            return int(indexed.sum())
+
+    def sync(self, store, batch_rows: int = 20000) -> int:
+        """
+        Index every review the store has after the last indexed row, then
+        refresh the labels of indexed reviews scored since the last sync.
+        Returns the number of reviews added.
+        """
+        added = 0
+        while True:
+            rows = store.reviews_after(self.last_row_id, batch_rows)
+            if not rows:
+                break
+            added += self.add(rows)
+        while True:
+            updates = store.sentiment_updates(self.last_label_seq, batch_rows)
+            if not updates:
+                return added
+            self.set_sentiment((row_id, label) for _, row_id, label in updates)
+            self.last_label_seq = updates[-1][0]
+
+    def _merge(self):
+        """Fold the per-term tails into the CSR block."""
+        terms = len(self._vocab)
+        base_counts = np.zeros(terms, dtype=np.int64)
+        base_counts[:len(self._offsets) - 1] = np.diff(self._offsets)
+        tail_counts = np.zeros(terms, dtype=np.int64)
+        for tid, (docs, _) in self._tail.items():
+            tail_counts[tid] = len(docs)
+        offsets = np.zeros(terms + 1, dtype=np.int64)
+        np.cumsum(base_counts + tail_counts, out=offsets[1:])
+        docs = np.empty(offsets[-1], dtype=np.uint32)
+        tfs = np.empty(offsets[-1], dtype=np.uint16)
+
+        if len(self._docs):
+            base_terms = np.repeat(np.arange(len(self._offsets) - 1), np.diff(self._offsets))
+            dest = offsets[base_terms] + (np.arange(len(self._docs)) - self._offsets[base_terms])
+            docs[dest] = self._docs
+            tfs[dest] = self._tfs
+        for tid, (tail_docs, tail_tfs) in self._tail.items():
+            start = offsets[tid] + base_counts[tid]
+            docs[start:start + len(tail_docs)] = np.frombuffer(tail_docs, dtype=np.uint32)
+            tfs[start:start + len(tail_tfs)] = np.frombuffer(tail_tfs, dtype=np.uint16)
+
+        self._offsets, self._docs, self._tfs = offsets, docs, tfs
+        self._impacts = self._impact(docs, tfs).astype(np.float16)
+        self._tail = {}
+        self._tail_postings = 0
+        self._build_heads()
+
+    def _build_heads(self):
+        self._heads, self._dense = {}, {}
+        counts = np.diff(self._offsets)
+        # per-term max impact in the block, the MaxScore bound of _search_all
+        self._max_impacts = np.zeros(len(counts), dtype=np.float32)
+        nonempty = counts > 0
+        if nonempty.any():
+            self._max_impacts[nonempty] = np.maximum.reduceat(self._impacts, self._offsets[:-1][nonempty])
+        for tid in np.flatnonzero(counts >= LONG_POSTINGS):
+            docs, impacts = self._block(tid)
+            size = len(docs) // HEAD_FRACTION
+            top = np.argpartition(-impacts, size)[:size]
+            top = top[np.argsort(-impacts[top], kind="stable")]
+            self._heads[int(tid)] = (docs[top], impacts[top].astype(np.float32))
+            if len(docs) * DENSE_FRACTION >= self._row_ids.size:
+                self._dense[int(tid)] = row = np.zeros(self._row_ids.size, dtype=np.float16)
+                row[docs] = impacts
+
+    def _impact(self, docs, tfs):
+        avg_length = self.total_length / max(self._row_ids.size, 1)
+        tf = tfs.astype(np.float32)
+        lengths = self._lengths.view[docs].astype(np.float32)
+        return tf * (self.k1 + 1) / (tf + self.k1 * (1 - self.b + self.b * lengths / avg_length))
+
+    # ---------- querying ----------
+    def _block(self, tid):
+        """(docs, impacts) of one term in the CSR block, as stored (no copies)."""
+        if tid < len(self._offsets) - 1:
+            start, end = self._offsets[tid], self._offsets[tid + 1]
+            return self._docs[start:end], self._impacts[start:end]
+        return self._docs[:0], self._impacts[:0]
+
+    def _keep(self, docs, filters):
+        """Positions of the docs passing the filters, or None when there are none."""
+        keep = None
+        columns = {"rating": self._ratings, "sentiment": self._sentiment, "asin": self._asin_codes}
+        for column, op, value in filters:
+            values = columns[column].view[docs]
+            ok = values >= value if op == ">=" else values <= value if op == "<=" else values == value
+            keep = ok if keep is None else keep & ok
+        # positions index several times faster than the boolean mask itself
+        return keep if keep is None else np.flatnonzero(keep)
+
+    def search(self, query: str, k: int = 10, min_rating: int = None, max_rating: int = None,
+               sentiment: str = None, asin: str = None) -> list:
+        """
+        Top-k (row_id, score) by BM25, best first. Filters keep only reviews
+        with rating in [min_rating, max_rating], the given sentiment label
+        ("positive" / "neutral" / "negative") and / or the given ASIN.
+        """
+        with self._lock:
+            n = self._row_ids.size
+            if not n:
+                return []
+            if sentiment is not None and sentiment.lower() not in SENTIMENTS:
+                raise ValueError(f"sentiment must be one of {sorted(SENTIMENTS)}")
+            if asin is not None and asin not in self._asin_ids:
+                return []
+            filters = [f for f in (("rating", ">=", min_rating), ("rating", "<=", max_rating),
+                                   ("sentiment", "==", SENTIMENTS.get((sentiment or "").lower())),
+                                   ("asin", "==", self._asin_ids.get(asin))) if f[2] is not None]
+
+            terms = []
+            for term in set(tokenize(query)):
+                tid = self._vocab.get(term)
+                if tid is None:
+                    continue
+                df = len(self._block(tid)[0]) + len(self._tail.get(tid, ((),))[0])
+                if df:
+                    terms.append((tid, np.float32(math.log(1 + (n - df + 0.5) / (df + 0.5)))))
+            if not terms:
+                return []
+
+            # heads pay off for one or two long lists; with three or more, candidates rarely
+            # beat the summed bound before the heads run out, but up to three rounds still yield
+            # a k-th best score for MaxScore - enough once it leaves a single term to scan.
+            # An ASIN filter keeps a tiny slice of each list, which is cheaper to scan than the heads
+            long_lists = sum(tid in self._heads for tid, _ in terms)
+            docs, scores, theta = None, None, np.float32(0)
+            if long_lists and asin is None:
+                rounds, enough = None, None
+                if long_lists > MAX_HEAD_TERMS:
+                    bounds = sorted(self._max_score(tid, idf) for tid, idf in terms)
+                    rounds, enough = 3, sum(bounds[:-1])
+                docs, scores, theta = self._search_heads(terms, k, filters, rounds, enough)
+            if docs is None:
+                docs, scores = self._search_all(terms, k, filters, n, theta)
+            if not len(docs):
+                return []
+            order = np.argsort(-scores, kind="stable")[:k]
+            row_ids = self._row_ids.view
+            return [(int(row_ids[docs[i]]), float(scores[i])) for i in order]
+
+    def _max_score(self, tid, idf):
+        """Upper bound on one term's contribution to any doc's score."""
+        best = self._max_impacts[tid] if tid < len(self._max_impacts) else 0
+        impacts = self._tail_postings_of(tid)[1]
+        if len(impacts):
+            best = max(best, impacts.max())
+        return np.float32(idf * best)
+
+    def _search_all(self, terms, k, filters, n, theta=0):
+        """
+        Score every posting of the query terms. Given theta, a score some
+        filtered doc is known to reach, MaxScore skips the lowest-bound terms
+        whose bounds sum below theta: a doc found only in them can't make the
+        top k, so only the other terms' postings are candidates, and those
+        terms are looked up for the candidates that can still reach theta.
+        """
+        # theta was summed in another order: a little slack keeps the docs that tie with it
+        theta = np.float32(theta) * np.float32(1 - 1e-4)
+        essential, optional, optional_max = terms, [], np.float32(0)
+        if theta > 0 and len(terms) > 1:
+            essential = []
+            for bound, tid, idf in sorted((self._max_score(tid, idf), tid, idf) for tid, idf in terms):
+                if not essential and optional_max + bound < theta:
+                    optional.append((tid, idf))
+                    optional_max += bound
+                else:
+                    essential.append((tid, idf))
+
+        ids, weights = [], []
+        for tid, idf in essential:
+            # block and tail hold disjoint docs; filter before widening the dtypes
+            for docs, impacts in (self._block(tid), self._tail_postings_of(tid)):
+                if not len(docs):
+                    continue
+                keep = self._keep(docs, filters)
+                if keep is not None:
+                    docs, impacts = docs[keep], impacts[keep]
+                ids.append(docs.astype(np.intp))
+                weights.append(impacts.astype(np.float32) * idf)
+
+        if len(essential) == 1:
+            # one term's block and tail hold disjoint docs, already in doc order
+            docs, scores = np.concatenate(ids), np.concatenate(weights)
+        else:
+            # sum per doc in a reusable dense buffer: each part's docs are unique, so
+            # buffer[docs] += w is exact, and only touched slots are read and reset
+            if len(self._scratch) < n:
+                self._scratch = np.zeros(max(n, 2 * len(self._scratch)), dtype=np.float32)
+            for docs, w in zip(ids, weights):
+                self._scratch[docs] = self._scratch[docs] + w
+            docs = np.concatenate(ids)
+            scores = self._scratch[docs]
+            self._scratch[docs] = 0
+        if optional:
+            reach = np.flatnonzero(scores + optional_max >= theta)
+            docs, scores = docs[reach], scores[reach]
+            if len(essential) > 1:
+                docs, first = np.unique(docs, return_index=True)
+                scores = scores[first]
+            # highest bound first, dropping candidates that can no longer reach theta
+            for tid, idf in reversed(optional):
+                self._add_scores(docs, scores, [(tid, idf)])
+                optional_max -= self._max_score(tid, idf)
+                reach = np.flatnonzero(scores + optional_max >= theta)
+                docs, scores = docs[reach], scores[reach]
+            if len(docs) > k:
+                top = np.argpartition(-scores, k - 1)[:k]
+                docs, scores = docs[top], scores[top]
+            return docs, scores
+        # a doc matching several terms appears once per term (same total each time)
+        want = k * len(ids)
+        if len(docs) > want:
+            top = np.argpartition(-scores, want)[:want]
+            docs, scores = docs[top], scores[top]
+        docs, first = np.unique(docs, return_index=True)
+        return docs, scores[first]
+
+    def _add_scores(self, candidates, scores, terms):
+        """Add each term's contribution to the scores of the given (sorted) docs, in place."""
+        for tid, idf in terms:
+            parts = [self._block(tid), self._tail_postings_of(tid)]
+            row = self._dense.get(tid)
+            if row is not None:
+                # the row holds the block's impacts; docs added since then are only in the tail
+                inside = np.searchsorted(candidates, len(row))
+                scores[:inside] += idf * row[candidates[:inside]].astype(np.float32)
+                parts = parts[1:]
+            for docs, impacts in parts:
+                if not len(docs):
+                    continue
+                if len(docs) * 16 <= len(candidates):
+                    # few postings: look them up among the candidates instead
+                    pos = np.searchsorted(candidates, docs)
+                    np.minimum(pos, len(candidates) - 1, out=pos)
+                    hit = np.flatnonzero(candidates[pos] == docs)
+                    scores[pos[hit]] += idf * impacts[hit].astype(np.float32)
+                    continue
+                if len(candidates) * 16 > len(docs):
+                    # many candidates: a dense scatter / gather beats binary searches
+                    if len(self._scratch) < self._row_ids.size:
+                        self._scratch = np.zeros(max(self._row_ids.size, 2 * len(self._scratch)), dtype=np.float32)
+                    self._scratch[docs] = impacts
+                    scores += idf * self._scratch[candidates]
+                    self._scratch[docs] = 0
+                    continue
+                pos = np.searchsorted(docs, candidates)
+                np.minimum(pos, len(docs) - 1, out=pos)
+                hit = np.flatnonzero(docs[pos] == candidates)
+                scores[hit] += idf * impacts[pos[hit]].astype(np.float32)
+
+    def _search_heads(self, terms, k, filters, rounds=None, enough=None):
+        """
+        Threshold algorithm over the impact-ordered heads of long posting lists.
+
+        Candidates are the first `depth` docs of each long list by impact (and
+        its tail postings above that cut), plus every doc of the short lists.
+        A doc that is not a candidate can score at most `bound` (the sum of
+        each long list's impact at the cut), so once the k-th best candidate
+        reaches it the top k is exact. Depth grows 4x per round, for at most `rounds` rounds.
+
+        Returns (docs, scores, theta), or (None, None, theta) when a head runs
+        out, rounds are used up or theta passes `enough` first; theta is the
+        k-th best candidate score seen so far (0 if none), a lower bound for
+        the exhaustive path.
+        """
+        depth = max(16 * k, 256)
+        theta = np.float32(0)
+        while rounds is None or rounds > 0:
+            parts, bound, exhausted = [], np.float32(0), False
+            for tid, idf in terms:
+                head = self._heads.get(tid)
+                tail_docs, tail_impacts = self._tail_postings_of(tid)
+                if head is None:
+                    parts += [self._block(tid)[0], tail_docs]
+                    continue
+                head_docs, head_impacts = head
+                parts.append(head_docs[:depth])
+                if depth >= len(head_docs):
+                    exhausted = True
+                else:
+                    # tail postings at or below the cut are covered by the bound too
+                    cut = head_impacts[depth]
+                    bound += idf * cut
+                    parts.append(tail_docs[tail_impacts > cut])
+            if exhausted:
+                return None, None, theta
+
+            candidates = _distinct(np.concatenate(parts))
+            keep = self._keep(candidates, filters)
+            if keep is not None:
+                candidates = candidates[keep]
+            scores = np.zeros(len(candidates), dtype=np.float32)
+            self._add_scores(candidates, scores, terms)
+
+            if len(candidates) >= k:
+                theta = np.partition(scores, len(scores) - k)[len(scores) - k]
+                if theta >= bound:
+                    top = np.argpartition(-scores, k - 1)[:k] if len(scores) > k else np.arange(len(scores))
+                    return candidates[top].astype(np.intp), scores[top], theta
+                if enough is not None and theta > enough:
+                    break
+            depth *= 4
+            if rounds is not None:
+                rounds -= 1
+        return None, None, theta
+
+    def _tail_postings_of(self, tid):
+        tail = self._tail.get(tid)
+        if not tail:
+            return self._docs[:0], self._impacts[:0]
+        docs = np.array(tail[0], dtype=np.uint32)
+        return docs, self._impact(docs, np.array(tail[1], dtype=np.uint16))
+
+    def sentiment_of(self, row_ids) -> dict:
+        """Row id -> indexed sentiment label (None when unknown), for search results."""
+        with self._lock:
+            positions = np.searchsorted(self._row_ids.view, np.asarray(list(row_ids), dtype=np.int64))
+            codes = self._sentiment.view[positions]
+            return {int(self._row_ids.view[p]): _SENTIMENT_NAMES.get(int(c)) for p, c in zip(positions, codes)}
+
+    # ---------- snapshot ----------
+    def save(self, path: str = INDEX_PATH):
+        with self._lock:
+            if self._tail:
+                self._merge()
+            terms = [None] * len(self._vocab)
+            for term, tid in self._vocab.items():
+                terms[tid] = term
+            meta = {"k1": self.k1, "b": self.b, "total_length": self.total_length,
+                    "last_row_id": self.last_row_id, "last_label_seq": self.last_label_seq,
+                    "asins": self._asins}
+            tmp = path + ".tmp"
+            with open(tmp, "wb") as f:
+                np.savez(f, offsets=self._offsets, docs=self._docs, tfs=self._tfs, impacts=self._impacts,
+                         vocab=np.frombuffer("\n".join(terms).encode("utf-8"), dtype=np.uint8),
+                         meta=np.frombuffer(json.dumps(meta).encode("utf-8"), dtype=np.uint8),
+                         row_ids=self._row_ids.view, lengths=self._lengths.view, ratings=self._ratings.view,
+                         sentiment=self._sentiment.view, asin_codes=self._asin_codes.view)
+            os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str = INDEX_PATH) -> "ReviewIndex":
+        """The snapshot at path, or an empty index if there is none yet."""
+        if not os.path.exists(path):
+            return cls()
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(data["meta"].tobytes().decode("utf-8"))
+            index = cls(meta["k1"], meta["b"])
+            vocab = data["vocab"].tobytes().decode("utf-8")
+            index._vocab = {term: tid for tid, term in enumerate(vocab.split("\n"))} if vocab else {}
+            index._offsets, index._docs, index._tfs = data["offsets"], data["docs"], data["tfs"]
+            index._impacts = data["impacts"]
+            index._row_ids = _Column(np.int64, data["row_ids"])
+            index._lengths = _Column(np.uint16, data["lengths"])
+            index._ratings = _Column(np.int8, data["ratings"])
+            index._sentiment = _Column(np.int8, data["sentiment"])
+            index._asin_codes = _Column(np.int32, data["asin_codes"])
+            index._build_heads()
+        index._asins = meta["asins"]
+        index._asin_ids = {a: i for i, a in enumerate(index._asins)}
+        index.total_length = meta["total_length"]
+        index.last_row_id = meta["last_row_id"]
+        index.last_label_seq = meta.get("last_label_seq", 0)
+        return index
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "reviews": self._row_ids.size,
+                "terms": len(self._vocab),
+                "postings": int(len(self._docs)) + self._tail_postings,
+                "tail_postings": self._tail_postings,
+                "head_lists": len(self._heads),
+                "products": len(self._asins),
+                "last_row_id": self.last_row_id,
+                "memory_mb": round(sum(a.nbytes for a in (
+                    self._offsets, self._docs, self._tfs, self._impacts, self._row_ids.data, self._lengths.data,
+                    *(a for head in self._heads.values() for a in head), *self._dense.values(),
+                    self._ratings.data, self._sentiment.data, self._asin_codes.data)) / 1e6, 1),
+            }
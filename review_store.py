@@ -0,0 +1,426 @@
+"""
+Embedded SQLite store for products, reviews, price observations and sentiment.
+
+Every scraper writes through one ReviewStore instead of rewriting its own
+CSV / JSON file on each run:
+
+    store = get_review_store()
+    store.upsert_product(asin, title=title, url=link)
+    ids = store.add_reviews(asin, page.reviews)           # Review records or dicts
+    store.add_sentiment(zip(ids, compounds, labels), "vader")
+    store.add_price(product_key(url), "1,299", title=title)
+
+Tables
+- products            one row per ASIN (or marketplace product key)
+- reviews             keyed by the Amazon review id; reviews without one get
+                      a content hash, so rescrapes never duplicate a row
+- price_observations  one row per (product, time) observation
+- sentiment           one score + label per (review, backend)
+- sentiment_log       one row per (re)scored review, in scoring order, so
+                      readers such as review_search can pick up new labels
+
+The database runs in WAL mode (readers never block the writer). Writes are
+batched: each call is one transaction with executemany in BATCH_ROWS chunks.
+Indexes cover the usual reads: reviews by (asin, rating), by (asin,
+review_date) and by review id; prices by (asin, observed_at).
+"""
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime
+from itertools import islice
+
+STORE_PATH = os.environ.get("REVIEW_STORE_PATH", "reviews.db")
+BATCH_ROWS = 5000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS products (
+    asin TEXT PRIMARY KEY,
+    title TEXT,
+    url TEXT,
+    marketplace TEXT,
+    rating REAL,
+    review_count INTEGER,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS reviews (
+    id INTEGER PRIMARY KEY,
+    review_id TEXT NOT NULL,
+    asin TEXT NOT NULL,
+    rating INTEGER,
+    title TEXT,
+    text TEXT NOT NULL,
+    review_date TEXT,
+    scraped_at TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_reviews_review_id ON reviews (review_id);
+CREATE INDEX IF NOT EXISTS idx_reviews_asin_rating ON reviews (asin, rating);
+CREATE INDEX IF NOT EXISTS idx_reviews_asin_date ON reviews (asin, review_date);
+
+CREATE TABLE IF NOT EXISTS price_observations (
+    id INTEGER PRIMARY KEY,
+    asin TEXT NOT NULL,
+    observed_at TEXT NOT NULL,
+    price REAL,
+    price_text TEXT,
+    marketplace TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_prices_asin_time ON price_observations (asin, observed_at);
+
+CREATE TABLE IF NOT EXISTS sentiment (
+    review_id TEXT NOT NULL,
+    backend TEXT NOT NULL,
+    score REAL,
+    label TEXT,
+    PRIMARY KEY (review_id, backend)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS sentiment_log (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    review_id TEXT NOT NULL
+);
+"""
+
+_ASIN_RE = re.compile(r"/(?:dp|gp/product|product-reviews)/([A-Z0-9]{10})(?:[/?]|$)", re.I)
+_FLIPKART_RE = re.compile(r"(?:/p/|[?&]pid=)(\w+)")
+_NUMBER_RE = re.compile(r"\d[\d,]*(?:\.\d+)?")
+_DATE_PATTERNS = (
+    (re.compile(r"(\d{1,2})\s+([A-Za-z]+)\s+(\d{4})"), "{0} {1} {2}", ("%d %B %Y", "%d %b %Y")),
+    (re.compile(r"([A-Za-z]+)\s+(\d{1,2}),?\s+(\d{4})"), "{1} {0} {2}", ("%d %B %Y", "%d %b %Y")),
+)
+
+
+# ============ HELPERS ============
+def now() -> str:
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def product_key(url: str):
+    """ASIN for Amazon links, "flipkart:<id>" for Flipkart ones, else the URL without its query."""
+    if not url:
+        return None
+    m = _ASIN_RE.search(url)
+    if m:
+        return m.group(1).upper()
+    if "flipkart." in url:
+        m = _FLIPKART_RE.search(url)
+        if m:
+            return f"flipkart:{m.group(1)}"
+    return url.split("?")[0]
+
+
+def parse_number(text):
+    """1299.0 from "₹1,299", 4.2 from "4.2 out of 5 stars"; None when there is no number."""
+    if isinstance(text, (int, float)):
+        return float(text)
+    m = _NUMBER_RE.search(str(text or ""))
+    return float(m.group(0).replace(",", "")) if m else None
+
+
+def parse_review_date(date_text):
+    """ISO date from "Reviewed in India on 12 March 2024" / "March 12, 2024", else None."""
+    if isinstance(date_text, (date, datetime)):
+        return date_text.strftime("%Y-%m-%d")
+    for pattern, layout, formats in _DATE_PATTERNS:
+        m = pattern.search(date_text or "")
+        if not m:
+            continue
+        value = layout.format(*m.groups())
+        for fmt in formats:
+            try:
+                return datetime.strptime(value, fmt).strftime("%Y-%m-%d")
+            except ValueError:
+                continue
+    return None
+
+
+def review_key(asin: str, rating, text: str) -> str:
+    """Stand-in review id for records scraped without one (stable across rescrapes)."""
+    h = hashlib.blake2b(digest_size=12)
+    h.update(f"{asin}\0{rating}\0{text}".encode("utf-8", errors="surrogatepass"))
+    return "h:" + h.hexdigest()
+
+
+def _field(record, name, default=None):
+    if isinstance(record, dict):
+        return record.get(name, default)
+    return getattr(record, name, default)
+
+
+def _chunks(rows, size):
+    it = iter(rows)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+# ============ STORE ============
+class ReviewStore:
+    def __init__(self, path: str = STORE_PATH, batch_rows: int = BATCH_ROWS):
+        """
+        path:       SQLite file (":memory:" for a throwaway store)
+        batch_rows: rows per executemany call
+        """
+        self.path = path
+        self.batch_rows = batch_rows
+        self._lock = threading.Lock()
+        # autocommit mode: transactions are opened explicitly in transaction()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+
+    @contextmanager
+    def transaction(self):
+        """One locked BEGIN ... COMMIT (ROLLBACK on error) around a group of writes."""
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                yield self._db
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
+
+    def _executemany(self, db, sql, rows) -> int:
+        n = 0
+        for chunk in _chunks(rows, self.batch_rows):
+            db.executemany(sql, chunk)
+            n += len(chunk)
+        return n
+
+    # ---------- products ----------
+    def _touch_products(self, db, asins, seen):
+        db.executemany(
+            "INSERT INTO products (asin, first_seen, last_seen) VALUES (?, ?, ?) "
+            "ON CONFLICT (asin) DO UPDATE SET last_seen = excluded.last_seen",
+            [(a, seen, seen) for a in asins])
+
+    def upsert_product(self, asin: str, title: str = None, url: str = None, marketplace: str = "amazon.in",
+                       rating=None, review_count=None):
+        """Insert or refresh a product; fields passed as None keep their stored value."""
+        seen = now()
+        with self.transaction() as db:
+            db.execute(
+                "INSERT INTO products VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (asin) DO UPDATE SET "
+                "title = coalesce(excluded.title, title), url = coalesce(excluded.url, url), "
+                "marketplace = coalesce(excluded.marketplace, marketplace), "
+                "rating = coalesce(excluded.rating, rating), "
+                "review_count = coalesce(excluded.review_count, review_count), "
+                "last_seen = excluded.last_seen",
+                (asin, title, url, marketplace, parse_number(rating),
+                 None if review_count is None else int(parse_number(review_count) or 0), seen, seen))
+
+    # ---------- reviews ----------
+    def add_reviews(self, asin: str, reviews) -> list:
+        """
+        Store reviews for one product. Each record is a review_extractor.Review
+        or a dict with text and any of review_id, rating, title, date / date_text.
+        Already-stored review ids are left alone. Returns the review id of every
+        record in input order (for add_sentiment).
+        """
+        scraped_at = now()
+        rows, ids = [], []
+        for r in reviews:
+            text = str(_field(r, "text") or "")
+            rating = _field(r, "rating")
+            rating = int(rating) if rating is not None else None
+            rid = _field(r, "review_id") or review_key(asin, rating, text)
+            day = _field(r, "date") or _field(r, "date_text")
+            rows.append((rid, asin, rating, _field(r, "title"), text, parse_review_date(day), scraped_at))
+            ids.append(rid)
+        if rows:
+            with self.transaction() as db:
+                self._touch_products(db, [asin], scraped_at)
+                self._executemany(
+                    db, "INSERT OR IGNORE INTO reviews (review_id, asin, rating, title, text, review_date, "
+                        "scraped_at) VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+        return ids
+
+    def known_review_ids(self, asin: str) -> set:
+        """Every stored review id for the product (the stop set for incremental scrapes)."""
+        with self._lock:
+            return {r[0] for r in self._db.execute("SELECT review_id FROM reviews WHERE asin = ?", (asin,))}
+
+    def reviews_after(self, last_id: int = 0, limit: int = BATCH_ROWS) -> list:
+        """
+        (id, asin, rating, text, label) for reviews stored after row id last_id,
+        oldest first (incremental feeds such as review_search). label is the
+        stored sentiment, VADER preferred over other backends, or None.
+        """
+        with self._lock:
+            return self._db.execute(
+                "SELECT r.id, r.asin, r.rating, r.text, "
+                "(SELECT s.label FROM sentiment s WHERE s.review_id = r.review_id "
+                " ORDER BY s.backend = 'vader' DESC LIMIT 1) "
+                "FROM reviews r WHERE r.id > ? ORDER BY r.id LIMIT ?", (last_id, limit)).fetchall()
+
+    def reviews_by_row_ids(self, row_ids) -> dict:
+        """Row id -> review dict for the given reviews.id values (e.g. search hits)."""
+        row_ids = [int(i) for i in row_ids]
+        cols = ("review_id", "asin", "rating", "title", "text", "review_date")
+        out = {}
+        with self._lock:
+            for chunk in _chunks(row_ids, 500):
+                marks = ",".join("?" * len(chunk))
+                for row in self._db.execute(
+                        f"SELECT id, review_id, asin, rating, title, text, review_date FROM reviews "
+                        f"WHERE id IN ({marks})", chunk):
+                    out[row[0]] = dict(zip(cols, row[1:]))
+        return out
+
+    def reviews(self, asin: str, min_rating: int = None, max_rating: int = None,
+                since: str = None, until: str = None, limit: int = None) -> list:
+        """Reviews of one product as dicts, newest first, with stored sentiment labels attached."""
+        sql = ("SELECT r.review_id, r.asin, r.rating, r.title, r.text, r.review_date, r.scraped_at, "
+               "(SELECT group_concat(s.backend || ':' || s.label) FROM sentiment s "
+               " WHERE s.review_id = r.review_id) FROM reviews r WHERE r.asin = ?")
+        args = [asin]
+        for clause, value in (("r.rating >= ?", min_rating), ("r.rating <= ?", max_rating),
+                              ("r.review_date >= ?", since), ("r.review_date <= ?", until)):
+            if value is not None:
+                sql += f" AND {clause}"
+                args.append(value)
+        sql += " ORDER BY r.review_date DESC, r.id DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            args.append(limit)
+        cols = ("review_id", "asin", "rating", "title", "text", "review_date", "scraped_at")
+        with self._lock:
+            out = []
+            for row in self._db.execute(sql, args):
+                review = dict(zip(cols, row))
+                review["sentiment"] = dict(p.split(":", 1) for p in row[-1].split(",")) if row[-1] else {}
+                out.append(review)
+            return out
+
+    # ---------- sentiment ----------
+    def add_sentiment(self, rows, backend: str) -> int:
+        """rows: (review_id, score, label) triples; re-scoring replaces the old row."""
+        rows = [(rid, backend, None if score is None else float(score), str(label).lower() if label else None)
+                for rid, score, label in rows]
+        with self.transaction() as db:
+            self._executemany(db, "INSERT INTO sentiment_log (review_id) VALUES (?)", [(r[0],) for r in rows])
+            return self._executemany(db, "INSERT OR REPLACE INTO sentiment VALUES (?, ?, ?, ?)", rows)
+
+    def sentiment_updates(self, after: int = 0, limit: int = BATCH_ROWS) -> list:
+        """
+        (seq, row id, label) for reviews scored after sentiment_log entry `after`,
+        oldest first, with the label reviews_after() would give now. The row id
+        is None for a review not stored (yet).
+        """
+        with self._lock:
+            return self._db.execute(
+                "SELECT l.seq, r.id, "
+                "(SELECT s.label FROM sentiment s WHERE s.review_id = l.review_id "
+                " ORDER BY s.backend = 'vader' DESC LIMIT 1) "
+                "FROM sentiment_log l LEFT JOIN reviews r ON r.review_id = l.review_id "
+                "WHERE l.seq > ? ORDER BY l.seq LIMIT ?", (after, limit)).fetchall()
+
+    # ---------- prices ----------
+    def add_prices(self, observations) -> int:
+        """observations: (asin, price text or number, observed_at or None, marketplace) tuples."""
+        seen = now()
+        rows = [(asin, at or seen, parse_number(price), None if price is None else str(price), market)
+                for asin, price, at, market in observations]
+        with self.transaction() as db:
+            self._touch_products(db, {r[0] for r in rows}, seen)
+            return self._executemany(
+                db, "INSERT INTO price_observations (asin, observed_at, price, price_text, marketplace) "
+                    "VALUES (?, ?, ?, ?, ?)", rows)
+
+    def add_price(self, asin: str, price, observed_at: str = None, marketplace: str = "amazon.in",
+                  title: str = None):
+        if title:
+            self.upsert_product(asin, title=title, marketplace=marketplace)
+        self.add_prices([(asin, price, observed_at, marketplace)])
+
+    def price_history(self, asin: str, since: str = None, until: str = None) -> list:
+        """[(observed_at, price, price_text)] in time order."""
+        sql = "SELECT observed_at, price, price_text FROM price_observations WHERE asin = ?"
+        args = [asin]
+        if since is not None:
+            sql += " AND observed_at >= ?"
+            args.append(since)
+        if until is not None:
+            sql += " AND observed_at <= ?"
+            args.append(until)
+        with self._lock:
+            return self._db.execute(sql + " ORDER BY observed_at", args).fetchall()
+
+    # ---------- maintenance ----------
+    def counts(self) -> dict:
+        with self._lock:
+            return {table: self._db.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                    for table in ("products", "reviews", "price_observations", "sentiment")}
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_review_store() -> ReviewStore:
+    """The process-wide store at STORE_PATH, opened on first use."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ReviewStore(STORE_PATH)
+    return _store
+
+
+def page_is_known(review_ids, known: set) -> bool:
+    """
+    Incremental scrapes walk reviews newest first and stop at the first page
+    whose reviews are all known already. Pages with no reviews, or with any
+    review lacking an id, never count as known.
+    """
+    review_ids = list(review_ids)
+    return bool(review_ids) and all(rid and rid in known for rid in review_ids)
+
+
+# ============ PIPELINE SINK ============
+class StoreSink:
+    """
+    review_stream sink: writes each batch of review dicts (and, when present,
+    their score / label) to the store. The product comes from each record's
+    "asin" key, or the asin given here.
+    """
+
+    def __init__(self, store: ReviewStore = None, asin: str = None, backend: str = "vader",
+                 score_key: str = "compound", label_key: str = "sentiment"):
+        self.store = store or get_review_store()
+        self.asin = asin
+        self.backend = backend
+        self.score_key = score_key
+        self.label_key = label_key
+        self.rows = 0
+
+    def write(self, batch):
+        by_asin = {}
+        for review in batch:
+            asin = review.get("asin") or self.asin
+            if asin:
+                by_asin.setdefault(asin, []).append(review)
+        for asin, reviews in by_asin.items():
+            ids = self.store.add_reviews(asin, reviews)
+            scored = [(rid, r[self.score_key], r.get(self.label_key))
+                      for rid, r in zip(ids, reviews) if r.get(self.score_key) is not None]
+            if scored:
+                self.store.add_sentiment(scored, self.backend)
+            self.rows += len(reviews)
+
+    def close(self):
+        pass
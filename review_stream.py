@@ -0,0 +1,268 @@
+"""
+Streaming review pipeline: scrape -> clean -> sentiment -> store in fixed-size batches.
+
+Every stage is a generator over lists of review dicts, and every sink writes
+each batch as it arrives. Peak memory therefore depends on the batch size
+(plus whatever a sink chooses to aggregate), not on how many reviews go
+through.
+
+    stream = batched(iter_reviews(...), BATCH_SIZE)
+    stream = clean_stage(stream)
+    stream = sentiment_stage(stream)
+    run(stream, [CsvSink("final_processed_reviews.csv"), SampleSink(5000)])
+
+Backpressure comes for free: a stage only produces its next batch when the
+stage below asks for it, so nothing upstream runs ahead. prefetch() lets one
+stage run ahead in a background thread (e.g. keep scraping while the current
+batch is scored), bounded by a queue of `depth` batches.
+"""
+import csv
+import math
+import os
+import queue
+import random
+import re
+import threading
+from collections import Counter
+
+BATCH_SIZE = 500
+
+_URL_RE = re.compile(r"https?://\S+|www\.\S+")
+_NON_WORD_RE = re.compile(r"[^a-z0-9\s']")
+_SPACE_RE = re.compile(r"\s+")
+
+
+# ============ SOURCES / PLUMBING ============
+def batched(records, size: int = BATCH_SIZE):
+    """Group any iterable of review dicts into lists of at most `size`."""
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+_DONE = object()
+
+
+def prefetch(batches, depth: int = 2):
+    """Run the upstream generator in a thread, at most `depth` batches ahead."""
+    q = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def produce():
+        try:
+            for batch in batches:
+                while not stop.is_set():
+                    try:
+                        q.put(batch, timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+                if stop.is_set():
+                    return
+            q.put(_DONE)
+        except BaseException as e:  # surfaced in the consumer
+            q.put(e)
+
+    thread = threading.Thread(target=produce, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = q.get()
+            if item is _DONE:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+
+
+def map_stage(fn):
+    """Turn a batch -> batch function into a stage."""
+    def stage(batches):
+        for batch in batches:
+            yield fn(batch)
+    return stage
+
+
+def tee(batches, sink):
+    """Write every batch to sink and pass it on unchanged (e.g. save raw reviews mid-pipeline)."""
+    try:
+        for batch in batches:
+            sink.write(batch)
+            yield batch
+    finally:
+        sink.close()
+
+
+def run(batches, sinks) -> int:
+    """Drain the pipeline into the sinks; returns the number of reviews processed."""
+    total = 0
+    try:
+        for batch in batches:
+            for sink in sinks:
+                sink.write(batch)
+            total += len(batch)
+    finally:
+        for sink in sinks:
+            sink.close()
+    return total
+
+
+# ============ STAGES ============
+def clean_text(text) -> str:
+    """Lower-case, drop URLs and punctuation, collapse whitespace."""
+    text = _URL_RE.sub(" ", str(text or "").lower())
+    text = _NON_WORD_RE.sub(" ", text)
+    return _SPACE_RE.sub(" ", text).strip()
+
+
+def clean_stage(batches, text_key: str = "text", min_length: int = 3):
+    """Add clean_text and drop reviews that are empty after cleaning."""
+    for batch in batches:
+        out = []
+        for review in batch:
+            cleaned = clean_text(review.get(text_key))
+            if len(cleaned) >= min_length:
+                out.append(dict(review, clean_text=cleaned))
+        if out:
+            yield out
+
+
+def sentiment_stage(batches, text_key: str = "text", labels=("negative", "neutral", "positive")):
+    """Add VADER neg/neu/pos/compound and a sentiment label, one cached batch call per batch."""
+    from batch_sentiment import COLUMNS, sentiment_labels
+    from sentiment_cache import vader_scores
+
+    for batch in batches:
+        scores = vader_scores([r.get(text_key) for r in batch])
+        names = sentiment_labels(scores["compound"], labels=labels)
+        for i, review in enumerate(batch):
+            for col in COLUMNS:
+                review[col] = float(scores[col][i])
+            review["sentiment"] = names[i]
+        yield batch
+
+
+# ============ SINKS ============
+class CsvSink:
+    """Append batches to a CSV file; the header comes from `fieldnames` or the first batch."""
+
+    def __init__(self, path: str, fieldnames=None):
+        self.path = path
+        self.fieldnames = list(fieldnames) if fieldnames else None
+        self.rows = 0
+        self._file = None
+        self._writer = None
+
+    def write(self, batch):
+        if self._writer is None:
+            if self.fieldnames is None:
+                self.fieldnames = list(batch[0].keys())
+            self._file = open(self.path, "w", newline="", encoding="utf-8")
+            # "\n" like DataFrame.to_csv, so outputs match the pandas-written files
+            self._writer = csv.DictWriter(self._file, fieldnames=self.fieldnames, extrasaction="ignore",
+                                          lineterminator="\n")
+            self._writer.writeheader()
+        self._writer.writerows(batch)
+        self._file.flush()
+        self.rows += len(batch)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class SampleSink:
+    """
+    Fixed-size uniform (reservoir) sample of the stream plus exact value
+    counts for selected keys - enough to drive the dashboard charts.
+    """
+
+    def __init__(self, size: int = 5000, count_keys=("rating", "sentiment"), seed: int = 0):
+        self.size = size
+        self.sample = []
+        self.seen = 0
+        self.counts = {key: Counter() for key in count_keys}
+        self._rng = random.Random(seed)
+
+    def write(self, batch):
+        for review in batch:
+            self.seen += 1
+            for key, counter in self.counts.items():
+                counter[review.get(key)] += 1
+            if len(self.sample) < self.size:
+                self.sample.append(review)
+            else:
+                j = self._rng.randrange(self.seen)
+                if j < self.size:
+                    self.sample[j] = review
+
+    def close(self):
+        pass
+
+    def frame(self):
+        import pandas as pd
+        return pd.DataFrame(self.sample)
+
+
+# ============ STREAMING TF-IDF ============
+class TfidfKeywords:
+    """
+    Top TF-IDF terms over a stream, matching
+    TfidfVectorizer(...).fit_transform(texts).sum(axis=0) without holding the
+    corpus or the document-term matrix in memory.
+
+    Two passes: fit() counts document frequencies batch by batch; top_terms()
+    re-reads the texts (e.g. from the CSV sink) and sums each document's
+    l2-normalised tf-idf row. Memory is bounded by the vocabulary size.
+    """
+
+    def __init__(self, max_df: float = 0.85, min_df: int = 2, stop_words="english", ngram_range=(1, 2)):
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        self._analyze = TfidfVectorizer(stop_words=stop_words, ngram_range=ngram_range).build_analyzer()
+        self.max_df = max_df
+        self.min_df = min_df
+        self.doc_freq = Counter()
+        self.n_docs = 0
+
+    def fit(self, texts):
+        for text in texts:
+            self.doc_freq.update(set(self._analyze(str(text))))
+            self.n_docs += 1
+
+    def top_terms(self, texts, n: int = 20):
+        """[(term, summed tf-idf)] for the n highest-scoring terms; [] if nothing survives the df filters."""
+        max_count = self.max_df * self.n_docs if isinstance(self.max_df, float) else self.max_df
+        idf = {
+            term: math.log((1 + self.n_docs) / (1 + df)) + 1
+            for term, df in self.doc_freq.items()
+            if self.min_df <= df <= max_count
+        }
+        if not idf:
+            return []
+        sums = Counter()
+        for text in texts:
+            tf = Counter(t for t in self._analyze(str(text)) if t in idf)
+            if not tf:
+                continue
+            weights = {t: c * idf[t] for t, c in tf.items()}
+            norm = math.sqrt(sum(w * w for w in weights.values()))
+            for t, w in weights.items():
+                sums[t] += w / norm
+        return sorted(sums.items(), key=lambda x: x[1], reverse=True)[:n]
+
+
+def iter_csv_column(path: str, column: str):
+    """Stream one column back out of a CSV written by CsvSink."""
+    if not os.path.exists(path):
+        return
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            yield row.get(column, "")
@@ -0,0 +1,205 @@
+"""
+Persistent sentiment score cache shared by every sentiment caller.
+
+Scores are keyed by a hash of (backend, backend version, text), so an
+unchanged review is scored once no matter which script or rescrape sees it
+again, and upgrading VADER / TextBlob invalidates old scores automatically.
+
+Two tiers:
+- in-memory LRU (recent texts, no I/O)
+- SQLite table in WAL mode (survives restarts, shared between processes)
+
+Lookups and inserts are batched: one SELECT ... IN (...) per 500 keys and
+one executemany per batch.
+
+    from sentiment_cache import textblob_polarity, vader_scores
+    polarities = textblob_polarity(texts)          # list of floats
+    scores = vader_scores(df["text"])              # neg/neu/pos/compound arrays
+    get_sentiment_cache().stats()
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+from array import array
+from collections import OrderedDict
+from functools import lru_cache
+from importlib import metadata
+
+import numpy as np
+
+from batch_sentiment import COLUMNS, _clean, score_texts
+
+CACHE_PATH = os.environ.get("SENTIMENT_CACHE_PATH", ".sentiment_cache.db")
+MEMORY_ITEMS = 50000
+_SQL_BATCH = 500
+
+
+@lru_cache(maxsize=None)
+def backend_version(distribution: str) -> str:
+    try:
+        return metadata.version(distribution)
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def text_key(text: str, backend: str, version: str) -> bytes:
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{backend}\0{version}\0".encode("utf-8"))
+    h.update(text.encode("utf-8", errors="surrogatepass"))
+    return h.digest()
+
+
+# ============ CACHE ============
+class SentimentCache:
+    def __init__(self, path: str = CACHE_PATH, memory_items: int = MEMORY_ITEMS):
+        """
+        path:         SQLite file (":memory:" for a throwaway cache)
+        memory_items: entries kept in the in-process LRU tier
+        """
+        self.path = path
+        self.memory_items = memory_items
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS scores (
+                key BLOB PRIMARY KEY,
+                backend TEXT NOT NULL,
+                value BLOB NOT NULL
+            ) WITHOUT ROWID""")
+        self._db.commit()
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    # ---------- memory tier ----------
+    def _remember(self, key, value):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    # ---------- batch API ----------
+    def get_many(self, texts, backend: str, version: str) -> list:
+        """Cached score tuple per text (None where not cached), in input order."""
+        keys = [text_key(t, backend, version) for t in texts]
+        found = {}
+        with self._lock:
+            for key in keys:
+                value = self._memory.get(key)
+                if value is not None:
+                    self._memory.move_to_end(key)
+                    found[key] = value
+            self.memory_hits += len(found)
+
+            missing = list({k for k in keys if k not in found})
+            for i in range(0, len(missing), _SQL_BATCH):
+                chunk = missing[i:i + _SQL_BATCH]
+                rows = self._db.execute(
+                    f"SELECT key, value FROM scores WHERE key IN ({','.join('?' * len(chunk))})", chunk)
+                for key, blob in rows:
+                    value = tuple(array("d", blob))
+                    found[key] = value
+                    self._remember(key, value)
+                    self.disk_hits += 1
+            self.misses += len(set(keys) - found.keys())
+        return [found.get(k) for k in keys]
+
+    def put_many(self, texts, values, backend: str, version: str):
+        """Store one tuple of floats per text."""
+        rows = []
+        with self._lock:
+            for text, value in zip(texts, values):
+                value = tuple(float(v) for v in value)
+                key = text_key(text, backend, version)
+                self._remember(key, value)
+                rows.append((key, backend, array("d", value).tobytes()))
+            self._db.executemany("INSERT OR REPLACE INTO scores VALUES (?, ?, ?)", rows)
+            self._db.commit()
+            self.stores += len(rows)
+
+    def get_or_compute(self, texts, backend: str, version: str, compute) -> list:
+        """
+        Score tuples for texts, calling compute(list_of_texts) -> list_of_tuples
+        only for the distinct texts not cached yet.
+        """
+        texts = list(texts)
+        values = self.get_many(texts, backend, version)
+        todo = list(dict.fromkeys(t for t, v in zip(texts, values) if v is None))
+        if todo:
+            computed = dict(zip(todo, (tuple(v) for v in compute(todo))))
+            self.put_many(todo, [computed[t] for t in todo], backend, version)
+            values = [v if v is not None else computed[t] for t, v in zip(texts, values)]
+        return values
+
+    # ---------- maintenance ----------
+    def stats(self) -> dict:
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+                "stores": self.stores,
+                "entries": entries,
+                "memory_entries": len(self._memory),
+            }
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._db.execute("DELETE FROM scores")
+            self._db.commit()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_sentiment_cache() -> SentimentCache:
+    """The process-wide cache at CACHE_PATH, opened on first use."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = SentimentCache(CACHE_PATH)
+    return _cache
+
+
+# ============ CACHED SCORERS ============
+def textblob_polarity(texts, cache: SentimentCache = None) -> list:
+    """TextBlob polarity per text, scoring only texts not seen before."""
+    from textblob import TextBlob
+
+    texts = [_clean(t) for t in texts]
+    values = (cache or get_sentiment_cache()).get_or_compute(
+        texts, "textblob", backend_version("textblob"),
+        lambda todo: [(TextBlob(t).sentiment.polarity,) for t in todo])
+    return [v[0] for v in values]
+
+
+def vader_scores(texts, cache: SentimentCache = None, **batch_options) -> dict:
+    """
+    batch_sentiment.score_texts() through the cache: neg/neu/pos/compound
+    arrays, with only unseen texts sent to the (multi-process) scorer.
+    """
+    def compute(todo):
+        scores = score_texts(todo, **batch_options)
+        return zip(*(scores[col] for col in COLUMNS))
+
+    texts = [_clean(t) for t in texts]
+    values = (cache or get_sentiment_cache()).get_or_compute(
+        texts, "vader", backend_version("vaderSentiment"), compute)
+    matrix = np.array(values, dtype=np.float64).reshape(len(values), len(COLUMNS))
+    return {col: np.ascontiguousarray(matrix[:, i]) for i, col in enumerate(COLUMNS)}
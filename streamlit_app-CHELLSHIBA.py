@@ -14,11 +14,13 @@ col1, col2 = st.columns([3,1])
 with col2:
     max_per_star = st.number_input("Reviews per star", min_value=1, max_value=10, value=5, step=1)
     max_pages = st.number_input("Max pages to scan", min_value=1, max_value=20, value=8, step=1)
+    concurrency = st.number_input("Pages fetched in parallel", min_value=1, max_value=8, value=4, step=1)
     run = st.button("Analyze")
 
 if run and query.strip():
     with st.spinner("Searching & scraping (fast requests)..."):
-        result, link = scrape_product_reviews(query, max_per_star=max_per_star, max_pages=int(max_pages))
+        result, link = scrape_product_reviews(query, max_per_star=max_per_star, max_pages=int(max_pages),
+                                              concurrency=int(concurrency))
 
     if "error" in result:
         st.error(result["error"])
@@ -27,6 +29,14 @@ if run and query.strip():
         st.write(f"ASIN: {result['asin']}")
         if link:
             st.write("Product URL:", link)
+        http = result.get("http_stats")
+        if http:
+            st.caption(f"{http['requests']} HTTP requests · avg {http['avg_ms']:.0f} ms · "
+                       f"p95 {http['p95_ms']:.0f} ms · {http['total_kb']:.0f} KB")
+        cache_stats = result.get("cache_stats")
+        if cache_stats:
+            st.caption(f"Page cache: {cache_stats['hits']} hits · {cache_stats['misses']} misses · "
+                       f"{cache_stats['revalidated']} revalidated · {cache_stats['size_mb']:.1f} MB")
 
         reviews = result["reviews"]
         # Build combined dataframe for charts
@@ -0,0 +1,203 @@
+"""
+Watchlist scheduler: many products, a bounded worker pool, per-marketplace caps.
+
+Each watched product has its own interval. A dispatcher thread keeps a heap
+of next-due times and hands due jobs to at most `workers` threads, never
+running more than limits[marketplace] jobs against one site at a time. Due
+jobs that cannot start yet wait in a per-marketplace ready queue. The next
+run is scheduled from the previous due time (no drift) plus +/- jitter, so
+products added together spread out instead of firing in lock-step.
+
+    scheduler = WatchScheduler(load_watchlist("watchlist.csv"), run_job, workers=4,
+                               limits={"amazon.in": 2, "flipkart": 2})
+    scheduler.start()
+    scheduler.print_metrics()   # queue depth, lag behind schedule, jobs/min
+
+Thousands of products cost one heap entry each; only running jobs hold a thread.
+"""
+import csv
+import heapq
+import itertools
+import random
+import threading
+import time
+import traceback
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from review_store import product_key
+
+DEFAULT_INTERVAL_MINUTES = 10
+JITTER = 0.1
+LAG_WINDOW = 500
+
+
+@dataclass
+class WatchItem:
+    url: str
+    interval_s: float
+    product: str = None
+    marketplace: str = None
+
+    def __post_init__(self):
+        self.product = self.product or product_key(self.url)
+        self.marketplace = self.marketplace or marketplace_of(self.url)
+
+
+def marketplace_of(url: str) -> str:
+    if "flipkart." in url:
+        return "flipkart"
+    if "amazon." in url:
+        return "amazon." + url.split("amazon.", 1)[1].split("/", 1)[0]
+    return "other"
+
+
+def load_watchlist(path: str, default_interval_minutes: float = DEFAULT_INTERVAL_MINUTES) -> list:
+    """
+    Watch items from a CSV with a url column and an optional interval_minutes
+    column (blank = default). Duplicate products are watched once.
+    """
+    items = {}
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            url = (row.get("url") or "").strip()
+            if not url:
+                continue
+            minutes = float(row.get("interval_minutes") or default_interval_minutes)
+            item = WatchItem(url, minutes * 60)
+            items.setdefault(item.product, item)
+    return list(items.values())
+
+
+class WatchScheduler:
+    def __init__(self, items, run, workers: int = 4, limits: dict = None, default_limit: int = 2,
+                 jitter: float = JITTER):
+        """
+        run:           called with a WatchItem on a worker thread; exceptions are counted, not fatal
+        workers:       jobs in flight across all marketplaces
+        limits:        marketplace -> max jobs in flight there (default_limit otherwise)
+        jitter:        +/- fraction of the interval added to every next-due time
+        """
+        self.run = run
+        self.workers = workers
+        self.limits = dict(limits or {})
+        self.default_limit = default_limit
+        self.jitter = jitter
+
+        self._cond = threading.Condition()
+        self._heap = []
+        self._seq = itertools.count()
+        self._ready = defaultdict(deque)     # marketplace -> due items waiting for a slot
+        self._in_flight = defaultdict(int)
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="watch")
+        self._thread = None
+        self._stopped = False
+
+        self._started = time.monotonic()
+        self._lags = deque(maxlen=LAG_WINDOW)
+        self._finished = deque()             # completion times for jobs/min
+        self.completed = 0
+        self.failed = 0
+
+        now = time.monotonic()
+        for item in items:
+            # first run spread over one interval so a large watchlist doesn't fire at once
+            self._push(now + random.uniform(0, item.interval_s), item)
+
+    # ---------- scheduling ----------
+    def _push(self, due, item):
+        heapq.heappush(self._heap, (due, next(self._seq), item))
+
+    def add(self, item: WatchItem, run_now: bool = False):
+        with self._cond:
+            self._push(time.monotonic() if run_now else time.monotonic() + item.interval_s, item)
+            self._cond.notify()
+
+    def _next_due(self, due, item):
+        base = due + item.interval_s * (1 + random.uniform(-self.jitter, self.jitter))
+        # far behind schedule (e.g. after a stall): restart from now instead of firing a backlog
+        return max(base, time.monotonic())
+
+    def _limit(self, marketplace):
+        return self.limits.get(marketplace, self.default_limit)
+
+    def _dispatch(self):
+        with self._cond:
+            while not self._stopped:
+                now = time.monotonic()
+                while self._heap and self._heap[0][0] <= now:
+                    due, _, item = heapq.heappop(self._heap)
+                    self._ready[item.marketplace].append((due, item))
+
+                running = sum(self._in_flight.values())
+                for market, ready in self._ready.items():
+                    while ready and running < self.workers and self._in_flight[market] < self._limit(market):
+                        due, item = ready.popleft()
+                        self._in_flight[market] += 1
+                        running += 1
+                        self._lags.append(now - due)
+                        self._pool.submit(self._run_one, due, item)
+
+                timeout = self._heap[0][0] - now if self._heap else None
+                self._cond.wait(timeout)
+
+    def _run_one(self, due, item):
+        ok = True
+        try:
+            self.run(item)
+        except Exception:
+            ok = False
+            print(f"❌ Job failed for {item.url}")
+            traceback.print_exc()
+        finally:
+            with self._cond:
+                self._in_flight[item.marketplace] -= 1
+                self.completed += 1
+                self.failed += 0 if ok else 1
+                self._finished.append(time.monotonic())
+                if not self._stopped:
+                    self._push(self._next_due(due, item), item)
+                self._cond.notify()
+
+    # ---------- lifecycle ----------
+    def start(self):
+        self._thread = threading.Thread(target=self._dispatch, name="watch-dispatcher", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, wait: bool = True):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join()
+        self._pool.shutdown(wait=wait)
+
+    # ---------- metrics ----------
+    def metrics(self) -> dict:
+        with self._cond:
+            now = time.monotonic()
+            while self._finished and self._finished[0] < now - 60:
+                self._finished.popleft()
+            # due but not started: what is piling up behind the caps
+            overdue = [now - due for ready in self._ready.values() for due, _ in ready]
+            lags = sorted(self._lags)
+            return {
+                "watched": len(self._heap) + len(overdue) + sum(self._in_flight.values()),
+                "queue_depth": len(overdue),
+                "queue_by_marketplace": {m: len(r) for m, r in self._ready.items() if r},
+                "in_flight": dict((m, n) for m, n in self._in_flight.items() if n),
+                "lag_avg_s": sum(lags) / len(lags) if lags else 0.0,
+                "lag_p95_s": lags[int(0.95 * (len(lags) - 1))] if lags else 0.0,
+                "oldest_waiting_s": max(overdue, default=0.0),
+                "jobs_per_min": len(self._finished) * 60 / min(60, max(now - self._started, 1e-9)),
+                "completed": self.completed,
+                "failed": self.failed,
+            }
+
+    def print_metrics(self):
+        m = self.metrics()
+        print(f"📈 Watching {m['watched']} | queue {m['queue_depth']} {m['queue_by_marketplace'] or ''} | "
+              f"running {m['in_flight'] or 0} | lag avg {m['lag_avg_s']:.1f}s p95 {m['lag_p95_s']:.1f}s | "
+              f"{m['jobs_per_min']:.1f} jobs/min | {m['completed']} done, {m['failed']} failed")